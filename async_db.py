@@ -0,0 +1,116 @@
+import contextvars
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+from config import DatabaseConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDatabase:
+    # --- Runs DatabaseManager calls on worker threads ---
+    # Results are handed back to the Tk thread by a root.after() poll loop, so
+    # callbacks may touch widgets. Each call has a key (usually the table it
+    # fills); a newer call with the same key cancels or drops the older one.
+
+    def __init__(self, root, max_workers: Optional[int] = None, poll_interval: int = 25):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or DatabaseConfig.POOL_MAX_SIZE,
+            thread_name_prefix="db-worker"
+        )
+        self.on_busy_changed: Optional[Callable[[bool], None]] = None
+
+        self._results = queue.Queue()
+        self._latest: Dict[str, int] = {}                 # key -> newest generation
+        self._in_flight: Dict[Tuple[str, int], object] = {}  # (key, generation) -> future
+        self._polling = False
+        self._closed = False
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._in_flight)
+
+    def submit(self, key: str, fn: Callable, *args,
+               on_success: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, **kwargs):
+        """Run fn(*args, **kwargs) on a worker; on_success(result) / on_error(exc)
+        run on the Tk thread unless a newer call with the same key superseded it"""
+        if self._closed:
+            return
+        generation = self._latest.get(key, 0) + 1
+        self._latest[key] = generation
+
+        # Cancel older calls for this key that have not started yet
+        for (other_key, other_generation), future in list(self._in_flight.items()):
+            if other_key == key and future.cancel():
+                del self._in_flight[(other_key, other_generation)]
+
+        was_busy = self.busy
+        # The worker runs in a copy of the caller's context, so its queries count
+        # against the caller's tracked action (see QueryStats.action)
+        context = contextvars.copy_context()
+        future = self.executor.submit(
+            context.run, self._run, key, generation, fn, args, kwargs, on_success, on_error
+        )
+        self._in_flight[(key, generation)] = future
+        if not was_busy:
+            self._notify_busy(True)
+        self._start_polling()
+
+    def cancel(self, key: str):
+        """Drop any pending result for key"""
+        self._latest[key] = self._latest.get(key, 0) + 1
+
+    def shutdown(self):
+        self._closed = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self._in_flight.clear()
+
+    def _run(self, key, generation, fn, args, kwargs, on_success, on_error):
+        # Worker thread: never touch Tk here, only the queue
+        try:
+            result = fn(*args, **kwargs)
+            self._results.put((key, generation, on_success, result, None))
+        except Exception as e:
+            self._results.put((key, generation, on_error, None, e))
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        if self._closed:
+            return
+        while True:
+            try:
+                key, generation, callback, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._in_flight.pop((key, generation), None)
+
+            if generation != self._latest.get(key):
+                logger.debug("Dropping stale result for %s", key)
+                continue
+            if error is not None and not callback:
+                logger.error("Background call for %s failed: %s", key, error)
+                continue
+            try:
+                if callback:
+                    callback(error if error is not None else result)
+            except Exception:
+                # Keep the poll loop alive whatever the callback does
+                logger.exception("Callback for %s failed", key)
+
+        if self._in_flight:
+            self.root.after(self.poll_interval, self._poll)
+        else:
+            self._polling = False
+            self._notify_busy(False)
+
+    def _notify_busy(self, busy: bool):
+        if self.on_busy_changed:
+            self.on_busy_changed(busy)
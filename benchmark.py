@@ -0,0 +1,373 @@
+"""Benchmark the report and write paths of DatabaseManager against generated datasets.
+
+Examples:
+    python benchmark.py --user root --sizes 1000,70000 --prepare           # create and load the datasets
+    python benchmark.py --user root --sizes 1000,70000 --save-baseline     # record benchmark_baseline.json
+    python benchmark.py --user root --sizes 1000,70000                     # compare; exit 1 on a regression
+
+Each size is a number of students (see generate_data.py) loaded into its own
+database, <database>_bench_<size>, so the benchmarks never touch real data.
+Every case runs a few warm-up calls and then --iterations timed calls. The
+report shows p50/p95/p99 latency, rows per second and round trips per call.
+The result cache is off unless --with-cache is given, so reports hit the
+database every time. Write cases run inside a transaction that is rolled back.
+
+Round trips are read from the server's Questions counter plus the pool's health
+check pings. The counter covers every client, so benchmark against an otherwise
+idle server.
+
+A run regresses when a case's p50 or p95 grows by more than --threshold (and by
+at least MIN_REGRESSION_SECONDS), or when it needs more round trips than the
+baseline did.
+"""
+import argparse
+import json
+import logging
+import math
+import sys
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import generate_data
+from config import DatabaseConfig
+from database import DatabaseManager
+from models import Payment, Term
+from cli_common import add_connection_arguments, configure_connection, configure_logging
+from setup_database import create_database_schema
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PATH = "benchmark_baseline.json"
+BASELINE_VERSION = 1
+
+# Latency growth smaller than this never counts as a regression (timer noise on fast queries)
+MIN_REGRESSION_SECONDS = 0.001
+
+# Case name -> what one call runs; reads return their rows, writes return True on success.
+# fee_list_page and term_roster are the queries behind MainWindow.load_financial_data and
+# MainWindow.load_term_data.
+READ_CASES: Dict[str, Callable] = {
+    'members_by_organization': lambda db, c: db.get_members_by_organization(c['org_id'], c['semester'], c['acad_year']),
+    'members_page': lambda db, c: db.get_members_page(c['org_id'], c['semester'], c['acad_year']).rows,
+    'late_payments': lambda db, c: db.get_late_payments(c['org_id'], c['semester'], c['acad_year']),
+    'highest_debt_members': lambda db, c: db.get_highest_debt_members(c['org_id'], c['semester'], c['acad_year']),
+    'unpaid_fees': lambda db, c: db.get_unpaid_fees(c['org_id'], c['semester'], c['acad_year']),
+    'financial_summary': lambda db, c: db.get_financial_summary(c['org_id']),
+    'financial_summary_by_org': lambda db, c: db.get_financial_summary_by_org(),
+    'fee_list_page': lambda db, c: db.get_fee_list_page(c['org_id'], c['semester'], c['acad_year']).rows,
+    'term_roster': lambda db, c: db.get_term_roster(c['org_id'], c['semester'], c['acad_year']),
+}
+WRITE_CASES: Dict[str, Callable] = {
+    'add_payment': lambda db, c: db.add_payment(Payment(None, 1.0, c['payment_date'], c['term_id'])),
+    'add_term': lambda db, c: db.add_term(Term(
+        None, c['next_semester'], role='Member', term_start=c['next_start'], term_end=c['next_end'],
+        acad_year=c['next_acad_year'], fee_due=c['next_start'] + timedelta(days=30),
+        membership_id=c['membership_id']
+    )),
+}
+
+
+def bench_database(base: str, size: int) -> str:
+    return f"{base}_bench_{size}"
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class RoundTripCounter:
+    # --- Statements the server received (Questions) plus pool health check pings ---
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.connection = DatabaseConfig.get_connection()
+        if self.connection is None:
+            raise RuntimeError("Could not open the round trip counter connection")
+
+    def read(self) -> int:
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+            questions = int(cursor.fetchone()[1])
+        finally:
+            cursor.close()
+        pings = self.db.pool.stats()['checkouts'] if DatabaseConfig.POOL_HEALTH_CHECK else 0
+        return questions + pings
+
+    def since(self, before: int) -> int:
+        # Round trips since `before`, not counting this reading's own SHOW STATUS
+        return self.read() - before - 1
+
+    def close(self):
+        self.connection.close()
+
+
+def find_context(db: DatabaseManager) -> Optional[dict]:
+    """The busiest organization in the latest term, with a term and membership to write to"""
+    busiest = db.execute_query("""
+        SELECT m.org_id, t.semester, t.acad_year
+        FROM term t
+        JOIN membership m ON t.membership_id = m.membership_id
+        GROUP BY m.org_id, t.acad_year, t.semester
+        ORDER BY t.acad_year DESC, t.semester DESC, COUNT(*) DESC
+        LIMIT 1
+    """)
+    if not busiest:
+        return None
+    org_id, semester, acad_year = busiest[0]
+    term = db.execute_query("""
+        SELECT t.term_id, t.membership_id, t.term_start, t.term_end
+        FROM term t
+        JOIN membership m ON t.membership_id = m.membership_id
+        WHERE m.org_id = ? AND t.semester = ? AND t.acad_year = ?
+        ORDER BY t.balance DESC, t.term_id
+        LIMIT 1
+    """, (org_id, semester, acad_year))
+    if not term:
+        return None
+    term_id, membership_id, term_start, term_end = term[0]
+
+    # add_term writes the next academic year's first semester
+    next_year = int(acad_year.split('-')[0]) + 1
+    return {
+        'org_id': org_id, 'semester': semester, 'acad_year': acad_year,
+        'term_id': term_id, 'membership_id': membership_id, 'payment_date': term_start,
+        'next_semester': '1st', 'next_acad_year': f"{next_year}-{next_year + 1}",
+        'next_start': term_start.replace(year=next_year, month=8, day=1),
+        'next_end': term_start.replace(year=next_year, month=12, day=15),
+    }
+
+
+def run_case(db: DatabaseManager, name: str, context: dict) -> Tuple[int, bool]:
+    # One call of a case: (rows returned or written, whether it succeeded)
+    if name in READ_CASES:
+        rows, ok = db.call_checked(READ_CASES[name], db, context)
+        return len(rows), ok
+    with db.transaction() as transaction:
+        ok = bool(WRITE_CASES[name](db, context))
+        transaction.failed = True  # Always roll back so every iteration sees the same data
+    return 1, ok
+
+
+def measure(db: DatabaseManager, counter: RoundTripCounter, name: str, context: dict,
+            iterations: int, warmup: int) -> Optional[dict]:
+    """Latency percentiles, rows/s and round trips per call for one case; None if a call failed"""
+    for _ in range(warmup):
+        if not run_case(db, name, context)[1]:
+            return None
+
+    seconds = []
+    rows = 0
+    before = counter.read()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        count, ok = run_case(db, name, context)
+        seconds.append(time.perf_counter() - start)
+        if not ok:
+            return None
+        rows += count
+    round_trips = counter.since(before)
+
+    ordered = sorted(seconds)
+    total = sum(seconds)
+    return {
+        'p50': percentile(ordered, 0.50),
+        'p95': percentile(ordered, 0.95),
+        'p99': percentile(ordered, 0.99),
+        'mean': total / len(seconds),
+        'rows': rows // iterations,
+        'rows_per_sec': rows / total if total > 0 else 0.0,
+        'round_trips': round_trips / iterations,
+    }
+
+
+def prepare(base: str, sizes: List[int], seed: int, load_data: bool, last_year: int) -> bool:
+    # Create and fill one database per size; sizes that already have students are left alone
+    for size in sizes:
+        DatabaseConfig.DB_NAME = bench_database(base, size)
+        if not create_database_schema():
+            return False
+        db = DatabaseManager()
+        if not db.connect():
+            return False
+        try:
+            existing = db.execute_query("SELECT COUNT(*) FROM student")
+            if existing and existing[0][0]:
+                print(f"{DatabaseConfig.DB_NAME}: already has {existing[0][0]} students, keeping it")
+                continue
+            counts = generate_data.load(seed, size, generate_data.default_orgs(size),
+                                        load_data=load_data, last_year=last_year)
+            if counts is None or not db.rebuild_financial_summary():
+                print(f"{DatabaseConfig.DB_NAME}: load failed", file=sys.stderr)
+                return False
+            print(f"{DatabaseConfig.DB_NAME}: loaded {sum(counts.values()):,} rows")
+        finally:
+            db.disconnect()
+    return True
+
+
+def run_size(base: str, size: int, cases: List[str], iterations: int, warmup: int) -> Optional[Dict[str, dict]]:
+    """Measure every case against one dataset; None if the dataset is unusable"""
+    DatabaseConfig.DB_NAME = bench_database(base, size)
+    db = DatabaseManager()
+    if not db.connect():
+        logger.error("Could not connect to %s (run with --prepare first)", DatabaseConfig.DB_NAME)
+        return None
+    counter = None
+    try:
+        context = find_context(db)
+        if context is None:
+            logger.error("%s has no terms to benchmark", DatabaseConfig.DB_NAME)
+            return None
+        counter = RoundTripCounter(db)
+        results = {}
+        for name in cases:
+            result = measure(db, counter, name, context, iterations, warmup)
+            if result is None:
+                logger.error("%s failed on %s", name, DatabaseConfig.DB_NAME)
+                continue
+            results[name] = result
+        return results
+    finally:
+        if counter is not None:
+            counter.close()
+        db.disconnect()
+
+
+def compare(results: Dict[str, Dict[str, dict]], baseline: Dict[str, Dict[str, dict]],
+            threshold: float) -> List[str]:
+    """One message per case that regressed against the baseline"""
+    regressions = []
+    for size, cases in results.items():
+        for name, current in cases.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous is None:
+                continue
+            for stat in ('p50', 'p95'):
+                growth = current[stat] - previous[stat]
+                if growth > max(previous[stat] * threshold, MIN_REGRESSION_SECONDS):
+                    regressions.append(
+                        f"{name} @ {size}: {stat} {previous[stat] * 1000:.2f}ms -> {current[stat] * 1000:.2f}ms"
+                    )
+            if current['round_trips'] > previous['round_trips'] + 0.5:
+                regressions.append(
+                    f"{name} @ {size}: round trips {previous['round_trips']:.1f} -> {current['round_trips']:.1f}"
+                )
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, dict]], out=sys.stdout):
+    header = f"{'case':26} {'students':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rows':>7} {'rows/s':>11} {'trips':>6}"
+    print(header, file=out)
+    print('-' * len(header), file=out)
+    for size, cases in results.items():
+        for name, r in cases.items():
+            print(f"{name:26} {size:>9} {r['p50'] * 1000:9.2f} {r['p95'] * 1000:9.2f} {r['p99'] * 1000:9.2f} "
+                  f"{r['rows']:7} {r['rows_per_sec']:11,.0f} {r['round_trips']:6.1f}", file=out)
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Dict[str, dict]]]:
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if data.get('version') != BASELINE_VERSION:
+        raise ValueError(f"{path} has baseline version {data.get('version')}, expected {BASELINE_VERSION}")
+    return data['results']
+
+
+def save_results(path: str, results: Dict[str, Dict[str, dict]], args: argparse.Namespace):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': BASELINE_VERSION,
+            'seed': args.seed,
+            'last_year': args.last_year,
+            'iterations': args.iterations,
+            'with_cache': args.with_cache,
+            'results': results,
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def parse_sizes(value: str) -> List[int]:
+    try:
+        sizes = [int(part) for part in value.split(',') if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated student counts, got {value!r}")
+    if not sizes or min(sizes) <= 0:
+        raise argparse.ArgumentTypeError("sizes must be positive")
+    return sizes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    configure_logging()
+    all_cases = list(READ_CASES) + list(WRITE_CASES)
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseManager reports and writes")
+    parser.add_argument('--sizes', type=parse_sizes, default=[1000], help="student counts, e.g. 1000,70000")
+    parser.add_argument('--case', action='append', choices=all_cases, help="run only this case (repeatable)")
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=127, help="dataset seed for --prepare")
+    parser.add_argument('--last-year', type=int, default=generate_data.DEFAULT_LAST_YEAR,
+                        help="newest academic year of the --prepare datasets (see generate_data.py)")
+    parser.add_argument('--prepare', action='store_true', help="create and load the datasets, then exit")
+    parser.add_argument('--load-data', action='store_true', help="--prepare through LOAD DATA LOCAL INFILE")
+    parser.add_argument('--with-cache', action='store_true', help="keep the report result cache on")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="write this run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed latency growth (0.25 = 25%%)")
+    parser.add_argument('--output', help="also write this run's results as JSON")
+    add_connection_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_connection(args)
+    base = DatabaseConfig.DB_NAME
+
+    if args.prepare:
+        return 0 if prepare(base, args.sizes, args.seed, args.load_data, args.last_year) else 1
+
+    if not args.with_cache:
+        DatabaseConfig.RESULT_CACHE_TTL = 0
+    cases = args.case or all_cases
+    iterations = max(1, args.iterations)
+    results = {}
+    for size in args.sizes:
+        measured = run_size(base, size, cases, iterations, max(0, args.warmup))
+        if measured is None:
+            return 1
+        results[str(size)] = measured
+    print_results(results)
+
+    if args.output:
+        save_results(args.output, results, args)
+    if args.save_baseline:
+        save_results(args.baseline, results, args)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        baseline = load_baseline(args.baseline)
+    except (ValueError, KeyError, json.JSONDecodeError) as e:
+        print(f"Unusable baseline: {e}", file=sys.stderr)
+        return 1
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nREGRESSION: {len(regressions)} case(s) slower than {args.baseline} "
+              f"(threshold {args.threshold:.0%}):", file=sys.stderr)
+        for message in regressions:
+            print(f"  {message}", file=sys.stderr)
+        return 1
+    print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+from models import Organization
+
+
+class OrganizationDirectory:
+    # --- In-memory organization list with O(1) name/id lookup ---
+    # Loaded on first use and reloaded after invalidate()
+
+    def __init__(self, loader: Callable[[], Optional[List[Organization]]]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._organizations: Optional[List[Organization]] = None
+        self._by_name: Dict[str, int] = {}
+        self._by_id: Dict[int, str] = {}
+
+        # Counters for diagnostics
+        self.hits = 0
+        self.loads = 0
+
+    def organizations(self) -> List[Organization]:
+        """All organizations, in the order the database returned them"""
+        organizations = self._ensure_loaded()
+        return list(organizations) if organizations else []
+
+    def id_for(self, org_name: str) -> Optional[int]:
+        self._ensure_loaded()
+        return self._by_name.get(org_name)
+
+    def name_for(self, org_id: int) -> Optional[str]:
+        self._ensure_loaded()
+        return self._by_id.get(org_id)
+
+    def invalidate(self):
+        """Forget the cached list; the next lookup reloads it"""
+        with self._lock:
+            self._generation += 1
+            self._organizations = None
+            self._by_name = {}
+            self._by_id = {}
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'loads': self.loads, 'cached': self._organizations is not None}
+
+    def _ensure_loaded(self) -> Optional[List[Organization]]:
+        with self._lock:
+            if self._organizations is not None:
+                self.hits += 1
+                return self._organizations
+            generation = self._generation
+
+        organizations = self._loader()
+        if organizations is None:
+            # Query failed; do not cache the failure
+            return None
+
+        with self._lock:
+            self.loads += 1
+            # Drop the result if a write invalidated the directory while we were loading
+            if generation == self._generation:
+                self._organizations = organizations
+                self._by_name = {org.org_name: org.org_id for org in organizations}
+                self._by_id = {org.org_id: org.org_name for org in organizations}
+        return organizations
+
+
+# Target table of a write statement; multi-table UPDATEs list every joined table
+_WRITE_TARGET = re.compile(
+    r"^\s*(?:INSERT(?:\s+IGNORE)?\s+INTO|REPLACE\s+INTO|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?"
+    r"|DROP\s+TABLE(?:\s+IF\s+EXISTS)?|CREATE\s+TABLE(?:\s+IF\s+NOT\s+EXISTS)?|UPDATE)\s+`?(\w+)`?",
+    re.IGNORECASE
+)
+_UPDATE_JOIN = re.compile(r"\bJOIN\s+`?(\w+)`?", re.IGNORECASE)
+
+# Rows removed from a table also disappear from these through ON DELETE CASCADE
+CASCADES = {
+    'organization': ('membership', 'has_membership', 'term', 'payment', 'financial_summary'),
+    'student': ('member', 'membership', 'has_membership', 'term', 'payment'),
+    'membership': ('has_membership', 'term', 'payment'),
+    'term': ('payment',),
+}
+
+
+def written_tables(sql: str) -> Optional[FrozenSet[str]]:
+    """Tables a statement may change, or None when it cannot be told from the SQL"""
+    match = _WRITE_TARGET.match(sql)
+    if not match:
+        return None
+    keyword = sql.lstrip()[:6].upper()
+    table = match.group(1).lower()
+    tables = {table}
+    if keyword == 'UPDATE':
+        # Only the part before SET can name updated tables
+        head = re.split(r"\bSET\b", sql, maxsplit=1, flags=re.IGNORECASE)[0]
+        tables.update(name.lower() for name in _UPDATE_JOIN.findall(head))
+    elif keyword in ('DELETE', 'TRUNCA', 'DROP T'):
+        tables.update(CASCADES.get(table, ()))
+    return frozenset(tables)
+
+
+class TableVersions:
+    # --- Write counter per table, used to tell whether a cached result is stale ---
+    # Bumped after a write commits; a reader snapshots the versions before running
+    # its query, so a write that lands mid-query leaves the result already stale.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._epoch = 0  # Bumped by writes whose tables are unknown
+
+    def bump(self, tables: Optional[Iterable[str]]):
+        """Record a committed write; None means any table may have changed"""
+        with self._lock:
+            if tables is None:
+                self._epoch += 1
+                return
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return (self._epoch,) + tuple(self._versions.get(table, 0) for table in tables)
+
+
+def _estimate_size(value, depth: int = 0) -> int:
+    # Rough deep size of a query result (lists of dicts/tuples of scalars)
+    size = sys.getsizeof(value)
+    if depth > 3:
+        return size
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + _estimate_size(item, depth + 1)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += _estimate_size(item, depth + 1)
+    return size
+
+
+class _CacheEntry:
+    __slots__ = ('value', 'versions', 'expires', 'size')
+    
+    def __init__(self, value, versions, expires, size):
+        self.value = value
+        self.versions = versions
+        self.expires = expires
+        self.size = size
+
+
+class ResultCache:
+    # --- Query results kept for a short time, least recently used evicted first ---
+    # Bounded by entry count and by an estimate of the results' memory use.
+    # An entry is dropped once its TTL passes or a table it read was written.
+
+    def __init__(self, versions: TableVersions, ttl: float, max_entries: int, max_bytes: int):
+        self.versions = versions
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+
+        # Counters for diagnostics
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0 and self.max_bytes > 0
+
+    def get_or_load(self, key: Hashable, tables: Tuple[str, ...], loader: Callable[[], Tuple[object, bool]]):
+        """Cached value for key, or loader()'s value. loader returns (value, cacheable)."""
+        if not self.enabled:
+            return loader()[0]
+
+        versions = self.versions.snapshot(tables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.versions != versions:
+                    self.stale += 1
+                    self._remove(key)
+                elif entry.expires <= time.monotonic():
+                    self.expired += 1
+                    self._remove(key)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.value
+            self.misses += 1
+
+        value, cacheable = loader()
+        if not cacheable:
+            return value
+
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(value, versions, time.monotonic() + self.ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'stale': self.stale, 'expired': self.expired, 'evictions': self.evictions,
+                'entries': len(self._entries), 'bytes': self._bytes,
+            }
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
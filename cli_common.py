@@ -0,0 +1,81 @@
+"""Helpers shared by the command-line tools (run_reports, importer, payment_poster,
+generate_data and benchmark): connection options, logging setup and reading
+CSV/.xlsx input files."""
+import argparse
+import csv
+import logging
+import os
+import sys
+from typing import Dict, Iterator, Tuple
+
+from config import DatabaseConfig
+from query_stats import log_slow_queries_to
+
+# Invalid rows listed in a tool's report; the rest are only counted
+MAX_REPORTED_ERRORS = 50
+
+
+def add_connection_arguments(parser: argparse.ArgumentParser):
+    """--user/--password/--host/--port/--database, shared by the command-line tools"""
+    parser.add_argument('--user', default=os.environ.get('ORG_APP_DB_USER', DatabaseConfig.DB_USER))
+    parser.add_argument('--password', default=os.environ.get('ORG_APP_DB_PASSWORD', DatabaseConfig.DB_PASSWORD))
+    parser.add_argument('--host', default=DatabaseConfig.DB_HOST)
+    parser.add_argument('--port', type=int, default=DatabaseConfig.DB_PORT)
+    parser.add_argument('--database', default=DatabaseConfig.DB_NAME)
+
+
+def configure_connection(args: argparse.Namespace):
+    """Point DatabaseConfig at the database named by add_connection_arguments' options"""
+    DatabaseConfig.DB_USER = args.user
+    DatabaseConfig.DB_PASSWORD = args.password
+    DatabaseConfig.DB_HOST = args.host
+    DatabaseConfig.DB_PORT = args.port
+    DatabaseConfig.DB_NAME = args.database
+
+
+def configure_logging():
+    # Log level comes from ORG_APP_LOG_LEVEL and the slow-query log file from
+    # ORG_APP_SLOW_QUERY_LOG, as in run_app.py; other logs go to stderr
+    level_name = os.environ.get("ORG_APP_LOG_LEVEL", "WARNING").upper()
+    logging.basicConfig(
+        level=getattr(logging, level_name, logging.WARNING),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        stream=sys.stderr
+    )
+    slow_log = os.environ.get("ORG_APP_SLOW_QUERY_LOG", DatabaseConfig.SLOW_QUERY_LOG_FILE)
+    if slow_log:
+        log_slow_queries_to(slow_log)
+
+
+def _normalize_header(name) -> str:
+    return str(name or '').strip().lower().replace(' ', '_')
+
+
+def read_rows(path: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Yield (line number, row) for each data row of a CSV or .xlsx file"""
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        yield from _read_xlsx(path)
+        return
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [_normalize_header(name) for name in next(reader, [])]
+        for row in reader:
+            if any(value.strip() for value in row):
+                yield reader.line_num, dict(zip(header, row))
+
+
+def _read_xlsx(path: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("Reading .xlsx files needs openpyxl (pip install openpyxl)")
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_normalize_header(name) for name in next(rows, ())]
+        for line, row in enumerate(rows, start=2):
+            values = ['' if value is None else str(value) for value in row]
+            if any(value.strip() for value in values):
+                yield line, dict(zip(header, values))
+    finally:
+        workbook.close()
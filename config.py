@@ -1,5 +1,9 @@
+import logging
 import mariadb
-from typing import Optional
+from typing import Callable, Optional
+from connection_pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
 
 class DatabaseConfig:
     DB_HOST = "localhost"
@@ -8,6 +12,37 @@ class DatabaseConfig:
     DB_PASSWORD = ""          # Empty by default
     DB_NAME = "student_membership_db"
 
+    # Connection pool settings
+    POOL_MIN_SIZE = 1         # Connections opened up front and kept alive
+    POOL_MAX_SIZE = 5         # Upper bound on concurrent connections
+    POOL_TIMEOUT = 10.0       # Seconds to wait for a free connection
+    POOL_IDLE_TIMEOUT = 300.0 # Seconds before an idle extra connection is closed
+    POOL_HEALTH_CHECK = True  # Ping connections when they are checked out
+
+    # Prepared statement cache (per pooled connection); 0 disables it
+    STATEMENT_CACHE_SIZE = 32
+
+    # Rows per executemany call in the bulk insert methods
+    BULK_CHUNK_SIZE = 500
+    
+    # Rows per page in the paged member, student and fee lists
+    PAGE_SIZE = 200
+    
+    # Rows per fetchmany call when streaming a result with iter_query
+    STREAM_FETCH_SIZE = 1000
+    
+    # Report result cache; entries also expire as soon as a table they read is written
+    RESULT_CACHE_TTL = 60.0               # Seconds; 0 disables the cache
+    RESULT_CACHE_MAX_ENTRIES = 256
+    RESULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+    # Per-query timing (see query_stats.py); queries at or over SLOW_QUERY_SECONDS are
+    # logged as warnings by the "query_stats.slow" logger, and also written to
+    # SLOW_QUERY_LOG_FILE when it is set. 0 turns the slow-query log off.
+    QUERY_STATS_ENABLED = True
+    SLOW_QUERY_SECONDS = 0.5
+    SLOW_QUERY_LOG_FILE = ""
+
     @classmethod
     def get_connection(cls) -> Optional[mariadb.Connection]:
         try:
@@ -20,5 +55,30 @@ class DatabaseConfig:
             )
             return connection
         except mariadb.Error as e:
-            print(f"Error connecting to MariaDB: {e}")
+            logger.error("Error connecting to MariaDB: %s", e)
             return None
+
+    @classmethod
+    def get_pooled_connection(cls) -> Optional[mariadb.Connection]:
+        # Pooled connections run in autocommit mode so reads never hold a stale snapshot;
+        # multi-statement work opens an explicit transaction instead
+        connection = cls.get_connection()
+        if connection is not None:
+            connection.autocommit = True
+        return connection
+
+    @classmethod
+    def create_pool(cls, wrap: Optional[Callable] = None) -> ConnectionPool:
+        # Build a connection pool from the current settings; wrap(connection), if given,
+        # decorates each new connection (e.g. QueryStats.instrument)
+        factory = cls.get_pooled_connection
+        if wrap is not None:
+            factory = lambda: wrap(cls.get_pooled_connection())
+        return ConnectionPool(
+            factory,
+            min_size=cls.POOL_MIN_SIZE,
+            max_size=cls.POOL_MAX_SIZE,
+            timeout=cls.POOL_TIMEOUT,
+            idle_timeout=cls.POOL_IDLE_TIMEOUT,
+            health_check=cls.POOL_HEALTH_CHECK
+        )
@@ -0,0 +1,201 @@
+import threading
+import time
+from typing import Callable, List, Optional
+
+
+class PoolTimeoutError(Exception):
+    # Raised when no connection could be checked out before the timeout
+    pass
+
+
+class PooledConnection:
+    # --- A raw connection plus the bookkeeping the pool needs ---
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        # Per-connection state attached by the caller (e.g. a statement cache)
+        self.statements = None
+
+    def close(self):
+        if self.statements is not None:
+            self.statements.close()
+            self.statements = None
+        try:
+            self.connection.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    # --- Thread-safe pool of database connections ---
+
+    def __init__(self, factory: Callable, min_size: int = 1, max_size: int = 5,
+                 timeout: float = 10.0, idle_timeout: float = 300.0,
+                 health_check: bool = True):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check
+
+        self._idle: List[PooledConnection] = []
+        self._in_use = set()
+        self._size = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+        # Counters for diagnostics
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.evicted = 0
+        self.failed_health_checks = 0
+
+    def prime(self) -> bool:
+        """Open the initial connections; False if none could be opened"""
+        opened = 0
+        for _ in range(max(self.min_size, 1)):
+            pooled = self._open()
+            if pooled is None:
+                break
+            opened += 1
+            with self._lock:
+                self._size += 1
+                self._idle.append(pooled)
+                self._available.notify()
+        return opened > 0
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Check out a healthy connection, waiting up to timeout seconds"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            pooled = None
+            create = False
+
+            with self._lock:
+                if self._closed:
+                    raise PoolTimeoutError("Connection pool is closed")
+                self._evict_idle_locked()
+
+                if not self._idle and self._size >= self.max_size:
+                    self.waits += 1
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available after {timeout:.1f}s "
+                            f"(pool size {self.max_size})"
+                        )
+                    self._available.wait(remaining)
+                    if self._closed:
+                        raise PoolTimeoutError("Connection pool is closed")
+
+                if self._idle:
+                    pooled = self._idle.pop()
+                else:
+                    # Reserve the slot before connecting outside the lock
+                    self._size += 1
+                    create = True
+
+            if create:
+                pooled = self._open()
+                if pooled is None:
+                    with self._lock:
+                        self._size -= 1
+                        self._available.notify()
+                    raise PoolTimeoutError("Could not open a new database connection")
+            elif self.health_check and not self._is_healthy(pooled):
+                self._discard(pooled, failed_health_check=True)
+                continue
+
+            with self._lock:
+                self._in_use.add(pooled)
+                self.checkouts += 1
+            return pooled
+
+    def release(self, pooled: PooledConnection, broken: bool = False):
+        """Return a connection to the pool; broken connections are closed"""
+        with self._lock:
+            self._in_use.discard(pooled)
+            if not broken and not self._closed:
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+                self._available.notify()
+                return
+
+        self._discard(pooled)
+
+    def close(self):
+        """Close every connection and refuse further checkouts"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            in_use = list(self._in_use)
+            self._in_use.clear()
+            self._size = 0
+            self._available.notify_all()
+
+        for pooled in idle + in_use:
+            pooled.close()
+
+    def stats(self) -> dict:
+        """Snapshot of the pool state"""
+        with self._lock:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'evicted': self.evicted,
+                'failed_health_checks': self.failed_health_checks,
+            }
+
+    def _open(self) -> Optional[PooledConnection]:
+        connection = self.factory()
+        if connection is None:
+            return None
+        return PooledConnection(connection)
+
+    def _discard(self, pooled: PooledConnection, failed_health_check: bool = False):
+        pooled.close()
+        with self._lock:
+            self._size = max(self._size - 1, 0)
+            if failed_health_check:
+                self.failed_health_checks += 1
+            self._available.notify()
+
+    def _is_healthy(self, pooled: PooledConnection) -> bool:
+        try:
+            pooled.connection.ping()
+            return True
+        except Exception:
+            return False
+
+    def _evict_idle_locked(self):
+        # Close connections idle for too long, keeping at least min_size open
+        if not self.idle_timeout:
+            return
+        now = time.monotonic()
+        keep = []
+        for pooled in self._idle:
+            if now - pooled.last_used > self.idle_timeout and self._size > self.min_size:
+                pooled.close()
+                self._size -= 1
+                self.evicted += 1
+            else:
+                keep.append(pooled)
+        self._idle = keep
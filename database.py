@@ -1,57 +1,516 @@
+import logging
 import mariadb
-from typing import List, Optional, Tuple
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from caches import OrganizationDirectory, ResultCache, TableVersions, written_tables
 from config import DatabaseConfig
+from connection_pool import PoolTimeoutError
+from query_stats import QueryStats, is_explainable
+from statement_cache import StatementCache, StatementStats, is_cacheable
 from models import Student, Organization, Member, Membership, Term, Payment
 from datetime import date
 
+logger = logging.getLogger(__name__)
+
+# Balance and payment status of term t derived from its fee and the sum of its
+# payments; p is a per-term payment total (see _term_balance_source)
+DERIVED_BALANCE = "t.fee_amount - COALESCE(p.paid, 0)"
+DERIVED_PAYMENT_STATUS = """CASE
+        WHEN t.fee_amount - COALESCE(p.paid, 0) <= 0 THEN 'paid'
+        WHEN COALESCE(p.paid, 0) > 0 THEN 'partial'
+        ELSE 'unpaid'
+    END"""
+
+# Fee for a term by membership status (see calculate_member_fees)
+ACTIVE_MEMBER_FEE = 1000.0
+INACTIVE_MEMBER_FEE = 500.0  # Charged once, in the semester a member becomes inactive
+
+# Columns of financial_summary after its (org_id, acad_year, semester) key
+FINANCIAL_SUMMARY_COLUMNS = "total_fees, total_paid, total_unpaid, member_count, late_count, term_start"
+
+def _financial_summary_select(where: str = "") -> str:
+    # financial_summary rows computed from term and payment, one per (org_id, acad_year, semester).
+    # A term counts as late once any of its payments is dated after fee_due.
+    return f"""
+    SELECT m.org_id, t.acad_year, t.semester,
+           SUM(t.fee_amount), SUM(t.fee_amount - t.balance), SUM(t.balance),
+           COUNT(*),
+           SUM(EXISTS (
+               SELECT 1 FROM payment p
+               WHERE p.term_id = t.term_id AND p.payment_date > t.fee_due
+           )),
+           MIN(t.term_start)
+    FROM term t
+    JOIN membership m ON t.membership_id = m.membership_id
+    {where}
+    GROUP BY m.org_id, t.acad_year, t.semester
+    """
+
+def _term_balance_source(term_filter: str = "") -> str:
+    # term t joined to its payment total p, optionally limited to some term_ids
+    return f"""term t
+    LEFT JOIN (
+        SELECT term_id, SUM(amount) AS paid
+        FROM payment
+        {term_filter}
+        GROUP BY term_id
+    ) p ON p.term_id = t.term_id"""
+
+def cached_report(*tables: str):
+    # Serve a report method from the result cache, keyed by method name and arguments.
+    # tables are the tables its query reads; a write to any of them drops the entry.
+    def decorate(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            # An empty list may mean the query failed; do not keep that
+            load = lambda: self.call_checked(method, self, *args, **kwargs)
+            key = (method.__name__,) + args + tuple(sorted(kwargs.items()))
+            return self.result_cache.get_or_load(key, tables, load)
+        return wrapper
+    return decorate
+
+def _keyset_after(columns: Tuple[str, ...]) -> str:
+    # WHERE condition for rows ordered by columns that come after a key, spelled
+    # out as nested comparisons so MariaDB can range-scan an index on them
+    condition = f"{columns[-1]} > ?"
+    for column in reversed(columns[:-1]):
+        condition = f"{column} > ? OR ({column} = ? AND ({condition}))"
+    return f"({condition})"
+
+def _like_contains(text: str) -> str:
+    # LIKE pattern for text anywhere in a value, with LIKE wildcards in text escaped
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+# Name search used by the paged lists; matches the "First Last" text the tables show
+NAME_SEARCH = "CONCAT_WS(' ', s.first_name, s.last_name) LIKE ?"
+
+def _keyset_params(key: tuple) -> tuple:
+    # Parameters for _keyset_after: each leading value twice, the last once
+    params = []
+    for value in key[:-1]:
+        params.extend([value, value])
+    params.append(key[-1])
+    return tuple(params)
+
+@dataclass
+class Page:
+    # One page of a keyset-paged list; pass next_key as `after` to get the next page
+    rows: List = field(default_factory=list)
+    next_key: Optional[tuple] = None
+    
+    @property
+    def has_more(self) -> bool:
+        return self.next_key is not None
+
+@dataclass
+class BulkResult:
+    # Outcome of a bulk insert: rows written plus (index, item, error) for each rejected row
+    inserted: int = 0
+    failed: List[Tuple[int, object, str]] = field(default_factory=list)
+    error: Optional[str] = None  # Set when the whole batch was rolled back
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+@dataclass
+class ImportResult(BulkResult):
+    # Outcome of merge_import: inserted/failed describe the staged rows,
+    # the counters what the merge changed
+    students_added: int = 0
+    students_updated: int = 0   # Rows naming an existing student_id refreshed that student
+    students_matched: int = 0   # Rows without an ID matched to a student by name and program
+    members_added: int = 0
+    memberships_added: int = 0
+    memberships_updated: int = 0
+
+@dataclass
+class PaymentPostResult(BulkResult):
+    # Outcome of post_payments: inserted/failed describe the staged rows
+    posted: int = 0
+    total_posted: float = 0.0
+    terms_updated: int = 0
+    unmatched: List[dict] = field(default_factory=list)  # Rows no open term was found for
+    overpaid: List[dict] = field(default_factory=list)   # Posted rows that took a term below zero
+
+class Transaction:
+    # Handle for one transaction() scope; nested scopes are savepoints
+    
+    def __init__(self, pooled, savepoint: Optional[str] = None):
+        self.pooled = pooled
+        self.savepoint = savepoint
+        self.failed = False   # Set when a statement inside the scope fails
+        self.ok = False       # Set on exit once the scope was committed/released
+        self.written = set()  # Tables written in the scope (outermost scope only)
+
 class DatabaseManager:
     # Handle all database operations
     
     def __init__(self):
-        self.connection = None
+        self.pool = None
+        self.statement_stats = StatementStats()
+        self.query_stats = QueryStats(DatabaseConfig.SLOW_QUERY_SECONDS)
+        self._local = threading.local()  # Per-thread stack of open transactions
+        self.org_directory = OrganizationDirectory(self._load_organizations)
+        self.table_versions = TableVersions()
+        self.result_cache = ResultCache(
+            self.table_versions,
+            DatabaseConfig.RESULT_CACHE_TTL,
+            DatabaseConfig.RESULT_CACHE_MAX_ENTRIES,
+            DatabaseConfig.RESULT_CACHE_MAX_BYTES
+        )
     
     def connect(self) -> bool:
-        # Establish database connection
-        self.connection = DatabaseConfig.get_connection()
-        return self.connection is not None
+        # Create the connection pool and open the first connection
+        pool = DatabaseConfig.create_pool(
+            self.query_stats.instrument if DatabaseConfig.QUERY_STATS_ENABLED else None
+        )
+        if not pool.prime():
+            pool.close()
+            return False
+        self.pool = pool
+        return True
     
     def disconnect(self):
-        # Close database connection
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        # Close every pooled connection
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+    
+    def _transactions(self) -> List[Transaction]:
+        stack = getattr(self._local, 'transactions', None)
+        if stack is None:
+            stack = self._local.transactions = []
+        return stack
+    
+    def _current_transaction(self) -> Optional[Transaction]:
+        stack = self._transactions()
+        return stack[-1] if stack else None
+    
+    @contextmanager
+    def _checkout(self):
+        # Borrow a pooled connection for the duration of one call,
+        # or reuse the one pinned by an open transaction on this thread
+        transaction = self._current_transaction()
+        if transaction is not None:
+            if transaction.pooled is None:
+                raise PoolTimeoutError("Transaction has no database connection")
+            yield transaction.pooled
+            return
+        
+        pooled = self.pool.acquire()
+        broken = False
+        try:
+            yield pooled
+        except mariadb.InterfaceError:
+            # Lost connection, do not hand it out again
+            broken = True
+            raise
+        finally:
+            self.pool.release(pooled, broken=broken)
+    
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed statements as one unit: commit once on exit, roll back on
+        an exception or a failed statement. Nested scopes use savepoints."""
+        stack = self._transactions()
+        outermost = not stack
+        
+        if outermost:
+            pooled = None
+            if self.pool:
+                try:
+                    pooled = self.pool.acquire()
+                    pooled.connection.begin()
+                except (mariadb.Error, PoolTimeoutError) as e:
+                    logger.error("Transaction error: %s", e)
+                    if pooled is not None:
+                        self.pool.release(pooled, broken=True)
+                        pooled = None
+            transaction = Transaction(pooled)
+            transaction.failed = pooled is None
+        else:
+            parent = stack[-1]
+            transaction = Transaction(parent.pooled, savepoint=f"sp_{len(stack)}")
+            transaction.failed = parent.pooled is None
+            if not transaction.failed:
+                try:
+                    self._run_control(transaction, f"SAVEPOINT {transaction.savepoint}")
+                except mariadb.Error as e:
+                    logger.error("Transaction error: %s", e)
+                    transaction.failed = True
+        
+        stack.append(transaction)
+        broken = False
+        try:
+            yield transaction
+        except BaseException as e:
+            broken = isinstance(e, mariadb.InterfaceError)
+            self._end_transaction(transaction, commit=False)
+            raise
+        else:
+            self._end_transaction(transaction, commit=not transaction.failed)
+        finally:
+            stack.pop()
+            if outermost and transaction.pooled is not None:
+                self.pool.release(transaction.pooled, broken=broken)
+            if outermost and transaction.written:
+                # Bump once the writes are committed (or rolled back) so readers
+                # never cache pre-commit data under the new versions
+                self.table_versions.bump(None if None in transaction.written else transaction.written)
+    
+    def _record_write(self, query: str):
+        # Note the tables a successful write touched for the result cache; inside a
+        # transaction the version bump waits until the outermost scope ends
+        tables = written_tables(query)
+        stack = self._transactions()
+        if not stack:
+            self.table_versions.bump(tables)
+        elif tables is None:
+            stack[0].written.add(None)
+        else:
+            stack[0].written.update(tables)
+    
+    def _run_control(self, transaction: Transaction, statement: str):
+        cursor = transaction.pooled.connection.cursor()
+        try:
+            cursor.execute(statement)
+        finally:
+            cursor.close()
+    
+    def _end_transaction(self, transaction: Transaction, commit: bool):
+        # Commit/release or roll back one transaction scope
+        if transaction.pooled is None:
+            return
+        connection = transaction.pooled.connection
+        try:
+            if commit:
+                if transaction.savepoint:
+                    self._run_control(transaction, f"RELEASE SAVEPOINT {transaction.savepoint}")
+                else:
+                    connection.commit()
+                transaction.ok = True
+                return
+        except mariadb.Error as e:
+            logger.error("Commit error: %s", e)
+        
+        try:
+            if transaction.savepoint:
+                self._run_control(transaction, f"ROLLBACK TO SAVEPOINT {transaction.savepoint}")
+                self._run_control(transaction, f"RELEASE SAVEPOINT {transaction.savepoint}")
+            else:
+                connection.rollback()
+        except mariadb.Error as e:
+            logger.error("Rollback error: %s", e)
+    
+    def _cursor(self, pooled, query: str):
+        # Get a cursor for query, reusing a cached prepared statement when possible
+        # Returns (cursor, cached); cached cursors must not be closed by the caller
+        if DatabaseConfig.STATEMENT_CACHE_SIZE <= 0 or not is_cacheable(query):
+            return pooled.connection.cursor(), False
+        if pooled.statements is None:
+            pooled.statements = StatementCache(
+                pooled.connection, DatabaseConfig.STATEMENT_CACHE_SIZE, self.statement_stats
+            )
+        return pooled.statements.cursor(query), True
+    
+    def _finish_cursor(self, pooled, query: str, cursor, cached: bool, failed: bool = False):
+        # Close one-off cursors; drop cached ones that hit an error
+        if not cached:
+            cursor.close()
+        elif failed:
+            pooled.statements.discard(query)
     
     def execute_query(self, query: str, params: tuple = ()) -> Optional[List]:
         # Execute a SELECT query and return results
-        if not self.connection:
+        if not self.pool:
             return None
         
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            cursor.close()
-            return results
-        except mariadb.Error as e:
-            print(f"Query error: {e}")
+            with self._checkout() as pooled:
+                cursor, cached = self._cursor(pooled, query)
+                try:
+                    cursor.execute(query, params)
+                    results = cursor.fetchall()
+                except mariadb.Error:
+                    self._finish_cursor(pooled, query, cursor, cached, failed=True)
+                    raise
+                self._finish_cursor(pooled, query, cursor, cached)
+                return results
+        except (mariadb.Error, PoolTimeoutError) as e:
+            logger.error("Query error: %s", e)
+            self._local.query_failed = True
             return None
     
     def execute_update(self, query: str, params: tuple = ()) -> bool:
         # Execute INSERT, UPDATE, or DELETE query
-        if not self.connection:
+        # Outside transaction() the pooled connection's autocommit commits (or discards)
+        # the statement itself; inside it the commit is deferred to the end of the scope
+        if not self.pool:
             return False
         
+        transaction = self._current_transaction()
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params)
-            self.connection.commit()
-            cursor.close()
-            return True
-        except mariadb.Error as e:
-            print(f"Update error: {e}")
-            self.connection.rollback()
+            with self._checkout() as pooled:
+                cursor, cached = self._cursor(pooled, query)
+                try:
+                    cursor.execute(query, params)
+                    self._finish_cursor(pooled, query, cursor, cached)
+                    self._record_write(query)
+                    return True
+                except mariadb.Error as e:
+                    logger.error("Update error: %s", e)
+                    self._finish_cursor(pooled, query, cursor, cached, failed=True)
+                    if transaction is not None:
+                        transaction.failed = True
+                    return False
+        except (mariadb.Error, PoolTimeoutError) as e:
+            logger.error("Update error: %s", e)
+            if transaction is not None:
+                transaction.failed = True
             return False
     
+    def iter_query(self, query: str, params: tuple = (), fetch_size: Optional[int] = None) -> Iterator[tuple]:
+        """Yield the rows of a SELECT in fetchmany chunks from an unbuffered cursor.
+        The connection stays checked out until the generator is exhausted or closed."""
+        if not self.pool:
+            return
+        fetch_size = fetch_size or DatabaseConfig.STREAM_FETCH_SIZE
+        # An unbuffered result blocks its connection, so a transaction's pinned
+        # connection gets a buffered cursor instead
+        buffered = self._current_transaction() is not None
+        
+        try:
+            with self._checkout() as pooled:
+                cursor = pooled.connection.cursor(buffered=buffered)
+                try:
+                    cursor.execute(query, params)
+                    while True:
+                        rows = cursor.fetchmany(fetch_size)
+                        if not rows:
+                            break
+                        yield from rows
+                finally:
+                    # Closing discards whatever the caller did not read
+                    cursor.close()
+        except (mariadb.Error, PoolTimeoutError) as e:
+            logger.error("Query error: %s", e)
+            self._local.query_failed = True
+    
+    def _bulk_insert(self, query: str, items: Iterable, to_params: Callable,
+                     chunk_size: Optional[int] = None,
+                     after_chunk: Optional[Callable] = None) -> BulkResult:
+        # Insert items with executemany in chunks inside a single transaction.
+        # A failing chunk is retried row by row behind savepoints so one bad row
+        # only rejects itself. after_chunk(cursor, written_items) runs per chunk.
+        result = BulkResult()
+        if not self.pool:
+            result.error = "Not connected to the database"
+            return result
+        
+        chunk_size = chunk_size or DatabaseConfig.BULK_CHUNK_SIZE
+        numbered = enumerate(items)
+        
+        try:
+            with self.transaction() as transaction:
+                if transaction.pooled is None:
+                    result.error = "Could not start the bulk insert transaction"
+                    return result
+                self._record_write(query)
+                cursor = transaction.pooled.connection.cursor()
+                try:
+                    while True:
+                        chunk = list(islice(numbered, chunk_size))
+                        if not chunk:
+                            break
+                        
+                        rows = []
+                        for index, item in chunk:
+                            try:
+                                rows.append((index, item, tuple(to_params(item))))
+                            except (AttributeError, TypeError, ValueError) as e:
+                                result.failed.append((index, item, f"Invalid row: {e}"))
+                        if not rows:
+                            continue
+                        
+                        cursor.execute("SAVEPOINT bulk_chunk")
+                        try:
+                            cursor.executemany(query, [params for _, _, params in rows])
+                            cursor.execute("RELEASE SAVEPOINT bulk_chunk")
+                            written = [item for _, item, _ in rows]
+                        except mariadb.Error:
+                            cursor.execute("ROLLBACK TO SAVEPOINT bulk_chunk")
+                            written = []
+                            for index, item, params in rows:
+                                cursor.execute("SAVEPOINT bulk_row")
+                                try:
+                                    cursor.execute(query, params)
+                                    cursor.execute("RELEASE SAVEPOINT bulk_row")
+                                    written.append(item)
+                                except mariadb.Error as e:
+                                    cursor.execute("ROLLBACK TO SAVEPOINT bulk_row")
+                                    result.failed.append((index, item, str(e)))
+                        
+                        if written and after_chunk:
+                            after_chunk(cursor, written)
+                        result.inserted += len(written)
+                finally:
+                    cursor.close()
+            if not transaction.ok:
+                result.error = "Bulk insert transaction was rolled back"
+                result.inserted = 0
+        except (mariadb.Error, PoolTimeoutError) as e:
+            logger.error("Bulk insert error: %s", e)
+            result.error = str(e)
+            result.inserted = 0
+        
+        return result
+    
+    def call_checked(self, fn: Callable, *args, **kwargs) -> Tuple[object, bool]:
+        """Call fn (e.g. a get_* method) and return (its result, whether all of its
+        queries on this thread succeeded). The get_* methods return [] either way."""
+        self._local.query_failed = False
+        value = fn(*args, **kwargs)
+        return value, self.pool is not None and not self._local.query_failed
+    
+    def get_statement_cache_stats(self) -> dict:
+        """Per-statement prepared cursor cache hits, misses and evictions"""
+        return self.statement_stats.snapshot()
+    
+    def get_result_cache_stats(self) -> dict:
+        """Report result cache hits, misses, invalidations and memory use"""
+        return self.result_cache.stats()
+    
+    def get_query_stats(self, limit: int = 20) -> List[dict]:
+        """Slowest SQL fingerprints by total time, with call counts and latency histograms"""
+        return self.query_stats.top(limit)
+    
+    def get_action_stats(self) -> List[dict]:
+        """Round trips per tracked action (GUI handler), most first"""
+        return self.query_stats.actions()
+    
+    def explain_query(self, query: str, params: tuple = ()) -> Optional[List[dict]]:
+        """EXPLAIN output of a statement as one dict per plan row; None if it cannot be explained"""
+        if not self.pool or not is_explainable(query):
+            return None
+        try:
+            with self._checkout() as pooled:
+                cursor = pooled.connection.cursor()
+                try:
+                    cursor.execute("EXPLAIN " + query, params)
+                    columns = [col[0] for col in cursor.description]
+                    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                finally:
+                    cursor.close()
+        except (mariadb.Error, PoolTimeoutError) as e:
+            logger.error("Explain error: %s", e)
+            return None
+    
     # STUDENT OPERATIONS
     def add_student(self, student: Student) -> bool:
         # Add a new student
@@ -73,6 +532,34 @@ class DatabaseManager:
             return [Student(*row) for row in results]
         return []
     
+    def get_students_page(self, after: Optional[tuple] = None, page_size: Optional[int] = None,
+                          search: str = '') -> Page:
+        """Students ordered by name, one page after the (last_name, first_name, student_id) key.
+        search keeps the students whose "first last" name contains it."""
+        page_size = page_size or DatabaseConfig.PAGE_SIZE
+        conditions = []
+        params = ()
+        if search:
+            conditions.append(NAME_SEARCH)
+            params += (_like_contains(search),)
+        if after is not None:
+            conditions.append(_keyset_after(('s.last_name', 's.first_name', 's.student_id')))
+            params += _keyset_params(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"""
+        SELECT s.student_id, s.first_name, s.last_name, s.gender, s.degree_program, s.standing
+        FROM student s
+        {where}
+        ORDER BY s.last_name, s.first_name, s.student_id
+        LIMIT ?
+        """
+        results = self.execute_query(query, params + (page_size + 1,)) or []
+        page = Page([Student(*row) for row in results[:page_size]])
+        if len(results) > page_size:
+            last = page.rows[-1]
+            page.next_key = (last.last_name, last.first_name, last.student_id)
+        return page
+    
     def update_student(self, student: Student) -> bool:
         # Update student information
         query = """
@@ -86,24 +573,43 @@ class DatabaseManager:
         ))
     
     def delete_student(self, student_id: int) -> bool:
-        # Delete a student
+        # Delete a student; their terms leave the financial summary of each organization
         query = "DELETE FROM student WHERE student_id=?"
-        return self.execute_update(query, (student_id,))
+        with self.transaction() as transaction:
+            orgs = self.execute_query("SELECT DISTINCT org_id FROM membership WHERE student_id = ?", (student_id,))
+            if self.execute_update(query, (student_id,)):
+                for (org_id,) in orgs or []:
+                    self.rebuild_financial_summary(org_id)
+        return transaction.ok
     
     # ORGANIZATION OPERATIONS
     def add_organization(self, org_name: str) -> bool:
         # Add a new organization
         query = "INSERT INTO organization (org_name) VALUES (?)"
-        return self.execute_update(query, (org_name,))
+        success = self.execute_update(query, (org_name,))
+        self.org_directory.invalidate()
+        return success
     
-    def get_all_organizations(self) -> List[Organization]:
-        # Get all organizations
+    def _load_organizations(self) -> Optional[List[Organization]]:
+        # Read the organization table; None if the query failed
         query = "SELECT org_id, org_name FROM organization"
         results = self.execute_query(query)
         
-        if results:
-            return [Organization(*row) for row in results]
-        return []
+        if results is None:
+            return None
+        return [Organization(*row) for row in results]
+    
+    def get_all_organizations(self) -> List[Organization]:
+        # Get all organizations (served from the in-memory directory)
+        return self.org_directory.organizations()
+    
+    def get_organization_id(self, org_name: str) -> Optional[int]:
+        """Look up an organization ID by name without a database round trip"""
+        return self.org_directory.id_for(org_name)
+    
+    def get_organization_name(self, org_id: int) -> Optional[str]:
+        """Look up an organization name by ID without a database round trip"""
+        return self.org_directory.name_for(org_id)
     
     def update_organization(self, org: Organization) -> bool:
         """Update organization information"""
@@ -112,12 +618,16 @@ class DatabaseManager:
         SET org_name = ?
         WHERE org_id = ?
         """
-        return self.execute_update(query, (org.org_name, org.org_id))
+        success = self.execute_update(query, (org.org_name, org.org_id))
+        self.org_directory.invalidate()
+        return success
     
     def delete_organization(self, org_id: int) -> bool:
         """Delete an organization"""
         query = "DELETE FROM organization WHERE org_id = ?"
-        return self.execute_update(query, (org_id,))
+        success = self.execute_update(query, (org_id,))
+        self.org_directory.invalidate()
+        return success
     
     # MEMBERSHIP OPERATIONS
     def add_member(self, student_id: int) -> bool:
@@ -129,35 +639,22 @@ class DatabaseManager:
         """
         return self.execute_update(query, (student_id,))
     
+    # Insert a membership, or update batch and committee when the student already belongs to the
+    # organization (unique_student_org); shared by add_membership and add_memberships_bulk
+    MEMBERSHIP_UPSERT = """
+    INSERT INTO membership (batch, committee, org_id, student_id)
+    VALUES (?, ?, ?, ?)
+    ON DUPLICATE KEY UPDATE batch = VALUES(batch), committee = VALUES(committee)
+    """
+    
+    @staticmethod
+    def _membership_params(membership: Membership) -> tuple:
+        return membership.batch, membership.committee, membership.org_id, membership.student_id
+    
     def add_membership(self, membership: Membership) -> bool:
-        # First check if membership already exists
-        check_query = """
-        SELECT membership_id FROM membership 
-        WHERE student_id = ? AND org_id = ?
-        """
-        existing = self.execute_query(check_query, (membership.student_id, membership.org_id))
-        
-        if existing:
-            # Membership already exists, update it instead
-            update_query = """
-            UPDATE membership 
-            SET batch = ?, committee = ?
-            WHERE student_id = ? AND org_id = ?
-            """
-            return self.execute_update(update_query, (
-                membership.batch, membership.committee,
-                membership.student_id, membership.org_id
-            ))
-        
-        # Add new membership record
-        insert_query = """
-        INSERT INTO membership (batch, committee, org_id, student_id)
-        VALUES (?, ?, ?, ?)
-        """
-        return self.execute_update(insert_query, (
-            membership.batch, membership.committee,
-            membership.org_id, membership.student_id
-        ))
+        # Add a membership, or update the existing one for the same student and organization,
+        # in one atomic statement
+        return self.execute_update(self.MEMBERSHIP_UPSERT, self._membership_params(membership))
     
     def update_membership_status(self, membership_id: int, status: str) -> bool:
         """Update membership status"""
@@ -165,18 +662,22 @@ class DatabaseManager:
         query = "UPDATE membership SET mem_status = ? WHERE membership_id = ?"
         return self.execute_update(query, (status, membership_id))
     
-    def get_members_by_organization(self, org_id: int = None, semester: str = None, acad_year: str = None) -> List[dict]:
-        # Get all members with their membership status and organization
-        filter_latest_term = ""
-        filter_main = ""
-        params = []
-        if org_id:
-            params.append(org_id)
-        if semester and acad_year:
-            filter_latest_term = "WHERE t.semester = ? AND t.acad_year = ?"
-            filter_main = "AND lt.semester = ? AND lt.acad_year = ?"
-            params.extend([semester, acad_year])
-        query = f"""
+    # Order of the member list and the key its pages are cut on
+    MEMBER_PAGE_KEY = ("s.last_name", "s.first_name", "s.student_id")
+    
+    # Member list filters (the facets of the member tab) and the column each one matches
+    MEMBER_FILTER_COLUMNS = {
+        'status': 'lt.mem_status',
+        'gender': 's.gender',
+        'degree': 's.degree_program',
+        'batch': 'm.batch',
+        'committee': 'm.committee',
+    }
+    
+    @staticmethod
+    def _latest_terms_cte(filter_latest_term: str = "") -> str:
+        # Each membership's latest term (rn = 1), optionally among the terms matching a filter
+        return f"""
         WITH latest_terms AS (
             SELECT 
                 t.membership_id,
@@ -187,7 +688,40 @@ class DatabaseManager:
                 ROW_NUMBER() OVER (PARTITION BY t.membership_id ORDER BY t.term_end DESC) as rn
             FROM term t
             {filter_latest_term}
-        )
+        )"""
+    
+    def _members_query(self, org_id: int, semester: Optional[str], acad_year: Optional[str],
+                       after: Optional[tuple] = None, limit: Optional[int] = None,
+                       search: str = '', filters: Optional[dict] = None) -> Tuple[str, tuple]:
+        # Members of an organization with their latest term, optionally searched,
+        # filtered by MEMBER_FILTER_COLUMNS and cut to one keyset page.
+        # Parameters are collected in the order their placeholders appear.
+        filter_latest_term = ""
+        filter_main = ""
+        params = []
+        if semester and acad_year:
+            filter_latest_term = "WHERE t.semester = ? AND t.acad_year = ?"
+            params.extend([semester, acad_year])
+        params.append(org_id)
+        if semester and acad_year:
+            filter_main = "AND lt.semester = ? AND lt.acad_year = ?"
+            params.extend([semester, acad_year])
+        if search:
+            filter_main += f" AND {NAME_SEARCH}"
+            params.append(_like_contains(search))
+        for name, value in (filters or {}).items():
+            if value:
+                filter_main += f" AND {self.MEMBER_FILTER_COLUMNS[name]} = ?"
+                params.append(value)
+        if after is not None:
+            filter_main += f" AND {_keyset_after(self.MEMBER_PAGE_KEY)}"
+            params.extend(_keyset_params(after))
+        limit_clause = ""
+        if limit is not None:
+            limit_clause = "LIMIT ?"
+            params.append(limit)
+        query = f"""
+        {self._latest_terms_cte(filter_latest_term)}
         SELECT s.student_id, s.first_name, s.last_name, 
                lt.mem_status, m.batch, m.committee, org.org_name, m.membership_id,
                s.gender, s.degree_program, s.standing,
@@ -199,42 +733,110 @@ class DatabaseManager:
         JOIN organization org ON m.org_id = org.org_id
         LEFT JOIN latest_terms lt ON m.membership_id = lt.membership_id AND lt.rn = 1
         WHERE org.org_id = ? {filter_main}
-        ORDER BY s.last_name, s.first_name
+        ORDER BY s.last_name, s.first_name, s.student_id
+        {limit_clause}
         """
-        results = self.execute_query(query, tuple(params))
+        return query, tuple(params)
+    
+    @staticmethod
+    def _member_row(row) -> dict:
+        return {
+            'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
+            'status': row[3], 'batch': row[4], 'committee': row[5],
+            'organization': row[6], 'membership_id': row[7],
+            'gender': row[8], 'degree_program': row[9], 'standing': row[10],
+            'latest_semester': row[11], 'latest_acad_year': row[12],
+            'latest_term_end': row[13]
+        }
+    
+    def get_members_by_organization(self, org_id: int = None, semester: str = None, acad_year: str = None) -> List[dict]:
+        # Get all members with their membership status and organization
+        query, params = self._members_query(org_id, semester, acad_year)
+        results = self.execute_query(query, params)
+        if results:
+            members = [self._member_row(row) for row in results]
+            logger.debug("Processed %d members", len(members))
+            return members
+        logger.debug("No members found")
+        return []
+    
+    def get_members_page(self, org_id: int, semester: str = None, acad_year: str = None,
+                         after: Optional[tuple] = None, page_size: Optional[int] = None,
+                         search: str = '', filters: Optional[dict] = None) -> Page:
+        """One page of get_members_by_organization, starting after the (last_name, first_name, student_id) key.
+        search matches "first last" names; filters maps MEMBER_FILTER_COLUMNS names to required values."""
+        page_size = page_size or DatabaseConfig.PAGE_SIZE
+        query, params = self._members_query(org_id, semester, acad_year, after, page_size + 1, search, filters)
+        results = self.execute_query(query, params) or []
+        members = [self._member_row(row) for row in results[:page_size]]
+        page = Page(members)
+        if len(results) > page_size:
+            last = members[-1]
+            page.next_key = (last['last_name'], last['first_name'], last['student_id'])
+        return page
+    
+    def get_member_filter_values(self, org_id: int) -> Dict[str, List[str]]:
+        """Distinct non-empty values of each member filter over all of an organization's members"""
+        selects = {
+            'status': "FROM membership m JOIN latest_terms lt ON m.membership_id = lt.membership_id AND lt.rn = 1",
+            'gender': "FROM membership m JOIN student s ON m.student_id = s.student_id",
+            'degree': "FROM membership m JOIN student s ON m.student_id = s.student_id",
+            'batch': "FROM membership m",
+            'committee': "FROM membership m",
+        }
+        union = "\n        UNION ALL\n        ".join(
+            f"SELECT DISTINCT '{name}', {self.MEMBER_FILTER_COLUMNS[name]} {source} WHERE m.org_id = ?"
+            for name, source in selects.items()
+        )
+        query = f"""
+        {self._latest_terms_cte()}
+        {union}
+        """
+        results = self.execute_query(query, (org_id,) * len(selects))
+        
+        values = {name: [] for name in selects}
+        for name, value in results or []:
+            if value not in (None, ''):
+                values[name].append(str(value))
+        for name in values:
+            values[name].sort()
+        return values
+    
+    def get_member_choices(self, org_id: int) -> List[dict]:
+        """Student and membership IDs and names of an organization's members, for pick lists"""
+        query = """
+        SELECT s.student_id, s.first_name, s.last_name, m.membership_id
+        FROM membership m
+        JOIN student s ON m.student_id = s.student_id
+        WHERE m.org_id = ?
+        ORDER BY s.last_name, s.first_name, s.student_id
+        """
+        results = self.execute_query(query, (org_id,))
+        
         if results:
-            members = [
+            return [
                 {
                     'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
-                    'status': row[3], 'batch': row[4], 'committee': row[5],
-                    'organization': row[6], 'membership_id': row[7],
-                    'gender': row[8], 'degree_program': row[9], 'standing': row[10],
-                    'latest_semester': row[11], 'latest_acad_year': row[12],
-                    'latest_term_end': row[13]
+                    'membership_id': row[3]
                 }
                 for row in results
             ]
-            print(f"Processed members: {members}")  # Debug print
-            return members
-        print("No results found")  # Debug print
         return []
     
     def get_members_with_unpaid_fees(self, org_id: int, semester: str, acad_year: str) -> List[dict]:
         """Get members with unpaid fees for a specific organization, semester, and academic year"""
         query = """
-        SELECT s.student_id, s.first_name, s.last_name, 
-               t.fee_amount, SUM(IFNULL(p.amount, 0)) as total_paid,
-               (t.fee_amount - SUM(IFNULL(p.amount, 0))) as balance,
+        SELECT s.student_id, s.first_name, s.last_name,
+               t.fee_amount, (t.fee_amount - t.balance) as total_paid,
+               t.balance,
                t.mem_status, t.fee_due
         FROM student s
         JOIN membership m ON s.student_id = m.student_id
         JOIN organization org ON m.org_id = org.org_id
         JOIN term t ON m.membership_id = t.membership_id
-        LEFT JOIN payment p ON t.term_id = p.term_id
         WHERE org.org_id = ? AND t.semester = ? AND t.acad_year = ?
         AND t.mem_status NOT IN ('expelled', 'alumni')
-        GROUP BY s.student_id, t.term_id
-        HAVING balance > 0
+        AND t.balance > 0
         """
         results = self.execute_query(query, (org_id, semester, acad_year))
         
@@ -249,6 +851,7 @@ class DatabaseManager:
             ]
         return []
     
+    @cached_report('student', 'has_membership', 'membership', 'organization', 'term')
     def get_alumni_members(self, org_id: int, year: int, month: int) -> List[dict]:
         # Get all alumni members as of a specific date
         query = """
@@ -273,9 +876,31 @@ class DatabaseManager:
             ]
         return []
 
-    def get_unpaid_fees(self, org_id: int, semester: str, acad_year: str) -> List[dict]:
-        # Get all unpaid fees given a specific sem/academic year
+    @cached_report('membership', 'term', 'student')
+    def get_role_history(self, org_id: int, role: str) -> List[dict]:
+        # Get the members who held a role in an organization, per academic year
         query = """
+        SELECT DISTINCT s.student_id, s.first_name, s.last_name, t.acad_year
+        FROM term t
+        JOIN membership m ON t.membership_id = m.membership_id
+        JOIN student s ON m.student_id = s.student_id
+        WHERE m.org_id = ? AND t.role = ?
+        ORDER BY t.acad_year DESC, s.last_name, s.first_name
+        """
+        results = self.execute_query(query, (org_id, role))
+        
+        if results:
+            return [
+                {
+                    'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
+                    'academic_year': row[3]
+                }
+                for row in results
+            ]
+        return []
+    
+    # Unpaid fees per member for an organization and semester
+    UNPAID_FEES_QUERY = """
         SELECT 
             a.membership_id, 
             b.first_name, 
@@ -288,18 +913,26 @@ class DatabaseManager:
         WHERE d.org_id = ? AND c.payment_status = 'unpaid' AND c.semester = ? AND c.acad_year = ?
         GROUP BY a.membership_id, b.first_name, b.last_name;
         """
-        results = self.execute_query(query, (org_id, semester, acad_year))
-        
-        if results:
-            return [
-                {
-                    'membership_id': row[0], 'first_name': row[1], 'last_name': row[2],
-                    'total_balance': row[3]
-                }
-                for row in results
-            ]
-        return []
     
+    @staticmethod
+    def _unpaid_fee_row(row) -> dict:
+        return {
+            'membership_id': row[0], 'first_name': row[1], 'last_name': row[2],
+            'total_balance': row[3]
+        }
+    
+    @cached_report('has_membership', 'student', 'term', 'membership')
+    def get_unpaid_fees(self, org_id: int, semester: str, acad_year: str) -> List[dict]:
+        # Get all unpaid fees given a specific sem/academic year
+        results = self.execute_query(self.UNPAID_FEES_QUERY, (org_id, semester, acad_year))
+        return [self._unpaid_fee_row(row) for row in results or []]
+    
+    def iter_unpaid_fees(self, org_id: int, semester: str, acad_year: str) -> Iterator[dict]:
+        """Stream get_unpaid_fees one row at a time (not cached)"""
+        for row in self.iter_query(self.UNPAID_FEES_QUERY, (org_id, semester, acad_year)):
+            yield self._unpaid_fee_row(row)
+    
+    @cached_report('organization', 'membership', 'has_membership', 'student', 'term')
     def get_student_unpaid(self, student_id: int) -> List[dict]:
         # Get all unpaid fees given a specific sem/academic year
         query = """
@@ -342,9 +975,8 @@ class DatabaseManager:
             ]
         return []
 
-    def get_executive_committee(self, org_id: int, acad_year: str) -> List[dict]:
-        # Get all executive committee members for a specific organization and academic year
-        query = """
+    # Officers of an organization in an academic year
+    EXECUTIVE_COMMITTEE_QUERY = """
         SELECT a.membership_id, b.first_name, b.last_name, c.role FROM membership a
         JOIN has_membership has
         ON has.membership_id = a.membership_id
@@ -355,18 +987,26 @@ class DatabaseManager:
         WHERE a.org_id = ? AND c.acad_year = ?
         AND (c.role != "member");
         """
-        results = self.execute_query(query, (org_id, acad_year))
-        
-        if results:
-            return [
-                {
-                    'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
-                    'role': row[3]
-                }
-                for row in results
-            ]
-        return []
     
+    @staticmethod
+    def _executive_committee_row(row) -> dict:
+        return {
+            'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
+            'role': row[3]
+        }
+    
+    @cached_report('membership', 'has_membership', 'student', 'term')
+    def get_executive_committee(self, org_id: int, acad_year: str) -> List[dict]:
+        # Get all executive committee members for a specific organization and academic year
+        results = self.execute_query(self.EXECUTIVE_COMMITTEE_QUERY, (org_id, acad_year))
+        return [self._executive_committee_row(row) for row in results or []]
+    
+    def iter_executive_committee(self, org_id: int, acad_year: str) -> Iterator[dict]:
+        """Stream get_executive_committee one row at a time (not cached)"""
+        for row in self.iter_query(self.EXECUTIVE_COMMITTEE_QUERY, (org_id, acad_year)):
+            yield self._executive_committee_row(row)
+    
+    @cached_report('membership', 'term', 'has_membership', 'student')
     def get_member_in_role(self, org_id: int, role: str, acad_year: str) -> List[dict]:
         query = """
         SELECT a.membership_id, d.first_name, d.last_name, a.org_id, b.term_id, b.semester, b.term_start, b.term_end, b.acad_year, b.role FROM membership a
@@ -392,9 +1032,8 @@ class DatabaseManager:
             ]
         return []
     
-    def get_late_payments(self, org_id: int, semester: str, acad_year: str) -> List[dict]:
-        # Get all late payments for a specific organization, semester, and academic year
-        query = """
+    # Payments made after their term's due date, for an organization and semester
+    LATE_PAYMENTS_QUERY = """
         SELECT a.student_id, a.first_name, a.last_name, d.payment_date, c.fee_due, d.amount from student a
         JOIN has_membership b
         ON b.student_id = a.student_id
@@ -408,17 +1047,24 @@ class DatabaseManager:
         ON e.org_id = f.org_id
         WHERE (c.payment_status = "late" OR c.fee_due < d.payment_date) AND e.org_id = ? AND c.semester = ? AND c.acad_year = ?;
         """
-        results = self.execute_query(query, (org_id, semester, acad_year))
-        
-        if results:
-            return [
-                {
-                    'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
-                    'payment_date': row[3], 'due_date': row[4], 'amount': row[5]
-                }
-                for row in results
-            ]
-        return []
+    
+    @staticmethod
+    def _late_payment_row(row) -> dict:
+        return {
+            'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
+            'payment_date': row[3], 'due_date': row[4], 'amount': row[5]
+        }
+    
+    @cached_report('student', 'has_membership', 'term', 'payment', 'membership', 'organization')
+    def get_late_payments(self, org_id: int, semester: str, acad_year: str) -> List[dict]:
+        # Get all late payments for a specific organization, semester, and academic year
+        results = self.execute_query(self.LATE_PAYMENTS_QUERY, (org_id, semester, acad_year))
+        return [self._late_payment_row(row) for row in results or []]
+    
+    def iter_late_payments(self, org_id: int, semester: str, acad_year: str) -> Iterator[dict]:
+        """Stream get_late_payments one row at a time (not cached)"""
+        for row in self.iter_query(self.LATE_PAYMENTS_QUERY, (org_id, semester, acad_year)):
+            yield self._late_payment_row(row)
     
     def get_membership_status_percentage(self, org_id: int, n_semesters: int) -> dict:
         # Get percentage of active vs inactive members for the last n semesters
@@ -452,14 +1098,13 @@ class DatabaseManager:
     def get_organization_financial_status(self, org_id: int, as_of_date: str) -> dict:
         # Get total paid and unpaid fees for an organization as of a specific date
         query = """
-        SELECT 
+        SELECT
             SUM(t.fee_amount) as total_fees,
-            SUM(IFNULL(p.amount, 0)) as total_paid,
-            SUM(t.fee_amount - IFNULL(p.amount, 0)) as total_unpaid
+            SUM(t.fee_amount - t.balance) as total_paid,
+            SUM(t.balance) as total_unpaid
         FROM organization org
         JOIN membership m ON org.org_id = m.org_id
         JOIN term t ON m.membership_id = t.membership_id
-        LEFT JOIN payment p ON t.term_id = p.term_id
         WHERE org.org_id = ? AND t.term_start <= ?
         """
         results = self.execute_query(query, (org_id, as_of_date))
@@ -475,20 +1120,44 @@ class DatabaseManager:
     
     def get_highest_debt_members(self, org_id: int, semester: str, acad_year: str) -> List[dict]:
         # Get members with the highest debt for a specific organization, semester, and academic year
+        return list(self.iter_highest_debt_members(org_id, semester, acad_year))
+    
+    def iter_highest_debt_members(self, org_id: int, semester: str, acad_year: str) -> Iterator[dict]:
+        """Stream get_highest_debt_members one row at a time"""
         query = """
         SELECT s.student_id, s.first_name, s.last_name,
-               t.fee_amount, SUM(IFNULL(p.amount, 0)) as total_paid,
-               (t.fee_amount - SUM(IFNULL(p.amount, 0))) as balance
+               t.fee_amount, (t.fee_amount - t.balance) as total_paid,
+               t.balance
         FROM student s
         JOIN member mb ON s.student_id = mb.student_id
         JOIN membership m ON mb.student_id = m.student_id
         JOIN organization org ON m.org_id = org.org_id
         JOIN term t ON m.membership_id = t.membership_id
-        LEFT JOIN payment p ON t.term_id = p.term_id
+        WHERE org.org_id = ? AND t.semester = ? AND t.acad_year = ?
+        AND t.balance > 0
+        GROUP BY s.student_id, t.term_id
+        ORDER BY t.balance DESC
+        """
+        for row in self.iter_query(query, (org_id, semester, acad_year)):
+            yield {
+                'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
+                'fee_amount': row[3], 'total_paid': row[4], 'balance': row[5]
+            }
+    
+    def get_term_roster(self, org_id: int, semester: str, acad_year: str) -> List[dict]:
+        # Get members with their term details for a specific organization, semester, and academic year
+        query = """
+        SELECT s.student_id, s.first_name, s.last_name, 
+               m.batch, m.committee,
+               t.mem_status, t.semester, t.acad_year, COALESCE(t.role, 'Member') as role,
+               t.term_start, t.term_end, t.fee_due,
+               t.term_id
+        FROM student s
+        JOIN membership m ON s.student_id = m.student_id
+        JOIN organization org ON m.org_id = org.org_id
+        JOIN term t ON m.membership_id = t.membership_id
         WHERE org.org_id = ? AND t.semester = ? AND t.acad_year = ?
         GROUP BY s.student_id, t.term_id
-        HAVING balance > 0
-        ORDER BY balance DESC
         """
         results = self.execute_query(query, (org_id, semester, acad_year))
         
@@ -496,54 +1165,212 @@ class DatabaseManager:
             return [
                 {
                     'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
-                    'fee_amount': row[3], 'total_paid': row[4], 'balance': row[5]
+                    'batch': row[3], 'committee': row[4], 'status': row[5],
+                    'semester': row[6], 'acad_year': row[7], 'role': row[8],
+                    'term_start': row[9], 'term_end': row[10], 'fee_due': row[11],
+                    'term_id': row[12]
                 }
                 for row in results
             ]
         return []
     
-    # TERM AND PAYMENT OPERATIONS
-    def calculate_member_fees(self, membership_id: int, semester: str, acad_year: str) -> float:
-        """Calculate fees for a member based on their status"""
-        # Get membership status
-        query = """
-        SELECT t.mem_status, m.batch
-        FROM membership m
+    def _fee_list_query(self, after: bool = False, limit: bool = False, search: bool = False) -> str:
+        # Fee list for an organization and semester in term_id order, optionally
+        # searched by name and cut to one keyset page
+        return f"""
+        SELECT s.student_id, s.first_name, s.last_name,
+               t.payment_status, t.fee_amount,
+               (t.fee_amount - t.balance) as total_paid,
+               t.balance,
+               t.fee_due, t.term_id
+        FROM student s
+        JOIN membership m ON s.student_id = m.student_id
+        JOIN organization org ON m.org_id = org.org_id
         JOIN term t ON m.membership_id = t.membership_id
-        WHERE m.membership_id = ?
+        WHERE org.org_id = ? AND t.semester = ? AND t.acad_year = ?
+        {f"AND {NAME_SEARCH}" if search else ""}
+        {"AND t.term_id > ?" if after else ""}
+        ORDER BY t.term_id
+        {"LIMIT ?" if limit else ""}
         """
-        result = self.execute_query(query, (membership_id,))
-        if not result:
-            return 0.0
+    
+    @staticmethod
+    def _fee_row(row) -> dict:
+        return {
+            'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
+            'payment_status': row[3], 'fee_amount': row[4], 'total_paid': row[5],
+            'balance': row[6], 'fee_due': row[7], 'term_id': row[8]
+        }
+    
+    def get_fee_list(self, org_id: int, semester: str, acad_year: str) -> List[dict]:
+        # Get fees, payments and balances per member for a specific organization, semester, and academic year
+        results = self.execute_query(self._fee_list_query(), (org_id, semester, acad_year))
         
-        status, batch = result[0]
+        if results:
+            return [self._fee_row(row) for row in results]
+        return []
+    
+    def get_fee_list_page(self, org_id: int, semester: str, acad_year: str,
+                          after: Optional[tuple] = None, page_size: Optional[int] = None,
+                          search: str = '') -> Page:
+        """One page of get_fee_list, starting after the (term_id,) key.
+        search keeps the members whose "first last" name contains it."""
+        page_size = page_size or DatabaseConfig.PAGE_SIZE
+        params = (org_id, semester, acad_year)
+        if search:
+            params += (_like_contains(search),)
+        if after is not None:
+            params += (after[0],)
+        query = self._fee_list_query(after=after is not None, limit=True, search=bool(search))
+        results = self.execute_query(query, params + (page_size + 1,)) or []
+        page = Page([self._fee_row(row) for row in results[:page_size]])
+        if len(results) > page_size:
+            page.next_key = (page.rows[-1]['term_id'],)
+        return page
+    
+    def get_unpaid_fees_as_of(self, org_id: int, as_of_date: date) -> List[dict]:
+        # Get total, paid and unpaid fees per term for an organization as of a specific date
+        if as_of_date >= date.today():
+            # The summary table holds current totals
+            return [
+                {
+                    'semester': row['semester'], 'acad_year': row['acad_year'], 'total_fees': row['total_fees'],
+                    'total_paid': row['total_paid'], 'total_unpaid': row['total_unpaid']
+                }
+                for row in self.get_financial_summary(org_id)
+                if row['term_start'] is None or row['term_start'] <= as_of_date
+            ]
         
-        # No fees for expelled or alumni
-        if status in ['expelled', 'alumni']:
-            return 0.0
+        # Historical dates need payments filtered by date
+        query = """
+        SELECT 
+            t.semester,
+            t.acad_year,
+            SUM(t.fee_amount) as total_fees,
+            COALESCE(SUM(p.amount), 0) as total_paid,
+            SUM(t.fee_amount) - COALESCE(SUM(p.amount), 0) as total_unpaid
+        FROM term t
+        JOIN membership m ON t.membership_id = m.membership_id
+        LEFT JOIN payment p ON t.term_id = p.term_id AND p.payment_date <= ?
+        WHERE m.org_id = ? AND t.term_start <= ?
+        GROUP BY t.semester, t.acad_year
+        ORDER BY t.acad_year DESC, 
+            CASE t.semester
+                WHEN '1st' THEN 1
+                WHEN '2nd' THEN 2
+                WHEN 'Summer' THEN 3
+                ELSE 4
+            END
+        """
+        results = self.execute_query(query, (as_of_date, org_id, as_of_date))
         
-        # Check if this is the semester they became inactive
-        if status == 'inactive':
-            # Get the term when they became inactive
-            query = """
-            SELECT t.semester, t.acad_year
-            FROM term t
-            JOIN membership m ON t.membership_id = m.membership_id
-            WHERE m.membership_id = ? AND m.mem_status = 'inactive'
-            ORDER BY t.term_start DESC
-            LIMIT 1
-            """
-            result = self.execute_query(query, (membership_id,))
-            if result and result[0][0] == semester and result[0][1] == acad_year:
-                return 500.0  # One-time inactive fee
-            return 0.0
+        if results:
+            return [
+                {
+                    'semester': row[0], 'acad_year': row[1], 'total_fees': row[2],
+                    'total_paid': row[3], 'total_unpaid': row[4]
+                }
+                for row in results
+            ]
+        return []
+    
+    def get_student_balances(self, org_id: int, semester: str, acad_year: str) -> List[dict]:
+        # Get members with an outstanding balance, highest first
+        query = """
+        SELECT 
+            s.student_id,
+            s.first_name,
+            s.last_name,
+            t.fee_amount,
+            (t.fee_amount - t.balance) as total_paid,
+            t.balance,
+            t.semester,
+            t.acad_year,
+            t.payment_status
+        FROM student s
+        JOIN membership m ON s.student_id = m.student_id
+        JOIN organization org ON m.org_id = org.org_id
+        JOIN term t ON m.membership_id = t.membership_id
+        WHERE org.org_id = ? AND t.semester = ? AND t.acad_year = ?
+        AND t.balance > 0
+        ORDER BY t.balance DESC
+        """
+        results = self.execute_query(query, (org_id, semester, acad_year))
         
-        # Active members pay full fee
-        if status == 'active':
-            return 1000.0
+        if results:
+            return [
+                {
+                    'student_id': row[0], 'first_name': row[1], 'last_name': row[2],
+                    'fee_amount': row[3], 'total_paid': row[4], 'balance': row[5],
+                    'semester': row[6], 'acad_year': row[7], 'payment_status': row[8]
+                }
+                for row in results
+            ]
+        return []
+    
+    # TERM AND PAYMENT OPERATIONS
+    def calculate_member_fees(self, membership_id: int, semester: str, acad_year: str) -> float:
+        """Calculate fees for a member based on their status"""
+        fees = self.calculate_member_fees_batch([membership_id], semester, acad_year)
+        return fees.get(membership_id, 0.0)
+    
+    def calculate_member_fees_batch(self, membership_ids: Iterable[int], semester: str,
+                                    acad_year: str) -> Dict[int, float]:
+        """Fees for many memberships in a semester: one status-history query per
+        BULK_CHUNK_SIZE memberships, then the fee rules applied to every membership"""
+        membership_ids = sorted(set(membership_ids))
+        fees = {membership_id: 0.0 for membership_id in membership_ids}
+        for start in range(0, len(membership_ids), DatabaseConfig.BULK_CHUNK_SIZE):
+            chunk = membership_ids[start:start + DatabaseConfig.BULK_CHUNK_SIZE]
+            history = self._status_history(f"t.membership_id IN ({', '.join('?' * len(chunk))})", tuple(chunk))
+            fees.update(self._fees_from_history(history, semester, acad_year))
+        return fees
+    
+    def project_fees(self, org_id: int, semester: str, acad_year: str) -> dict:
+        """What-if: the fees every membership of an organization would owe for a semester,
+        from one status-history query"""
+        history = self._status_history("m.org_id = ?", (org_id,))
+        fees = self._fees_from_history(history, semester, acad_year)
+        by_fee = {}
+        for fee in fees.values():
+            by_fee[fee] = by_fee.get(fee, 0) + 1
+        return {'members': len(fees), 'total_fees': sum(fees.values()), 'members_by_fee': by_fee, 'fees': fees}
+    
+    def _status_history(self, where: str, params: tuple) -> List[tuple]:
+        # (membership_id, mem_status, semester, acad_year) for the selected memberships' terms, oldest first
+        query = f"""
+        SELECT t.membership_id, t.mem_status, t.semester, t.acad_year
+        FROM term t
+        JOIN membership m ON t.membership_id = m.membership_id
+        WHERE {where}
+        ORDER BY t.membership_id, t.term_start, t.term_id
+        """
+        return self.execute_query(query, params) or []
+    
+    @staticmethod
+    def _fees_from_history(history: Iterable[tuple], semester: str, acad_year: str) -> Dict[int, float]:
+        # Fee rules over each membership's status history (rows sorted by membership, oldest first):
+        #   latest status active           -> ACTIVE_MEMBER_FEE
+        #   latest status inactive, and the
+        #   inactive run began this term   -> INACTIVE_MEMBER_FEE (one time)
+        #   anything else, or no terms     -> 0
+        latest = {}          # membership_id -> latest mem_status
+        inactive_since = {}  # membership_id -> (semester, acad_year) starting the trailing inactive run
+        for membership_id, status, term_semester, term_acad_year in history:
+            if status == 'inactive' and latest.get(membership_id) != 'inactive':
+                inactive_since[membership_id] = (term_semester, term_acad_year)
+            latest[membership_id] = status
         
-        return 0.0
-
+        fees = {}
+        for membership_id, status in latest.items():
+            if status == 'active':
+                fees[membership_id] = ACTIVE_MEMBER_FEE
+            elif status == 'inactive' and inactive_since.get(membership_id) == (semester, acad_year):
+                fees[membership_id] = INACTIVE_MEMBER_FEE
+            else:
+                fees[membership_id] = 0.0
+        return fees
+    
     def add_term(self, term: Term) -> bool:
         """Add a new term with calculated fees"""
         # Calculate fees based on membership status
@@ -552,90 +1379,757 @@ class DatabaseManager:
         # Update term with calculated fee
         term.fee_amount = fee_amount
         
+        # Nothing is paid yet, so the whole fee is outstanding
         query = """
-        INSERT INTO term (semester, term_start, term_end, acad_year, fee_amount, fee_due, membership_id, role)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO term (semester, term_start, term_end, acad_year, fee_amount, balance, payment_status, fee_due, membership_id, role)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
-        return self.execute_update(query, (
-            term.semester, term.term_start, term.term_end, term.acad_year,
-            term.fee_amount, term.fee_due, term.membership_id, term.role
-        ))
+        # Add the new term to its organization's summary row
+        summary_query = f"""
+        INSERT INTO financial_summary (org_id, acad_year, semester, {FINANCIAL_SUMMARY_COLUMNS})
+        SELECT org_id, ?, ?, ?, 0, ?, 1, 0, ?
+        FROM membership
+        WHERE membership_id = ?
+        ON DUPLICATE KEY UPDATE
+            total_fees = total_fees + VALUES(total_fees),
+            total_unpaid = total_unpaid + VALUES(total_unpaid),
+            member_count = member_count + 1,
+            term_start = LEAST(term_start, VALUES(term_start))
+        """
+        with self.transaction() as transaction:
+            if self.execute_update(query, (
+                term.semester, term.term_start, term.term_end, term.acad_year,
+                term.fee_amount, term.fee_amount, self.initial_payment_status(term.fee_amount),
+                term.fee_due, term.membership_id, term.role
+            )):
+                self.execute_update(summary_query, (
+                    term.acad_year, term.semester, term.fee_amount, term.fee_amount,
+                    term.term_start, term.membership_id
+                ))
+        return transaction.ok
+    
+    @staticmethod
+    def initial_payment_status(fee_amount: float) -> str:
+        # Status of a term with no payments; matches DERIVED_PAYMENT_STATUS
+        return 'paid' if fee_amount <= 0 else 'unpaid'
+    
+    def rollover_semester(self, from_semester: str, from_acad_year: str, to_semester: str, to_acad_year: str,
+                          term_start: date, term_end: date, fee_due: date,
+                          org_id: Optional[int] = None) -> Optional[dict]:
+        """Create the next term for every membership that was active or inactive in the from term,
+        for one organization or all of them, with a single INSERT ... SELECT. Active members owe the
+        full fee and inactive ones nothing; roles carry over within the same academic year, otherwise
+        everyone starts the new year as Member. Memberships that already have the to term are skipped.
+        Returns counts (eligible, created, already_enrolled, total_fees), or None if it failed."""
+        org_filter = "AND m.org_id = ?" if org_id is not None else ""
+        org_params = (org_id,) if org_id is not None else ()
+        # Latest from term of each eligible membership, with its new fee
+        source = f"""(
+            SELECT t.membership_id, t.mem_status, t.role,
+                   CASE t.mem_status WHEN 'active' THEN {ACTIVE_MEMBER_FEE} ELSE 0 END AS fee,
+                   EXISTS (
+                       SELECT 1 FROM term n
+                       WHERE n.membership_id = t.membership_id AND n.semester = ? AND n.acad_year = ?
+                   ) AS enrolled,
+                   ROW_NUMBER() OVER (PARTITION BY t.membership_id ORDER BY t.term_start DESC, t.term_id DESC) AS rn
+            FROM term t
+            JOIN membership m ON t.membership_id = m.membership_id
+            WHERE t.semester = ? AND t.acad_year = ? AND t.mem_status IN ('active', 'inactive') {org_filter}
+        ) s"""
+        source_params = (to_semester, to_acad_year, from_semester, from_acad_year) + org_params
+        
+        count_query = f"""
+        SELECT COUNT(*), COALESCE(SUM(s.enrolled), 0), COALESCE(SUM(CASE WHEN s.enrolled THEN 0 ELSE s.fee END), 0)
+        FROM {source}
+        WHERE s.rn = 1
+        """
+        insert_query = f"""
+        INSERT INTO term (semester, term_start, term_end, acad_year, fee_amount, balance, payment_status,
+                          fee_due, membership_id, role, mem_status)
+        SELECT ?, ?, ?, ?, s.fee, s.fee, CASE WHEN s.fee <= 0 THEN 'paid' ELSE 'unpaid' END,
+               ?, s.membership_id, CASE WHEN ? THEN s.role ELSE 'Member' END, s.mem_status
+        FROM {source}
+        WHERE s.rn = 1 AND NOT s.enrolled
+        """
+        summary_query = self._upsert_financial_summary_query(
+            f"WHERE t.semester = ? AND t.acad_year = ? {org_filter}"
+        )
+        
+        with self.transaction() as transaction:
+            counts = self.execute_query(count_query, source_params)
+            if not counts:
+                transaction.failed = True
+                return None
+            eligible, enrolled, total_fees = counts[0]
+            keep_roles = from_acad_year == to_acad_year
+            if self.execute_update(insert_query, (
+                to_semester, term_start, term_end, to_acad_year, fee_due, keep_roles
+            ) + source_params):
+                self.execute_update(summary_query, (to_semester, to_acad_year) + org_params)
+        if not transaction.ok:
+            return None
+        return {
+            'eligible': int(eligible),
+            'created': int(eligible) - int(enrolled),
+            'already_enrolled': int(enrolled),
+            'total_fees': float(total_fees),
+        }
     
     def add_payment(self, payment: Payment) -> bool:
-        # Add a new payment
+        # Add a new payment and update its term's balance and status in one transaction
         query = """
         INSERT INTO payment (amount, payment_date, term_id)
         VALUES (?, ?, ?)
         """
-        if not self.execute_update(query, (
-            payment.amount, payment.payment_date, payment.term_id
-        )):
-            return False
-            
-        # Update payment status in term table
-        update_query = """
-        UPDATE term 
-        SET payment_status = 'paid'
-        WHERE term_id = ?
+        # Summary key of the term, whether it already had a late payment and whether its
+        # summary row exists. Locking the term keeps a concurrent payment to it from
+        # reading the same "no late payment yet" and counting it late twice.
+        term_query = """
+        SELECT m.org_id, t.acad_year, t.semester, t.fee_due,
+               EXISTS (
+                   SELECT 1 FROM payment p
+                   WHERE p.term_id = t.term_id AND p.payment_date > t.fee_due
+               ),
+               fs.org_id IS NOT NULL
+        FROM term t
+        JOIN membership m ON t.membership_id = m.membership_id
+        LEFT JOIN financial_summary fs
+            ON fs.org_id = m.org_id AND fs.acad_year = t.acad_year AND fs.semester = t.semester
+        WHERE t.term_id = ?
+        FOR UPDATE
+        """
+        summary_query = """
+        UPDATE financial_summary
+        SET total_paid = total_paid + ?, total_unpaid = total_unpaid - ?, late_count = late_count + ?
+        WHERE org_id = ? AND acad_year = ? AND semester = ?
+        """
+        with self.transaction() as transaction:
+            term = self.execute_query(term_query, (payment.term_id,))
+            if self.execute_update(query, (
+                payment.amount, payment.payment_date, payment.term_id
+            )) and self.refresh_term_balances([payment.term_id]) and term:
+                org_id, acad_year, semester, fee_due, was_late, has_summary = term[0]
+                if not has_summary:
+                    # Term predates the summary table (or was loaded with SQL): build its row
+                    self.refresh_financial_summary_for_terms([payment.term_id])
+                else:
+                    newly_late = bool(fee_due and payment.payment_date > fee_due and not was_late)
+                    self.execute_update(summary_query, (
+                        payment.amount, payment.amount, int(newly_late), org_id, acad_year, semester
+                    ))
+        return transaction.ok
+    
+    def update_payment(self, payment: Payment) -> bool:
+        # Change a payment and rebalance the term(s) it moved between
+        with self.transaction() as transaction:
+            result = self.execute_query("SELECT term_id FROM payment WHERE payment_id = ?", (payment.payment_id,))
+            if not result:
+                transaction.failed = True
+            else:
+                old_term_id = result[0][0]
+                query = """
+                UPDATE payment
+                SET amount = ?, payment_date = ?, term_id = ?
+                WHERE payment_id = ?
+                """
+                if self.execute_update(query, (
+                    payment.amount, payment.payment_date, payment.term_id, payment.payment_id
+                )) and self.refresh_term_balances({old_term_id, payment.term_id}):
+                    self.refresh_financial_summary_for_terms({old_term_id, payment.term_id})
+        return transaction.ok
+    
+    def delete_payment(self, payment_id: int) -> bool:
+        # Remove a payment and restore its term's balance
+        with self.transaction() as transaction:
+            result = self.execute_query("SELECT term_id FROM payment WHERE payment_id = ?", (payment_id,))
+            if not result:
+                transaction.failed = True
+            elif self.execute_update("DELETE FROM payment WHERE payment_id = ?", (payment_id,)) \
+                    and self.refresh_term_balances([result[0][0]]):
+                self.refresh_financial_summary_for_terms([result[0][0]])
+        return transaction.ok
+    
+    @staticmethod
+    def _refresh_term_balances_query(count: int) -> str:
+        placeholders = ", ".join("?" * count)
+        return f"""
+        UPDATE {_term_balance_source(f"WHERE term_id IN ({placeholders})")}
+        SET t.payment_status = {DERIVED_PAYMENT_STATUS},
+            t.balance = {DERIVED_BALANCE}
+        WHERE t.term_id IN ({placeholders})
         """
-        return self.execute_update(update_query, (payment.term_id,))
     
+    def refresh_term_balances(self, term_ids: Iterable[int]) -> bool:
+        """Recompute balance and payment_status of the given terms from their payments"""
+        term_ids = sorted(set(term_ids))
+        if not term_ids:
+            return True
+        query = self._refresh_term_balances_query(len(term_ids))
+        return self.execute_update(query, tuple(term_ids) * 2)
+    
+    def reconcile_term_balances(self, repair: bool = False) -> Optional[List[dict]]:
+        """Find terms whose stored balance or payment_status disagrees with their payments.
+        With repair=True the drifted terms are corrected in the same transaction.
+        Returns None if the check failed."""
+        drift_condition = f"""
+            NOT (t.balance <=> {DERIVED_BALANCE})
+            OR NOT (t.payment_status <=> {DERIVED_PAYMENT_STATUS})
+        """
+        query = f"""
+        SELECT t.term_id, t.balance, {DERIVED_BALANCE} AS actual_balance,
+               t.payment_status, {DERIVED_PAYMENT_STATUS} AS actual_status
+        FROM {_term_balance_source()}
+        WHERE {drift_condition}
+        """
+        repair_query = f"""
+        UPDATE {_term_balance_source()}
+        SET t.payment_status = {DERIVED_PAYMENT_STATUS},
+            t.balance = {DERIVED_BALANCE}
+        WHERE {drift_condition}
+        """
+        with self.transaction() as transaction:
+            results = self.execute_query(query)
+            if results and repair and self.execute_update(repair_query):
+                # Summary totals were built from the drifted balances
+                self.rebuild_financial_summary()
+        
+        if not transaction.ok or results is None:
+            logger.error("Balance reconciliation failed")
+            return None
+        if results:
+            logger.warning("%d term balances %s", len(results), "repaired" if repair else "out of sync")
+        return [
+            {
+                'term_id': row[0], 'balance': row[1], 'actual_balance': row[2],
+                'payment_status': row[3], 'actual_status': row[4]
+            }
+            for row in results
+        ]
+
+    # FINANCIAL SUMMARY
+    @staticmethod
+    def _upsert_financial_summary_query(where: str) -> str:
+        # Recompute the summary rows selected by where (over term t / membership m)
+        return f"""
+        INSERT INTO financial_summary (org_id, acad_year, semester, {FINANCIAL_SUMMARY_COLUMNS})
+        {_financial_summary_select(where)}
+        ON DUPLICATE KEY UPDATE
+            total_fees = VALUES(total_fees),
+            total_paid = VALUES(total_paid),
+            total_unpaid = VALUES(total_unpaid),
+            member_count = VALUES(member_count),
+            late_count = VALUES(late_count),
+            term_start = VALUES(term_start)
+        """
+    
+    @staticmethod
+    def _summary_filter_for_terms(count: int) -> str:
+        # Every (org, year, semester) that count term_ids belong to
+        placeholders = ", ".join("?" * count)
+        return f"""
+        WHERE (m.org_id, t.acad_year, t.semester) IN (
+            SELECT m2.org_id, t2.acad_year, t2.semester
+            FROM term t2
+            JOIN membership m2 ON t2.membership_id = m2.membership_id
+            WHERE t2.term_id IN ({placeholders})
+        )
+        """
+    
+    def refresh_financial_summary_for_terms(self, term_ids: Iterable[int]) -> bool:
+        """Recompute the financial summary rows the given terms belong to"""
+        term_ids = sorted(set(term_ids))
+        if not term_ids:
+            return True
+        query = self._upsert_financial_summary_query(self._summary_filter_for_terms(len(term_ids)))
+        return self.execute_update(query, tuple(term_ids))
+    
+    def rebuild_financial_summary(self, org_id: Optional[int] = None) -> bool:
+        """Rebuild the financial summary from term and payment, for one organization or all"""
+        if org_id is None:
+            delete_query, where, params = "DELETE FROM financial_summary", "", ()
+        else:
+            delete_query = "DELETE FROM financial_summary WHERE org_id = ?"
+            where, params = "WHERE m.org_id = ?", (org_id,)
+        insert_query = f"""
+        INSERT INTO financial_summary (org_id, acad_year, semester, {FINANCIAL_SUMMARY_COLUMNS})
+        {_financial_summary_select(where)}
+        """
+        with self.transaction() as transaction:
+            if self.execute_update(delete_query, params):
+                self.execute_update(insert_query, params)
+        return transaction.ok
+    
+    def get_financial_summary(self, org_id: int) -> List[dict]:
+        # Per-term totals for an organization from the summary table, most recent first
+        return list(self.iter_financial_summary(org_id))
+    
+    def iter_financial_summary(self, org_id: int) -> Iterator[dict]:
+        """Stream get_financial_summary one row at a time"""
+        query = f"""
+        SELECT acad_year, semester, {FINANCIAL_SUMMARY_COLUMNS}
+        FROM financial_summary
+        WHERE org_id = ?
+        ORDER BY acad_year DESC,
+            CASE semester
+                WHEN '1st' THEN 1
+                WHEN '2nd' THEN 2
+                WHEN 'Summer' THEN 3
+                ELSE 4
+            END
+        """
+        for row in self.iter_query(query, (org_id,)):
+            yield {
+                'acad_year': row[0], 'semester': row[1], 'total_fees': row[2],
+                'total_paid': row[3], 'total_unpaid': row[4], 'member_count': row[5],
+                'late_count': row[6], 'term_start': row[7]
+            }
+
     def get_term_balances(self) -> List[dict]:
-        # Get term payments and computed balance
+        # Get term payments and balance
+        return list(self.iter_term_balances())
+    
+    def iter_term_balances(self) -> Iterator[dict]:
+        """Stream get_term_balances one row at a time"""
         query = """
         SELECT t.term_id, t.semester, t.acad_year, t.fee_amount,
-               SUM(IFNULL(p.amount, 0)) AS total_paid,
-               (t.fee_amount - SUM(IFNULL(p.amount, 0))) AS balance
+               (t.fee_amount - t.balance) AS total_paid,
+               t.balance
         FROM term t
-        LEFT JOIN payment p ON t.term_id = p.term_id
-        GROUP BY t.term_id
         """
-        results = self.execute_query(query)
-        
-        if results:
-            return [
-                {
-                    'term_id': row[0], 'semester': row[1], 'acad_year': row[2],
-                    'fee_amount': row[3], 'total_paid': row[4], 'balance': row[5]
-                }
-                for row in results
-            ]
-        return []
+        for row in self.iter_query(query):
+            yield {
+                'term_id': row[0], 'semester': row[1], 'acad_year': row[2],
+                'fee_amount': row[3], 'total_paid': row[4], 'balance': row[5]
+            }
     
     def get_financial_summary_by_org(self) -> List[dict]:
         # Get financial summary per organization
+        return list(self.iter_financial_summary_by_org())
+    
+    def iter_financial_summary_by_org(self) -> Iterator[dict]:
+        """Stream get_financial_summary_by_org one row at a time"""
         query = """
         SELECT org.org_name,
-               SUM(t.fee_amount) AS total_fees,
-               SUM(IFNULL(p.amount, 0)) AS total_collected,
-               SUM(t.fee_amount - IFNULL(p.amount, 0)) AS total_balance 
+               SUM(fs.total_fees) AS total_fees,
+               SUM(fs.total_paid) AS total_collected,
+               SUM(fs.total_unpaid) AS total_balance
         FROM organization org
-        JOIN membership m ON org.org_id = m.org_id
-        JOIN term t ON m.membership_id = t.membership_id
-        LEFT JOIN (
-            SELECT term_id, SUM(amount) AS amount
-            FROM payment
-            GROUP BY term_id
-        ) p ON t.term_id = p.term_id
+        JOIN financial_summary fs ON org.org_id = fs.org_id
         GROUP BY org.org_name
         """
-        results = self.execute_query(query)
-        
-        if results:
-            return [
-                {
-                    'organization': row[0], 'total_fees': row[1],
-                    'total_collected': row[2], 'total_balance': row[3]
-                }
-                for row in results
-            ]
-        return []
+        for row in self.iter_query(query):
+            yield {
+                'organization': row[0], 'total_fees': row[1],
+                'total_collected': row[2], 'total_balance': row[3]
+            }
 
+    # BULK OPERATIONS
+    def add_students_bulk(self, students: Iterable[Student], chunk_size: Optional[int] = None) -> BulkResult:
+        """Insert many students in one transaction"""
+        query = """
+        INSERT INTO student (first_name, last_name, gender, degree_program, standing)
+        VALUES (?, ?, ?, ?, ?)
+        """
+        return self._bulk_insert(query, students, lambda s: (
+            s.first_name, s.last_name, s.gender, s.degree_program, s.standing
+        ), chunk_size)
+    
+    def add_memberships_bulk(self, memberships: Iterable[Membership], chunk_size: Optional[int] = None) -> BulkResult:
+        """Upsert many memberships in one transaction, like add_membership but with one
+        executemany round trip per chunk"""
+        return self._bulk_insert(self.MEMBERSHIP_UPSERT, memberships, self._membership_params, chunk_size)
+    
+    def add_terms_bulk(self, terms: Iterable[Term], chunk_size: Optional[int] = None) -> BulkResult:
+        """Insert many terms in one transaction, with fees calculated like add_term"""
+        terms = list(terms)
+        # Fees are looked up before the insert transaction takes its connection,
+        # one batch per (semester, academic year)
+        periods = {}
+        for term in terms:
+            periods.setdefault((term.semester, term.acad_year), []).append(term)
+        for (semester, acad_year), period_terms in periods.items():
+            fees = self.calculate_member_fees_batch([t.membership_id for t in period_terms], semester, acad_year)
+            for term in period_terms:
+                term.fee_amount = fees.get(term.membership_id, 0.0)
+        
+        query = """
+        INSERT INTO term (semester, term_start, term_end, acad_year, fee_amount, balance, payment_status, fee_due, membership_id, role)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        # New term_ids are not known here, so refresh every summary row for the
+        # chunk's organizations and periods (a superset of the rows it touched)
+        def summarize(cursor, written):
+            membership_ids = sorted({t.membership_id for t in written})
+            periods = sorted({(t.acad_year, t.semester) for t in written})
+            where = f"""
+            WHERE m.org_id IN (
+                SELECT org_id FROM membership WHERE membership_id IN ({", ".join("?" * len(membership_ids))})
+            )
+            AND (t.acad_year, t.semester) IN ({", ".join(["(?, ?)"] * len(periods))})
+            """
+            query = self._upsert_financial_summary_query(where)
+            cursor.execute(query, tuple(membership_ids) + tuple(value for period in periods for value in period))
+            self._record_write(query)
+        
+        return self._bulk_insert(query, terms, lambda t: (
+            t.semester, t.term_start, t.term_end, t.acad_year,
+            t.fee_amount, t.fee_amount, self.initial_payment_status(t.fee_amount),
+            t.fee_due, t.membership_id, t.role
+        ), chunk_size, after_chunk=summarize)
+    
+    def add_payments_bulk(self, payments: Iterable[Payment], chunk_size: Optional[int] = None) -> BulkResult:
+        """Insert many payments in one transaction and update their terms' balances"""
+        query = """
+        INSERT INTO payment (amount, payment_date, term_id)
+        VALUES (?, ?, ?)
+        """
+        
+        def rebalance(cursor, written):
+            term_ids = sorted({p.term_id for p in written})
+            balances_query = self._refresh_term_balances_query(len(term_ids))
+            summary_query = self._upsert_financial_summary_query(self._summary_filter_for_terms(len(term_ids)))
+            cursor.execute(balances_query, tuple(term_ids) * 2)
+            cursor.execute(summary_query, tuple(term_ids))
+            self._record_write(balances_query)
+            self._record_write(summary_query)
+        
+        return self._bulk_insert(query, payments, lambda p: (
+            p.amount, p.payment_date, p.term_id
+        ), chunk_size, after_chunk=rebalance)
+    
+    # Per-connection staging table for merge_import
+    IMPORT_STAGING_TABLE = """
+    CREATE TEMPORARY TABLE import_staging (
+        row_no INT PRIMARY KEY,
+        student_id INT NULL,
+        first_name VARCHAR(255) NOT NULL,
+        last_name VARCHAR(255) NOT NULL,
+        gender VARCHAR(20) NOT NULL,
+        degree_program VARCHAR(255) NOT NULL,
+        standing VARCHAR(20) NOT NULL,
+        org_id INT NOT NULL,
+        batch VARCHAR(20),
+        committee VARCHAR(50),
+        KEY (student_id),
+        KEY (last_name, first_name, degree_program)
+    )
+    """
+    
+    # Fill in student_id for staged rows without one from a student with the same name and program
+    IMPORT_MATCH_STUDENTS = """
+    UPDATE import_staging i
+    JOIN student s ON s.last_name = i.last_name AND s.first_name = i.first_name
+        AND s.degree_program = i.degree_program
+    SET i.student_id = s.student_id
+    WHERE i.student_id IS NULL
+    """
+    
+    def merge_import(self, rows: Iterable[Tuple[int, Student, Membership]],
+                     chunk_size: Optional[int] = None) -> ImportResult:
+        """Stage (row number, student, membership) rows in a temporary table, then merge them into
+        student, member, membership and has_membership with set-based statements, all in one
+        transaction. membership.student_id is ignored; students come from student.student_id, or
+        are matched on name and degree program, or added."""
+        result = ImportResult()
+        if not self.pool:
+            result.error = "Not connected to the database"
+            return result
+        
+        staging_query = """
+        INSERT INTO import_staging
+            (row_no, student_id, first_name, last_name, gender, degree_program, standing, org_id, batch, committee)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        try:
+            with self.transaction() as transaction:
+                if transaction.pooled is None:
+                    result.error = "Could not start the import transaction"
+                    return result
+                cursor = transaction.pooled.connection.cursor()
+                try:
+                    cursor.execute("DROP TEMPORARY TABLE IF EXISTS import_staging")
+                    cursor.execute(self.IMPORT_STAGING_TABLE)
+                    # Nested in this transaction, so it stages on the same connection
+                    staged = self._bulk_insert(staging_query, rows, lambda row: (
+                        row[0], row[1].student_id, row[1].first_name, row[1].last_name, row[1].gender,
+                        row[1].degree_program, row[1].standing, row[2].org_id, row[2].batch, row[2].committee
+                    ), chunk_size)
+                    result.inserted = staged.inserted
+                    result.failed = staged.failed
+                    if not staged.ok:
+                        result.error = staged.error
+                        transaction.failed = True
+                        return result
+                    self._merge_staged_import(cursor, result)
+                    cursor.execute("DROP TEMPORARY TABLE IF EXISTS import_staging")
+                finally:
+                    cursor.close()
+            if not transaction.ok:
+                result.error = result.error or "Import transaction was rolled back"
+        except (mariadb.Error, PoolTimeoutError) as e:
+            logger.error("Import error: %s", e)
+            result.error = str(e)
+        
+        if result.error:
+            # Nothing was merged
+            result = ImportResult(failed=result.failed, error=result.error)
+        return result
+    
+    def _merge_staged_import(self, cursor, result: ImportResult):
+        # Merge import_staging into the membership tables, one statement per step
+        def run(query: str) -> int:
+            cursor.execute(query)
+            self._record_write(query)
+            return cursor.rowcount
+        
+        # Students named by ID: add the missing ones, refresh the rest from the file
+        cursor.execute("""
+        SELECT COUNT(DISTINCT i.student_id), COUNT(DISTINCT s.student_id)
+        FROM import_staging i
+        LEFT JOIN student s ON s.student_id = i.student_id
+        WHERE i.student_id IS NOT NULL
+        """)
+        named, existing = cursor.fetchone()
+        run("""
+        INSERT INTO student (student_id, first_name, last_name, gender, degree_program, standing)
+        SELECT student_id, first_name, last_name, gender, degree_program, standing
+        FROM import_staging
+        WHERE student_id IS NOT NULL
+        ORDER BY row_no
+        ON DUPLICATE KEY UPDATE first_name = VALUES(first_name), last_name = VALUES(last_name),
+            gender = VALUES(gender), degree_program = VALUES(degree_program), standing = VALUES(standing)
+        """)
+        result.students_updated = existing
+        result.students_added = named - existing
+        
+        # Students without an ID: match existing ones, add one per remaining (name, program)
+        result.students_matched = run(self.IMPORT_MATCH_STUDENTS)
+        result.students_added += run("""
+        INSERT INTO student (first_name, last_name, gender, degree_program, standing)
+        SELECT first_name, last_name, MIN(gender), degree_program, MIN(standing)
+        FROM import_staging
+        WHERE student_id IS NULL
+        GROUP BY last_name, first_name, degree_program
+        """)
+        run(self.IMPORT_MATCH_STUDENTS)
+        
+        result.members_added = run("""
+        INSERT INTO member (student_id)
+        SELECT DISTINCT i.student_id
+        FROM import_staging i
+        WHERE NOT EXISTS (SELECT 1 FROM member mb WHERE mb.student_id = i.student_id)
+        """)
+        
+        cursor.execute("""
+        SELECT COUNT(DISTINCT i.student_id, i.org_id), COUNT(DISTINCT m.membership_id)
+        FROM import_staging i
+        LEFT JOIN membership m ON m.student_id = i.student_id AND m.org_id = i.org_id
+        """)
+        pairs, existing = cursor.fetchone()
+        run("""
+        INSERT INTO membership (batch, committee, org_id, student_id)
+        SELECT batch, committee, org_id, student_id
+        FROM import_staging
+        ORDER BY row_no
+        ON DUPLICATE KEY UPDATE batch = VALUES(batch), committee = VALUES(committee)
+        """)
+        result.memberships_updated = existing
+        result.memberships_added = pairs - existing
+        
+        run("""
+        INSERT INTO has_membership (student_id, membership_id)
+        SELECT DISTINCT m.student_id, m.membership_id
+        FROM import_staging i
+        JOIN membership m ON m.student_id = i.student_id AND m.org_id = i.org_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM has_membership h
+            WHERE h.student_id = m.student_id AND h.membership_id = m.membership_id
+        )
+        """)
+    
+    # Per-connection staging table for post_payments
+    PAYMENT_STAGING_TABLE = """
+    CREATE TEMPORARY TABLE payment_staging (
+        row_no INT PRIMARY KEY,
+        student_id INT NULL,
+        term_id INT NULL,
+        amount DECIMAL(10,2) NOT NULL,
+        payment_date DATE NOT NULL,
+        matched_term_id INT NULL,
+        KEY (student_id),
+        KEY (matched_term_id)
+    )
+    """
+    
+    def post_payments(self, rows: Iterable[Tuple[int, Optional[int], Optional[int], float, date]],
+                      org_id: Optional[int] = None, semester: Optional[str] = None,
+                      acad_year: Optional[str] = None, dry_run: bool = False,
+                      chunk_size: Optional[int] = None) -> PaymentPostResult:
+        """Post (row number, student_id, term_id, amount, payment_date) rows in one transaction.
+        A row with a term_id pays that term. Rows with only a student_id are applied in file order
+        to the student's open terms (balance > 0), oldest first, optionally limited to an
+        organization and semester: each row pays the term its running total for the student
+        reaches, so a second payment moves on once the first has covered the oldest term. A row
+        is never split; one paying past the last open term is reported as overpaid. Matching,
+        inserting and rebalancing are set-based; with dry_run everything is rolled back afterwards."""
+        result = PaymentPostResult()
+        if not self.pool:
+            result.error = "Not connected to the database"
+            return result
+        
+        staging_query = """
+        INSERT INTO payment_staging (row_no, student_id, term_id, amount, payment_date)
+        VALUES (?, ?, ?, ?, ?)
+        """
+        try:
+            with self.transaction() as transaction:
+                if transaction.pooled is None:
+                    result.error = "Could not start the payment transaction"
+                    return result
+                cursor = transaction.pooled.connection.cursor()
+                try:
+                    cursor.execute("DROP TEMPORARY TABLE IF EXISTS payment_staging")
+                    cursor.execute("DROP TEMPORARY TABLE IF EXISTS payment_running")
+                    cursor.execute(self.PAYMENT_STAGING_TABLE)
+                    staged = self._bulk_insert(staging_query, rows, tuple, chunk_size)
+                    result.inserted = staged.inserted
+                    result.failed = staged.failed
+                    if not staged.ok:
+                        result.error = staged.error
+                        transaction.failed = True
+                        return result
+                    self._post_staged_payments(cursor, result, org_id, semester, acad_year)
+                    cursor.execute("DROP TEMPORARY TABLE IF EXISTS payment_staging")
+                    cursor.execute("DROP TEMPORARY TABLE IF EXISTS payment_running")
+                finally:
+                    cursor.close()
+                if dry_run:
+                    transaction.failed = True
+            if not transaction.ok and not dry_run:
+                result.error = result.error or "Payment transaction was rolled back"
+        except (mariadb.Error, PoolTimeoutError) as e:
+            logger.error("Payment posting error: %s", e)
+            result.error = str(e)
+        
+        if result.error:
+            # Nothing was posted
+            result = PaymentPostResult(failed=result.failed, error=result.error)
+        return result
+    
+    def _post_staged_payments(self, cursor, result: PaymentPostResult, org_id: Optional[int],
+                              semester: Optional[str], acad_year: Optional[str]):
+        # Match payment_staging rows to terms, insert the payments and rebalance the terms
+        cursor.execute("""
+        UPDATE payment_staging s
+        JOIN term t ON t.term_id = s.term_id
+        SET s.matched_term_id = t.term_id
+        WHERE s.term_id IS NOT NULL
+        """)
+        
+        filters = ["t.balance > 0"]
+        params = []
+        if org_id is not None:
+            filters.append("m.org_id = ?")
+            params.append(org_id)
+        if semester and acad_year:
+            filters.append("t.semester = ? AND t.acad_year = ?")
+            params.extend([semester, acad_year])
+        # How much each student-only row's earlier rows for the same student paid. A temporary
+        # table cannot be opened twice in one statement, so this goes into its own table.
+        cursor.execute("""
+        CREATE TEMPORARY TABLE payment_running (PRIMARY KEY (row_no))
+        SELECT row_no, SUM(amount) OVER (PARTITION BY student_id ORDER BY row_no) - amount AS paid_before
+        FROM payment_staging
+        WHERE term_id IS NULL
+        """)
+        # Each row pays the open term whose share of the student's running balance
+        # [owed_through - balance, owed_through) holds paid_before; past the end, the last one
+        cursor.execute(f"""
+        UPDATE payment_staging s
+        JOIN payment_running r ON r.row_no = s.row_no
+        JOIN (
+            SELECT m.student_id, t.term_id, t.balance,
+                   SUM(t.balance) OVER (PARTITION BY m.student_id ORDER BY t.term_start, t.term_id) AS owed_through,
+                   ROW_NUMBER() OVER (PARTITION BY m.student_id ORDER BY t.term_start DESC, t.term_id DESC) AS from_last
+            FROM term t
+            JOIN membership m ON t.membership_id = m.membership_id
+            WHERE {" AND ".join(filters)}
+        ) open_term ON open_term.student_id = s.student_id
+            AND r.paid_before >= open_term.owed_through - open_term.balance
+            AND (r.paid_before < open_term.owed_through OR open_term.from_last = 1)
+        SET s.matched_term_id = open_term.term_id
+        WHERE s.term_id IS NULL
+        """, tuple(params))
+        
+        cursor.execute("""
+        SELECT row_no, student_id, term_id, amount, payment_date
+        FROM payment_staging
+        WHERE matched_term_id IS NULL
+        ORDER BY row_no
+        """)
+        result.unmatched = [
+            {'row': row[0], 'student_id': row[1], 'term_id': row[2], 'amount': row[3], 'payment_date': row[4]}
+            for row in cursor.fetchall()
+        ]
+        
+        # Rows whose running total for their term goes past the term's balance before posting
+        cursor.execute("""
+        SELECT row_no, student_id, term_id, amount, payment_date, balance,
+               LEAST(amount, running - GREATEST(balance, 0))
+        FROM (
+            SELECT s.row_no, s.student_id, s.matched_term_id AS term_id, s.amount, s.payment_date, t.balance,
+                   SUM(s.amount) OVER (PARTITION BY s.matched_term_id ORDER BY s.row_no) AS running
+            FROM payment_staging s
+            JOIN term t ON t.term_id = s.matched_term_id
+        ) posted
+        WHERE running > GREATEST(balance, 0)
+        ORDER BY row_no
+        """)
+        result.overpaid = [
+            {
+                'row': row[0], 'student_id': row[1], 'term_id': row[2], 'amount': row[3],
+                'payment_date': row[4], 'balance': row[5], 'overpaid_by': row[6]
+            }
+            for row in cursor.fetchall()
+        ]
+        
+        insert_query = """
+        INSERT INTO payment (amount, payment_date, term_id)
+        SELECT amount, payment_date, matched_term_id
+        FROM payment_staging
+        WHERE matched_term_id IS NOT NULL
+        ORDER BY row_no
+        """
+        cursor.execute(insert_query)
+        self._record_write(insert_query)
+        result.posted = cursor.rowcount
+        
+        cursor.execute("""
+        SELECT matched_term_id, SUM(amount)
+        FROM payment_staging
+        WHERE matched_term_id IS NOT NULL
+        GROUP BY matched_term_id
+        """)
+        term_rows = cursor.fetchall()
+        term_ids = [row[0] for row in term_rows]
+        result.terms_updated = len(term_ids)
+        result.total_posted = float(sum(row[1] for row in term_rows))
+        if not term_ids:
+            return
+        
+        balances_query = self._refresh_term_balances_query(len(term_ids))
+        summary_query = self._upsert_financial_summary_query(self._summary_filter_for_terms(len(term_ids)))
+        cursor.execute(balances_query, tuple(term_ids) * 2)
+        cursor.execute(summary_query, tuple(term_ids))
+        self._record_write(balances_query)
+        self._record_write(summary_query)
+    
     def drop_all_tables(self) -> bool:
         """Drop all tables in the database"""
         try:
             # Drop tables in reverse order of dependencies
             tables = [
+                "financial_summary",
                 "payment",
                 "term",
                 "membership",
@@ -647,14 +2141,15 @@ class DatabaseManager:
             for table in tables:
                 query = f"DROP TABLE IF EXISTS {table}"
                 if not self.execute_update(query):
-                    print(f"Failed to drop table {table}")
+                    logger.error("Failed to drop table %s", table)
                     return False
             
-            print("All tables dropped successfully")
+            self.org_directory.invalidate()
+            logger.info("All tables dropped successfully")
             return True
             
         except Exception as e:
-            print(f"Error dropping tables: {e}")
+            logger.exception("Error dropping tables: %s", e)
             return False
 
     def recreate_database(self) -> bool:
@@ -724,19 +2219,34 @@ class DatabaseManager:
                     payment_date DATE,
                     term_id INT,
                     FOREIGN KEY (term_id) REFERENCES term(term_id) ON DELETE CASCADE
+                )""",
+                
+                """CREATE TABLE financial_summary (
+                    org_id INT,
+                    acad_year VARCHAR(20),
+                    semester VARCHAR(20),
+                    total_fees DECIMAL(12,2) NOT NULL DEFAULT 0,
+                    total_paid DECIMAL(12,2) NOT NULL DEFAULT 0,
+                    total_unpaid DECIMAL(12,2) NOT NULL DEFAULT 0,
+                    member_count INT NOT NULL DEFAULT 0,
+                    late_count INT NOT NULL DEFAULT 0,
+                    term_start DATE,
+                    PRIMARY KEY (org_id, acad_year, semester),
+                    FOREIGN KEY (org_id) REFERENCES organization(org_id) ON DELETE CASCADE
                 )"""
             ]
             
             for query in queries:
                 if not self.execute_update(query):
-                    print(f"Failed to execute query: {query}")
+                    logger.error("Failed to execute query: %s", query)
                     return False
             
-            print("Database schema recreated successfully")
+            self.org_directory.invalidate()
+            logger.info("Database schema recreated successfully")
             return True
             
         except Exception as e:
-            print(f"Error recreating database: {e}")
+            logger.exception("Error recreating database: %s", e)
             return False
         
     def get_available_academic_years(self) -> List[str]:
@@ -849,7 +2359,11 @@ class DatabaseManager:
         SET t.term_start = ?, t.term_end = ?, t.fee_due = ?
         WHERE m.org_id = ? AND t.semester = ? AND t.acad_year = ?
         """
-        return self.execute_update(query, (new_start, new_end, new_end, org_id, semester, acad_year))
+        # The due date decides which terms count as late
+        with self.transaction() as transaction:
+            if self.execute_update(query, (new_start, new_end, new_end, org_id, semester, acad_year)):
+                self.rebuild_financial_summary(org_id)
+        return transaction.ok
 
     def get_member_status(self, student_id: int, org_id: int) -> Optional[str]:
         """Get a member's status for a specific organization"""
@@ -904,13 +2418,12 @@ class DatabaseManager:
         query1 = "DELETE FROM has_membership WHERE membership_id=?"
         # Then delete from membership
         query2 = "DELETE FROM membership WHERE membership_id=?"
-        try:
-            self.execute_update(query1, (membership_id,))
-            self.execute_update(query2, (membership_id,))
-            return True
-        except Exception as e:
-            print(f"Error deleting membership: {e}")
-            return False
+        with self.transaction() as transaction:
+            org = self.execute_query("SELECT org_id FROM membership WHERE membership_id = ?", (membership_id,))
+            if self.execute_update(query1, (membership_id,)) and self.execute_update(query2, (membership_id,)) and org:
+                # Its terms are gone from the organization's totals
+                self.rebuild_financial_summary(org[0][0])
+        return transaction.ok
 
     def update_membership_role(self, membership_id: int, role: str) -> bool:
         """Update the role for a membership"""
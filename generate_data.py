@@ -0,0 +1,386 @@
+"""Generate a synthetic, reproducible dataset and bulk-load it into MariaDB.
+
+Examples:
+    python generate_data.py --user root --students 70                     # ~1k rows
+    python generate_data.py --user root --students 70000 --orgs 150       # ~1M rows
+    python generate_data.py --user root --students 700000 --load-data     # ~10M rows
+
+The same --seed, --last-year and sizes always produce the same rows. New rows get IDs after
+the current maximum of each table, so a run adds to whatever is already loaded.
+Students can join several organizations. Some members hold officer roles, and
+some go inactive, get expelled or graduate into alumni. Fees are paid in full,
+in part, late or not at all. Term balances and payment statuses are stored
+consistently with the payments, and financial_summary is rebuilt after the load.
+
+Rows are sent with executemany in large chunks. With --load-data they are written
+to tab-separated files and loaded with LOAD DATA LOCAL INFILE instead, which is
+much faster but needs local_infile enabled on the server.
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import mariadb
+
+from config import DatabaseConfig
+from database import ACTIVE_MEMBER_FEE, INACTIVE_MEMBER_FEE, DatabaseManager
+from cli_common import add_connection_arguments, configure_connection, configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Table -> columns, in load order
+TABLES = {
+    'organization': ('org_id', 'org_name'),
+    'student': ('student_id', 'first_name', 'last_name', 'gender', 'degree_program', 'standing'),
+    'member': ('member_id', 'student_id'),
+    'membership': ('membership_id', 'batch', 'committee', 'org_id', 'student_id'),
+    'has_membership': ('student_id', 'membership_id'),
+    'term': ('term_id', 'semester', 'payment_status', 'mem_status', 'role', 'term_start', 'term_end',
+             'acad_year', 'fee_amount', 'fee_due', 'balance', 'membership_id'),
+    'payment': ('payment_id', 'amount', 'payment_date', 'term_id'),
+}
+
+FIRST_NAMES = [
+    'James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'William', 'Elizabeth',
+    'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah', 'Charles', 'Karen',
+    'Jose', 'Maria', 'Juan', 'Ana', 'Mark', 'Grace', 'Paolo', 'Andrea', 'Miguel', 'Camille',
+    'Angelo', 'Nicole', 'Carlo', 'Bea', 'Rafael', 'Patricia', 'Gabriel', 'Isabel', 'Daniel', 'Sofia',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Santos', 'Reyes', 'Cruz', 'Bautista', 'Ocampo', 'Garcia', 'Mendoza', 'Torres', 'Flores', 'Villanueva',
+    'Ramos', 'Castillo', 'Aquino', 'Navarro', 'Dela Cruz', 'Gonzales', 'Lopez', 'Hernandez', 'Perez', 'Rivera',
+]
+DEGREE_PROGRAMS = [
+    'Computer Science', 'Software Engineering', 'Information Technology', 'Electrical Engineering',
+    'Mathematics', 'Statistics', 'Physics', 'Biology', 'Chemistry', 'Economics', 'Applied Mathematics',
+]
+COMMITTEES = ['Finance', 'Secretariat', 'Documentation', 'Externals', 'Membership', 'Logistics',
+              'Education & Research', 'Publication']
+OFFICER_ROLES = ['President', 'Vice President', 'Secretary', 'Treasurer']
+ORG_KINDS = ['Society', 'Guild', 'Circle', 'Club', 'Association', 'League']
+
+
+# Newest generated academic year, by its first calendar year (2024 -> 2024-2025).
+# Fixed rather than taken from today's date so a seed gives the same rows on any day.
+DEFAULT_LAST_YEAR = 2024
+
+
+def academic_periods(years: int, last_year: int) -> List[tuple]:
+    """(semester, acad_year, term_start, term_end) for the 1st and 2nd semesters of `years` years"""
+    periods = []
+    for year in range(last_year - years + 1, last_year + 1):
+        acad_year = f"{year}-{year + 1}"
+        periods.append(('1st', acad_year, date(year, 8, 1), date(year, 12, 15)))
+        periods.append(('2nd', acad_year, date(year + 1, 1, 10), date(year + 1, 5, 31)))
+    return periods
+
+
+class Generator:
+    # --- Produces related rows for every table from one seeded random stream ---
+
+    def __init__(self, seed: int, students: int, orgs: int, years: int, first_ids: Dict[str, int],
+                 last_year: int = DEFAULT_LAST_YEAR):
+        self.random = random.Random(seed)
+        self.students = students
+        self.orgs = orgs
+        self.periods = academic_periods(years, last_year)
+        self.ids = dict(first_ids)
+        # Organization sizes are skewed: a few large ones, many small ones
+        self.org_weights = [1 / (rank ** 0.8) for rank in range(1, orgs + 1)]
+
+    def _next_id(self, table: str) -> int:
+        value = self.ids[table]
+        self.ids[table] += 1
+        return value
+
+    def rows(self):
+        """Yield (table, row) pairs; parents always come before their children"""
+        org_ids = []
+        for _ in range(self.orgs):
+            org_id = self._next_id('organization')
+            org_ids.append(org_id)
+            kind = self.random.choice(ORG_KINDS)
+            yield 'organization', (org_id, f"{self.random.choice(DEGREE_PROGRAMS)} {kind} {org_id}")
+
+        for _ in range(self.students):
+            yield from self._student(org_ids)
+
+    def _student(self, org_ids: List[int]):
+        rnd = self.random
+        student_id = self._next_id('student')
+        graduated = rnd.random() < 0.15
+        standing = 'Graduate' if graduated else rnd.choice(['Freshman', 'Sophomore', 'Junior', 'Senior'])
+        gender = rnd.choices(['Male', 'Female', 'Other'], weights=[48, 48, 4])[0]
+        yield 'student', (student_id, rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES), gender,
+                          rnd.choice(DEGREE_PROGRAMS), standing)
+
+        # About one student in ten joins nothing; the rest join one to three organizations
+        if rnd.random() < 0.1:
+            return
+        count = rnd.choices([1, 2, 3], weights=[60, 30, 10])[0]
+        joined = set()
+        for _ in range(count):
+            joined.add(rnd.choices(org_ids, weights=self.org_weights)[0])
+
+        yield 'member', (self._next_id('member'), student_id)
+        for org_id in sorted(joined):
+            yield from self._membership(student_id, org_id, graduated)
+
+    def _membership(self, student_id: int, org_id: int, graduated: bool):
+        rnd = self.random
+        membership_id = self._next_id('membership')
+        start = rnd.randrange(len(self.periods))
+        yield 'membership', (membership_id, self.periods[start][1], rnd.choice(COMMITTEES), org_id, student_id)
+        yield 'has_membership', (student_id, membership_id)
+
+        # One term per semester from joining until now (or until graduating/leaving)
+        length = len(self.periods) - start
+        if graduated:
+            length = max(1, min(length, rnd.randint(2, 8)))
+        status = 'active'
+        for offset in range(length):
+            semester, acad_year, term_start, term_end = self.periods[start + offset]
+            previous = status
+            last = offset == length - 1
+            if graduated and last:
+                status = 'alumni'
+            elif status == 'active' and rnd.random() < 0.05:
+                status = 'inactive'
+            elif status == 'inactive' and rnd.random() < 0.3:
+                status = 'active'
+            elif status == 'active' and rnd.random() < 0.003:
+                status = 'expelled'
+
+            if status == 'active':
+                fee = ACTIVE_MEMBER_FEE
+            elif status == 'inactive' and previous != 'inactive':
+                fee = INACTIVE_MEMBER_FEE
+            else:
+                fee = 0.0
+            role = rnd.choice(OFFICER_ROLES) if status == 'active' and rnd.random() < 0.03 else 'Member'
+            yield from self._term(membership_id, semester, acad_year, term_start, term_end, status, role, fee)
+            if status == 'expelled':
+                return
+
+    def _term(self, membership_id, semester, acad_year, term_start, term_end, status, role, fee):
+        rnd = self.random
+        term_id = self._next_id('term')
+        fee_due = term_start + timedelta(days=30)
+        payments = []
+        if fee > 0:
+            outcome = rnd.random()
+            if outcome < 0.70:
+                # Paid in full, sometimes in two installments
+                if rnd.random() < 0.25:
+                    first = round(fee * rnd.choice([0.3, 0.4, 0.5]), 2)
+                    payments = [first, round(fee - first, 2)]
+                else:
+                    payments = [fee]
+            elif outcome < 0.85:
+                payments = [round(fee * rnd.choice([0.2, 0.25, 0.5, 0.75]), 2)]
+
+        paid = 0.0
+        payment_rows = []
+        for amount in payments:
+            # About one payment in five comes in after the due date
+            if rnd.random() < 0.2:
+                paid_on = fee_due + timedelta(days=rnd.randint(1, 90))
+            else:
+                paid_on = term_start + timedelta(days=rnd.randint(0, 29))
+            payment_rows.append((self._next_id('payment'), amount, paid_on, term_id))
+            paid += amount
+
+        balance = round(fee - paid, 2)
+        payment_status = 'paid' if balance <= 0 else ('partial' if paid > 0 else 'unpaid')
+        yield 'term', (term_id, semester, payment_status, status, role, term_start, term_end,
+                       acad_year, fee, fee_due, balance, membership_id)
+        for row in payment_rows:
+            yield 'payment', row
+
+
+class ExecuteManySink:
+    # --- Buffers rows per table and sends each full buffer with one executemany ---
+
+    def __init__(self, connection, chunk_size: int):
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self.buffers = {table: [] for table in TABLES}
+        self.counts = {table: 0 for table in TABLES}
+
+    def add(self, table: str, row: tuple):
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.chunk_size:
+            self._flush(table)
+
+    def _flush(self, table: str):
+        rows = self.buffers[table]
+        if not rows:
+            return
+        columns = TABLES[table]
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", rows
+            )
+        finally:
+            cursor.close()
+        self.counts[table] += len(rows)
+        self.buffers[table] = []
+
+    def finish(self):
+        for table in TABLES:
+            self._flush(table)
+
+
+class LoadDataSink:
+    # --- Writes one tab-separated file per table, then loads each with LOAD DATA LOCAL INFILE ---
+
+    def __init__(self, connection, directory: str):
+        self.connection = connection
+        self.directory = directory
+        self.files = {table: open(self._path(table), 'w', encoding='utf-8', newline='\n') for table in TABLES}
+        self.counts = {table: 0 for table in TABLES}
+
+    def _path(self, table: str) -> str:
+        return os.path.join(self.directory, f"{table}.tsv")
+
+    @staticmethod
+    def _field(value) -> str:
+        if value is None:
+            return r'\N'
+        return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+    def add(self, table: str, row: tuple):
+        self.files[table].write('\t'.join(self._field(value) for value in row) + '\n')
+        self.counts[table] += 1
+
+    def finish(self):
+        cursor = self.connection.cursor()
+        try:
+            for table, columns in TABLES.items():
+                self.files[table].close()
+                path = self._path(table).replace('\\', '/')
+                cursor.execute(
+                    f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table} "
+                    f"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+                    f"({', '.join(columns)})"
+                )
+        finally:
+            cursor.close()
+
+
+def next_ids(connection) -> Dict[str, int]:
+    # First free ID of every table with a surrogate key
+    keys = {'organization': 'org_id', 'student': 'student_id', 'member': 'member_id',
+            'membership': 'membership_id', 'term': 'term_id', 'payment': 'payment_id'}
+    cursor = connection.cursor()
+    try:
+        ids = {}
+        for table, key in keys.items():
+            cursor.execute(f"SELECT COALESCE(MAX({key}), 0) + 1 FROM {table}")
+            ids[table] = cursor.fetchone()[0]
+        return ids
+    finally:
+        cursor.close()
+
+
+def default_orgs(students: int) -> int:
+    # One organization per 500 students, at least two
+    return max(2, students // 500)
+
+
+def load(seed: int, students: int, orgs: int, years: int = 4, chunk_size: int = 5000,
+         load_data: bool = False, last_year: int = DEFAULT_LAST_YEAR) -> Optional[Dict[str, int]]:
+    """Generate and load the dataset into DatabaseConfig's database (financial_summary
+    is not rebuilt); row counts per table, or None if the load failed"""
+    connection = mariadb.connect(
+        user=DatabaseConfig.DB_USER, password=DatabaseConfig.DB_PASSWORD, host=DatabaseConfig.DB_HOST,
+        port=DatabaseConfig.DB_PORT, database=DatabaseConfig.DB_NAME, local_infile=load_data
+    )
+    directory = None
+    try:
+        connection.autocommit = False
+        cursor = connection.cursor()
+        # Rows arrive with their keys and in a consistent order; skip per-row checks while loading
+        cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+        cursor.close()
+
+        generator = Generator(seed, students, orgs, years, next_ids(connection), last_year)
+        if load_data:
+            directory = tempfile.mkdtemp(prefix="org_data_")
+            sink = LoadDataSink(connection, directory)
+        else:
+            sink = ExecuteManySink(connection, chunk_size)
+        for table, row in generator.rows():
+            sink.add(table, row)
+        sink.finish()
+        connection.commit()
+
+        cursor = connection.cursor()
+        cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+        cursor.execute(f"ANALYZE TABLE {', '.join(TABLES)}")
+        cursor.fetchall()
+        cursor.close()
+        return sink.counts
+    except mariadb.Error as e:
+        logger.error("Load error: %s", e)
+        connection.rollback()
+        return None
+    finally:
+        connection.close()
+        if directory:
+            for table in TABLES:
+                path = os.path.join(directory, f"{table}.tsv")
+                if os.path.exists(path):
+                    os.remove(path)
+            os.rmdir(directory)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Generate and load a synthetic membership dataset")
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--orgs', type=int, default=None, help="default: one per 500 students, at least two")
+    parser.add_argument('--years', type=int, default=4, help="academic years of terms, ending with --last-year")
+    parser.add_argument('--last-year', type=int, default=DEFAULT_LAST_YEAR,
+                        help=f"first calendar year of the newest academic year (default {DEFAULT_LAST_YEAR})")
+    parser.add_argument('--seed', type=int, default=127)
+    parser.add_argument('--chunk-size', type=int, default=5000, help="rows per executemany call")
+    parser.add_argument('--load-data', action='store_true', help="load through LOAD DATA LOCAL INFILE")
+    add_connection_arguments(parser)
+    args = parser.parse_args(argv)
+    args.orgs = args.orgs or default_orgs(args.students)
+    configure_connection(args)
+
+    start = time.perf_counter()
+    counts = load(args.seed, args.students, args.orgs, args.years, args.chunk_size, args.load_data, args.last_year)
+    if counts is None:
+        print("Load failed; see the log", file=sys.stderr)
+        return 1
+    loaded = time.perf_counter() - start
+
+    db = DatabaseManager()
+    if not db.connect() or not db.rebuild_financial_summary():
+        print("Loaded the rows but could not rebuild financial_summary", file=sys.stderr)
+        return 1
+    db.disconnect()
+    elapsed = time.perf_counter() - start
+
+    total = sum(counts.values())
+    for table, count in counts.items():
+        print(f"{table:15} {count:>12,}")
+    print(f"{'total':15} {total:>12,} rows in {loaded:.1f}s ({total / max(loaded, 1e-9):,.0f} rows/s), "
+          f"{elapsed:.1f}s including the summary rebuild")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,77 @@
+import logging
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import List, Callable
+from typing import List, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class RenderStats:
+    # --- Time each DataTable spends filling rows and re-rendering its viewport ---
+    # Only touched from the Tk thread, so no locking
+    
+    def __init__(self):
+        self._tables = {}
+    
+    def record(self, table: str, kind: str, seconds: float, rows: int):
+        # kind is 'insert' (insert_data) or 'render' (a virtual table re-binding its viewport)
+        stats = self._tables.get(table)
+        if stats is None:
+            stats = self._tables[table] = {
+                kind_name: {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'rows': 0}
+                for kind_name in ('insert', 'render')
+            }
+        entry = stats[kind]
+        entry['count'] += 1
+        entry['seconds'] += seconds
+        entry['max_seconds'] = max(entry['max_seconds'], seconds)
+        entry['rows'] = rows  # Rows in the latest call
+    
+    def snapshot(self) -> List[dict]:
+        rows = []
+        for table, stats in self._tables.items():
+            row = {'table': table}
+            for kind, entry in stats.items():
+                row[f'{kind}s'] = entry['count']
+                row[f'{kind}_mean_seconds'] = entry['seconds'] / entry['count'] if entry['count'] else 0.0
+                row[f'{kind}_max_seconds'] = entry['max_seconds']
+                row[f'{kind}_rows'] = entry['rows']
+            rows.append(row)
+        rows.sort(key=lambda row: row['insert_mean_seconds'] * row['inserts'], reverse=True)
+        return rows
+    
+    def clear(self):
+        self._tables.clear()
+
+# Shared by every DataTable; read by the Diagnostics tab
+render_stats = RenderStats()
 
 class DataTable(ttk.Frame):
     # --- Reusable data table component ---
+    # With virtual=True only the rows inside the viewport (plus overscan) exist as
+    # Treeview items; the full dataset stays in a plain list and rows are re-bound
+    # to the same items as the user scrolls.
+    # With paged=True a Prev/Next bar is shown below the table. The table keeps
+    # the start key of every page visited; on_page(start_key) loads a page and
+    # set_page_info(next_key) records where the following one starts.
+    # Insert and render times are recorded in render_stats under stats_name.
+    
+    DEFAULT_ROW_HEIGHT = 20
+    DEFAULT_HEADING_HEIGHT = 25
     
-    def __init__(self, parent, columns: List[str], **kwargs):
+    def __init__(self, parent, columns: List[str], virtual: bool = False, overscan: int = 10,
+                 paged: bool = False, stats_name: Optional[str] = None, **kwargs):
         super().__init__(parent, **kwargs)
         
+        self.stats_name = stats_name or str(self)
+        self.virtual = virtual
+        self.overscan = overscan
+        
+        # Keyset paging state
+        self.on_page: Optional[Callable[[Optional[tuple]], None]] = None
+        self._page_starts = [None]  # Start key of each page up to the current one
+        self._next_key = None
+        
         # Create treeview with scrollbars
         self.tree_frame = ttk.Frame(self)
         self.tree_frame.pack(fill=tk.BOTH, expand=True)
@@ -16,19 +80,34 @@ class DataTable(ttk.Frame):
         self.tree = ttk.Treeview(self.tree_frame, columns=columns, show='headings')
         
         # Scrollbars
-        v_scrollbar = ttk.Scrollbar(self.tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
         h_scrollbar = ttk.Scrollbar(self.tree_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        if virtual:
+            # The vertical scrollbar tracks the position in the dataset, not in the Treeview
+            self.v_scrollbar = ttk.Scrollbar(self.tree_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+            self.tree.configure(yscrollcommand=self._on_tree_scrolled, xscrollcommand=h_scrollbar.set)
+        else:
+            self.v_scrollbar = ttk.Scrollbar(self.tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+            self.tree.configure(yscrollcommand=self.v_scrollbar.set, xscrollcommand=h_scrollbar.set)
         
         # Grid layout
         self.tree.grid(row=0, column=0, sticky='nsew')
-        v_scrollbar.grid(row=0, column=1, sticky='ns')
+        self.v_scrollbar.grid(row=0, column=1, sticky='ns')
         h_scrollbar.grid(row=1, column=0, sticky='ew')
         
         self.tree_frame.grid_rowconfigure(0, weight=1)
         self.tree_frame.grid_columnconfigure(0, weight=1)
         
+        self.page_label = None
+        if paged:
+            pager = ttk.Frame(self)
+            pager.pack(fill=tk.X)
+            self.next_button = ttk.Button(pager, text="Next ▶", command=self._next_page, state=tk.DISABLED)
+            self.next_button.pack(side=tk.RIGHT, padx=2, pady=2)
+            self.page_label = ttk.Label(pager, text="Page 1")
+            self.page_label.pack(side=tk.RIGHT, padx=5)
+            self.prev_button = ttk.Button(pager, text="◀ Prev", command=self._prev_page, state=tk.DISABLED)
+            self.prev_button.pack(side=tk.RIGHT, padx=2, pady=2)
+        
         # Configure columns
         for col in columns:
             self.tree.heading(col, text=col.replace('_', ' ').title())
@@ -36,45 +115,259 @@ class DataTable(ttk.Frame):
         
         # Store the complete data for each row
         self.row_data = {}
+        
+        # Virtual mode state
+        self._rows = []            # Backing store: the full dataset
+        self._first = 0            # Index of the first row shown in the viewport
+        self._items = []           # Treeview item ids currently materialized
+        self._item_rows = {}       # item id -> index into _rows
+        self._selected_index = None
+        
+        if virtual:
+            self.tree.bind('<Configure>', lambda e: self._render())
+            self.tree.bind('<<TreeviewSelect>>', self._on_select)
+            self.tree.bind('<MouseWheel>', self._on_mousewheel)
+            self.tree.bind('<Button-4>', lambda e: self._scroll_rows(-3))
+            self.tree.bind('<Button-5>', lambda e: self._scroll_rows(3))
+            self.tree.bind('<Up>', lambda e: self._move_selection(-1))
+            self.tree.bind('<Down>', lambda e: self._move_selection(1))
+            self.tree.bind('<Prior>', lambda e: self._move_selection(-self._visible_rows()))
+            self.tree.bind('<Next>', lambda e: self._move_selection(self._visible_rows()))
     
     def clear(self):
         # --- Clear all items from the table ---
-        print("Clearing table items")  # Debug print
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
         self.row_data.clear()
+        self._rows = []
+        self._first = 0
+        self._items = []
+        self._item_rows = {}
+        self._selected_index = None
+        if self.virtual:
+            self.v_scrollbar.set(0.0, 1.0)
         self.update_idletasks()
     
     def insert_data(self, data: List[dict]):
         # --- Insert data into the table ---
-        print(f"Inserting data into table: {data}")  # Debug print
+        start = time.perf_counter()
+        self._insert_rows(data)
+        render_stats.record(self.stats_name, 'insert', time.perf_counter() - start, len(data or ()))
+    
+    def _insert_rows(self, data: List[dict]):
         self.clear()
         
         if not data:
-            print("No data to insert")  # Debug print
+            logger.debug("No data to insert")
+            return
+        logger.debug("Inserting %d rows into table", len(data))
+        
+        if self.virtual:
+            self._rows = list(data)
+            self._render()
             return
             
+        columns = self.tree['columns']
         for row_data in data:
-            values = []
-            for col in self.tree['columns']:
-                value = str(row_data.get(col, ''))
-                values.append(value)
-            print(f"Inserting row with values: {values}")  # Debug print
+            values = [str(row_data.get(col, '')) for col in columns]
             item_id = self.tree.insert('', tk.END, values=values)
             # Store the complete data dictionary for this row
             self.row_data[item_id] = row_data
         
         self.update_idletasks()
-        print("Data insertion complete")  # Debug print
     
     def get_selected_item(self) -> dict:
         # --- Get the currently selected item as a dictionary ---
+        if self.virtual:
+            if self._selected_index is not None and self._selected_index < len(self._rows):
+                return self._rows[self._selected_index]
+            return {}
+        
         selection = self.tree.selection()
         if selection:
             item_id = selection[0]
             # Return the complete data dictionary for the selected row
             return self.row_data.get(item_id, {})
         return {}
+    
+    # --- Keyset paging ---
+    @property
+    def page_start(self) -> Optional[tuple]:
+        """Start key of the current page (None for the first page)"""
+        return self._page_starts[-1]
+    
+    @property
+    def page_number(self) -> int:
+        return len(self._page_starts)
+    
+    def reset_pages(self):
+        """Go back to the first page, e.g. when the query behind the table changes"""
+        self._page_starts = [None]
+        self._next_key = None
+        self._update_pager()
+    
+    def set_page_info(self, next_key: Optional[tuple]):
+        """Record where the page after the one just loaded starts (None if it is the last)"""
+        self._next_key = next_key
+        self._update_pager()
+    
+    def _next_page(self):
+        if self._next_key is None or self.on_page is None:
+            return
+        self._page_starts.append(self._next_key)
+        self._next_key = None
+        self._update_pager()
+        self.on_page(self.page_start)
+    
+    def _prev_page(self):
+        if len(self._page_starts) <= 1 or self.on_page is None:
+            return
+        self._page_starts.pop()
+        self._next_key = None
+        self._update_pager()
+        self.on_page(self.page_start)
+    
+    def _update_pager(self):
+        if self.page_label is None:
+            return
+        self.page_label.config(text=f"Page {self.page_number}")
+        self.prev_button.config(state=tk.NORMAL if self.page_number > 1 else tk.DISABLED)
+        self.next_button.config(state=tk.NORMAL if self._next_key is not None else tk.DISABLED)
+    
+    # --- Virtual scrolling ---
+    def _visible_rows(self) -> int:
+        # Number of rows that fit in the viewport
+        heading_height = self.DEFAULT_HEADING_HEIGHT
+        row_height = self.DEFAULT_ROW_HEIGHT
+        if self._items:
+            bbox = self.tree.bbox(self._items[0])
+            if bbox:
+                heading_height, row_height = bbox[1], bbox[3]
+        height = self.tree.winfo_height()
+        if height <= 1:
+            # Not mapped yet, fall back to the requested height
+            height = int(self.tree.cget('height')) * row_height + heading_height
+        return max(1, (height - heading_height) // max(row_height, 1))
+    
+    def _render(self):
+        # Bind the rows in the viewport (plus overscan) to Treeview items
+        if not self.virtual:
+            return
+        start = time.perf_counter()
+        self._bind_viewport()
+        render_stats.record(self.stats_name, 'render', time.perf_counter() - start, len(self._items))
+    
+    def _bind_viewport(self):
+        total = len(self._rows)
+        visible = self._visible_rows()
+        self._first = max(0, min(self._first, total - visible))
+        count = min(total - self._first, visible + self.overscan)
+        
+        # Grow or shrink the pool of items, reusing the ones we already have
+        if len(self._items) < count:
+            for _ in range(count - len(self._items)):
+                self._items.append(self.tree.insert('', tk.END))
+        elif len(self._items) > count:
+            surplus = self._items[count:]
+            self._items = self._items[:count]
+            self.tree.delete(*surplus)
+        
+        columns = self.tree['columns']
+        self._item_rows = {}
+        selected_item = None
+        for offset, item_id in enumerate(self._items):
+            index = self._first + offset
+            row = self._rows[index]
+            self.tree.item(item_id, values=[str(row.get(col, '')) for col in columns])
+            self._item_rows[item_id] = index
+            if index == self._selected_index:
+                selected_item = item_id
+        
+        if selected_item is not None:
+            self.tree.selection_set(selected_item)
+            self.tree.focus(selected_item)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+        
+        # Keep the Treeview itself at the top; scrolling happens through _first
+        self.tree.yview_moveto(0)
+        if total:
+            self.v_scrollbar.set(self._first / total, min(1.0, (self._first + visible) / total))
+        else:
+            self.v_scrollbar.set(0.0, 1.0)
+    
+    def _scroll_rows(self, delta: int):
+        self._first += delta
+        self._render()
+        return "break"
+    
+    def _move_selection(self, delta: int):
+        # Keyboard navigation over the whole dataset, scrolling the window as needed
+        if not self._rows:
+            return "break"
+        current = self._first if self._selected_index is None else self._selected_index + delta
+        index = max(0, min(current, len(self._rows) - 1))
+        self._selected_index = index
+        
+        visible = self._visible_rows()
+        if index < self._first:
+            self._first = index
+        elif index >= self._first + visible:
+            self._first = index - visible + 1
+        self._render()
+        return "break"
+    
+    def _on_scrollbar(self, action, amount, unit=None):
+        visible = self._visible_rows()
+        if action == 'moveto':
+            self._first = int(float(amount) * len(self._rows))
+        elif action == 'scroll':
+            step = visible if unit == 'pages' else 1
+            self._first += int(amount) * step
+        self._render()
+    
+    def _on_mousewheel(self, event):
+        return self._scroll_rows(-3 if event.delta > 0 else 3)
+    
+    def _on_tree_scrolled(self, first, last):
+        # The Treeview scrolled on its own (e.g. keyboard navigation past the
+        # last materialized row); shift the window instead
+        if float(first) > 0 and self._items:
+            shift = round(float(first) * len(self._items))
+            self._first += max(shift, 1)
+            self.after_idle(self._render)
+    
+    def _on_select(self, event=None):
+        selection = self.tree.selection()
+        if selection:
+            self._selected_index = self._item_rows.get(selection[0])
+        elif self._selected_index is not None and self._selected_index in self._item_rows.values():
+            # Deselected while visible (a row that scrolled out keeps its selection)
+            self._selected_index = None
+
+class Debouncer:
+    # --- Delays a callback until input has been quiet for delay_ms ---
+    # Each call() restarts the timer, so a burst of keystrokes runs the callback once.
+    
+    def __init__(self, widget, delay_ms: int, callback: Callable):
+        self.widget = widget
+        self.delay_ms = delay_ms
+        self.callback = callback
+        self._after_id = None
+    
+    def __call__(self, *args):
+        self.cancel()
+        self._after_id = self.widget.after(self.delay_ms, self._fire)
+    
+    def cancel(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def _fire(self):
+        self._after_id = None
+        self.callback()
 
 class FormDialog(tk.Toplevel):
     # --- Base class for form dialogs ---
@@ -0,0 +1,185 @@
+"""Import students and memberships from a registrar export (CSV or .xlsx).
+
+Examples:
+    python importer.py students.csv --user root --org "Computer Society"
+    python importer.py registrar.xlsx --user root --batch 2024-2025
+
+Expected columns (header names are case-insensitive; spaces become underscores):
+    first_name, last_name, gender, degree_program, standing   required
+    student_id                                                optional
+    organization, batch, committee                            optional, or set with --org/--batch/--committee
+
+The file is read row by row and validated; valid rows are staged in a temporary
+table and merged with set-based SQL in a single transaction (see
+DatabaseManager.merge_import). Rows that fail validation are reported and skipped.
+Reading .xlsx files needs the openpyxl package.
+"""
+import argparse
+import csv
+import logging
+import sys
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cli_common import (MAX_REPORTED_ERRORS, add_connection_arguments, configure_connection,
+                        configure_logging, read_rows)
+from database import DatabaseManager, ImportResult
+from models import Membership, Student
+
+logger = logging.getLogger(__name__)
+
+GENDERS = ('Male', 'Female', 'Other')
+STANDINGS = ('Freshman', 'Sophomore', 'Junior', 'Senior', 'Graduate')
+
+# Column -> maximum length, from the table definitions in setup_database.py
+MAX_LENGTHS = {
+    'first_name': 255, 'last_name': 255, 'gender': 20, 'degree_program': 255,
+    'standing': 20, 'batch': 20, 'committee': 50,
+}
+REQUIRED_COLUMNS = ('first_name', 'last_name', 'gender', 'degree_program', 'standing')
+
+def validate_row(row: Dict[str, str], org_ids: Dict[str, int],
+                 defaults: Dict[str, str]) -> Tuple[Student, Membership]:
+    """Build the Student and Membership for one row, or raise ValueError saying what is wrong"""
+    values = {key: (row.get(key) or '').strip() for key in row}
+    for key, default in defaults.items():
+        if not values.get(key) and default:
+            values[key] = default
+
+    missing = [column for column in REQUIRED_COLUMNS if not values.get(column)]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    for column, limit in MAX_LENGTHS.items():
+        if len(values.get(column, '')) > limit:
+            raise ValueError(f"{column} is longer than {limit} characters")
+    if values['gender'] not in GENDERS:
+        raise ValueError(f"gender must be one of {', '.join(GENDERS)}")
+    if values['standing'] not in STANDINGS:
+        raise ValueError(f"standing must be one of {', '.join(STANDINGS)}")
+
+    student_id = None
+    if values.get('student_id'):
+        try:
+            student_id = int(values['student_id'])
+        except ValueError:
+            raise ValueError(f"student_id {values['student_id']!r} is not a number")
+        if student_id <= 0:
+            raise ValueError("student_id must be positive")
+
+    org_name = values.get('organization')
+    if not org_name:
+        raise ValueError("missing organization")
+    org_id = org_ids.get(org_name)
+    if org_id is None:
+        raise ValueError(f"unknown organization {org_name!r}")
+
+    student = Student(
+        student_id=student_id,
+        first_name=values['first_name'],
+        last_name=values['last_name'],
+        gender=values['gender'],
+        degree_program=values['degree_program'],
+        standing=values['standing']
+    )
+    membership = Membership(
+        membership_id=None,
+        batch=values.get('batch') or None,
+        committee=values.get('committee') or None,
+        org_id=org_id,
+        student_id=student_id
+    )
+    return student, membership
+
+
+class ImportRun:
+    # --- Streams a file through validation into DatabaseManager.merge_import ---
+
+    def __init__(self, db: DatabaseManager, path: str, defaults: Dict[str, str]):
+        self.db = db
+        self.path = path
+        self.defaults = defaults
+        self.rows_read = 0
+        self.invalid: List[Tuple[int, str]] = []
+        self.invalid_count = 0
+        self.seconds = 0.0
+        self.result: Optional[ImportResult] = None
+
+    def valid_rows(self) -> Iterator[Tuple[int, Student, Membership]]:
+        org_ids = {org.org_name: org.org_id for org in self.db.get_all_organizations()}
+        for line, row in read_rows(self.path):
+            self.rows_read += 1
+            try:
+                student, membership = validate_row(row, org_ids, self.defaults)
+            except ValueError as e:
+                self.invalid_count += 1
+                if len(self.invalid) < MAX_REPORTED_ERRORS:
+                    self.invalid.append((line, str(e)))
+                continue
+            yield line, student, membership
+
+    def run(self) -> bool:
+        start = time.perf_counter()
+        self.result = self.db.merge_import(self.valid_rows())
+        self.seconds = time.perf_counter() - start
+        return self.result.ok
+
+    def report(self) -> str:
+        result = self.result
+        rate = self.rows_read / self.seconds if self.seconds > 0 else 0.0
+        lines = [
+            f"Read {self.rows_read} rows in {self.seconds:.2f}s ({rate:.0f} rows/s)",
+            f"  invalid:     {self.invalid_count}",
+            f"  staged:      {result.inserted}",
+            f"  rejected:    {len(result.failed)}",
+        ]
+        if result.ok:
+            lines += [
+                f"  students:    {result.students_added} added, {result.students_updated} updated by ID, "
+                f"{result.students_matched} rows matched by name",
+                f"  members:     {result.members_added} added",
+                f"  memberships: {result.memberships_added} added, {result.memberships_updated} updated",
+            ]
+        else:
+            lines.append(f"Import rolled back: {result.error}")
+
+        for line, error in self.invalid:
+            lines.append(f"line {line}: {error}")
+        if self.invalid_count > len(self.invalid):
+            lines.append(f"... and {self.invalid_count - len(self.invalid)} more invalid rows")
+        for _, (line, *_), error in result.failed:
+            lines.append(f"line {line}: rejected by the database: {error}")
+        return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Import students and memberships from a CSV or .xlsx file")
+    parser.add_argument('path')
+    parser.add_argument('--org', help="organization for rows without an organization column")
+    parser.add_argument('--batch', help="batch for rows without one")
+    parser.add_argument('--committee', help="committee for rows without one")
+    add_connection_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_connection(args)
+
+    db = DatabaseManager()
+    if not db.connect():
+        print("Could not connect to the database", file=sys.stderr)
+        return 1
+    try:
+        run = ImportRun(db, args.path, {
+            'organization': args.org, 'batch': args.batch, 'committee': args.committee
+        })
+        try:
+            ok = run.run()
+        except (OSError, RuntimeError, csv.Error) as e:
+            print(f"Could not read {args.path}: {e}", file=sys.stderr)
+            return 1
+        print(run.report())
+        return 0 if ok else 1
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
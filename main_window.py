@@ -1,12 +1,23 @@
+import logging
 import tkinter as tk
-from tkinter import ttk, messagebox
-from gui_components import DataTable, FormDialog
+from tkinter import ttk, messagebox, filedialog
+from gui_components import DataTable, FormDialog, Debouncer, render_stats
 from database import DatabaseManager
+from async_db import AsyncDatabase
+from search_index import SearchIndex
+from payment_poster import PaymentPosting
 from datetime import datetime, timedelta
 
 from models import Membership, Payment, Student, Term, Organization
 
+logger = logging.getLogger(__name__)
+
 class MainWindow(tk.Frame):
+    # Wait this long after the last keystroke before filtering a table
+    SEARCH_DEBOUNCE_MS = 200
+    # How often the Diagnostics tab refreshes while it is the selected tab
+    DIAGNOSTICS_REFRESH_MS = 2000
+
     def __init__(self, root):
         super().__init__(root)
         self.root = root
@@ -14,10 +25,14 @@ class MainWindow(tk.Frame):
         self.root.geometry("400x250")  
         
         self.db = None  # DBManager will be created only after config
+        self.async_db = None  # Runs DB reads off the Tk thread once connected
         
-        # Status bar
-        self.status_bar = ttk.Label(self, text="Please enter DB credentials", relief=tk.SUNKEN, anchor=tk.W)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        # Status bar with a loading indicator shown while background queries run
+        status_frame = ttk.Frame(self)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_bar = ttk.Label(status_frame, text="Please enter DB credentials", relief=tk.SUNKEN, anchor=tk.W)
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.loading_bar = ttk.Progressbar(status_frame, mode='indeterminate', length=120)
         
         # Notebook with tabs
         self.notebook = ttk.Notebook(self)
@@ -93,6 +108,9 @@ class MainWindow(tk.Frame):
             self.db = None
             return
         
+        self.async_db = AsyncDatabase(self.root)
+        self.async_db.on_busy_changed = self.set_loading
+        
         self.status_bar.config(text="Connected to database successfully!")
         self.root.geometry("1200x800")
         
@@ -100,12 +118,47 @@ class MainWindow(tk.Frame):
         self.notebook.forget(self.config_frame)
         self.create_other_tabs()
     
+    def tracked(self, name: str, fn):
+        """Wrap a button or menu command so the SQL it runs is counted against name
+        (see DatabaseManager.get_action_stats)"""
+        def command(*args):
+            with self.db.query_stats.action(name):
+                return fn(*args)
+        return command
+    
+    def set_loading(self, busy: bool):
+        """Show or hide the loading indicator"""
+        if busy:
+            self.loading_bar.pack(side=tk.RIGHT, padx=5)
+            self.loading_bar.start(10)
+        else:
+            self.loading_bar.stop()
+            self.loading_bar.pack_forget()
+    
+    def run_in_background(self, key: str, fn, *args, on_success, what: str):
+        """Run a DatabaseManager call on a worker thread and hand the result to on_success.
+        A newer call with the same key (usually the table being filled) supersedes older ones.
+        The worker's SQL is counted against `what` in the action statistics."""
+        # The worker runs in a copy of this context, so it inherits the action
+        with self.db.query_stats.action(what):
+            self.async_db.submit(
+                key, fn, *args,
+                on_success=on_success,
+                on_error=lambda e: self.show_load_error(what, e)
+            )
+    
+    def show_load_error(self, what: str, error: Exception):
+        logger.error("Error loading %s: %s", what, error)
+        messagebox.showerror("Error", f"Failed to load {what}: {str(error)}")
+        self.status_bar.config(text=f"Error loading {what}")
+    
     def create_other_tabs(self):
         self.create_student_management_tab()
         self.create_organization_tab()
         self.create_membership_tab()
         self.create_financial_tab()
         self.create_reports_tab()
+        self.create_diagnostics_tab()
         self.create_menu()
 
     
@@ -118,6 +171,14 @@ class MainWindow(tk.Frame):
         menubar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Exit", command=self.root.destroy)
         
+        # Tools menu
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
+        tools_menu.add_command(label="Reconcile Balances", command=self.tracked("Reconcile Balances", self.reconcile_balances))
+        tools_menu.add_command(label="Rebuild Financial Summary", command=self.tracked("Rebuild Financial Summary", self.rebuild_financial_summary))
+        tools_menu.add_command(label="Start New Semester...", command=self.tracked("Start New Semester", self.rollover_semester))
+        tools_menu.add_command(label="Post Payments From File...", command=self.tracked("Post Payments From File", self.post_payments_from_file))
+        
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
@@ -154,7 +215,7 @@ class MainWindow(tk.Frame):
         search_frame_members.pack(fill=tk.X, pady=5)
         ttk.Label(search_frame_members, text="Search:").pack(side=tk.LEFT)
         self.member_search_var = tk.StringVar()
-        self.member_search_var.trace('w', self.filter_member_data)  # Bind to search box changes
+        self.member_search_var.trace('w', Debouncer(self, self.SEARCH_DEBOUNCE_MS, self.filter_member_data))  # Bind to search box changes
         member_search_entry = ttk.Entry(search_frame_members, textvariable=self.member_search_var)
         member_search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
@@ -197,16 +258,18 @@ class MainWindow(tk.Frame):
         
         # Member list with all attributes
         columns = ['Student ID', 'First Name', 'Last Name', 'Gender', 'Degree Program', 'Standing', 'Status', 'Batch', 'Committee', 'Membership ID']
-        self.member_table = DataTable(left_panel, columns, height=12)
+        self.member_table = DataTable(left_panel, columns, virtual=True, paged=True, stats_name="Members", height=12)
+        self.member_table.on_page = lambda after: self.load_members(after=after)
         self.member_table.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.member_pages_for = None  # (organization, search, filters) the member pages belong to
         
         # Right panel for actions
         right_panel = ttk.Frame(all_members_frame, width=200)
         right_panel.grid(row=0, column=1, sticky='ns', padx=5, pady=5)
         right_panel.pack_propagate(False)
-        ttk.Button(right_panel, text="Add Member", command=self.add_member).pack(fill=tk.X, pady=2)
-        ttk.Button(right_panel, text="Edit Member", command=self.edit_member).pack(fill=tk.X, pady=2)
-        ttk.Button(right_panel, text="Remove Member", command=self.remove_member).pack(fill=tk.X, pady=2)
+        ttk.Button(right_panel, text="Add Member", command=self.tracked("Add Member", self.add_member)).pack(fill=tk.X, pady=2)
+        ttk.Button(right_panel, text="Edit Member", command=self.tracked("Edit Member", self.edit_member)).pack(fill=tk.X, pady=2)
+        ttk.Button(right_panel, text="Remove Member", command=self.tracked("Remove Member", self.remove_member)).pack(fill=tk.X, pady=2)
         
         # --- Membership Terms Subtab ---
         terms_frame = ttk.Frame(membership_notebook)
@@ -223,7 +286,7 @@ class MainWindow(tk.Frame):
         search_frame.pack(fill=tk.X, pady=5)
         ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
         self.search_var = tk.StringVar()
-        self.search_var.trace('w', self.filter_term_data)  # Bind to search box changes
+        self.search_var.trace('w', Debouncer(self, self.SEARCH_DEBOUNCE_MS, self.filter_term_data))  # Bind to search box changes
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
         search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
@@ -245,23 +308,23 @@ class MainWindow(tk.Frame):
             'Semester', 'Academic Year', 'Role',
             'Term Start', 'Term End', 'Due Date'
         ]
-        self.term_table = DataTable(left_panel_terms, columns_terms)
+        self.term_table = DataTable(left_panel_terms, columns_terms, virtual=True, stats_name="Terms")
         self.term_table.pack(fill=tk.BOTH, expand=True)
         
         # Right panel for term actions
         right_panel_terms = ttk.Frame(terms_frame, width=200)
         right_panel_terms.grid(row=0, column=1, sticky='ns', padx=5, pady=5)
         right_panel_terms.pack_propagate(False)
-        ttk.Button(right_panel_terms, text="Add Member to Term", command=self.add_member_to_term).pack(fill=tk.X, pady=2)
-        ttk.Button(right_panel_terms, text="Edit Member", command=self.edit_term_member).pack(fill=tk.X, pady=2)
-        ttk.Button(right_panel_terms, text="Edit Term Dates", command=self.edit_term_dates).pack(fill=tk.X, pady=2)
+        ttk.Button(right_panel_terms, text="Add Member to Term", command=self.tracked("Add Member to Term", self.add_member_to_term)).pack(fill=tk.X, pady=2)
+        ttk.Button(right_panel_terms, text="Edit Member", command=self.tracked("Edit Term Member", self.edit_term_member)).pack(fill=tk.X, pady=2)
+        ttk.Button(right_panel_terms, text="Edit Term Dates", command=self.tracked("Edit Term Dates", self.edit_term_dates)).pack(fill=tk.X, pady=2)
         
         # Load organizations
         self.load_organizations()
         
         # Store the original data for filtering
         self.original_term_data = []
-        self.original_member_data = []
+        self.term_index = SearchIndex([], self.name_search_text)
     
     def clear_member_filters(self):
         """Clear all member filters"""
@@ -272,69 +335,35 @@ class MainWindow(tk.Frame):
         self.committee_filter_combo.set("")
         self.filter_member_data()
     
-    def populate_member_filters(self):
-        """Populate filter comboboxes with unique values from the current data"""
-        if not self.original_member_data:
-            return
-        
-        # Get unique values for each filter
-        statuses = sorted(set(member['Status'].split(' (')[0] for member in self.original_member_data if member['Status']))
-        genders = sorted(set(member['Gender'] for member in self.original_member_data if member['Gender']))
-        degrees = sorted(set(member['Degree Program'] for member in self.original_member_data if member['Degree Program']))
-        batches = sorted(set(member['Batch'] for member in self.original_member_data if member['Batch']))
-        committees = sorted(set(member['Committee'] for member in self.original_member_data if member['Committee']))
-        
-        # Populate comboboxes
-        self.status_filter_combo['values'] = [''] + statuses
-        self.gender_filter_combo['values'] = [''] + genders
-        self.degree_filter_combo['values'] = [''] + degrees
-        self.batch_filter_combo['values'] = [''] + batches
-        self.committee_filter_combo['values'] = [''] + committees
+    def populate_member_filters(self, values: dict):
+        """Populate filter comboboxes with the values found among all of the organization's members"""
+        self.status_filter_combo['values'] = [''] + values['status']
+        self.gender_filter_combo['values'] = [''] + values['gender']
+        self.degree_filter_combo['values'] = [''] + values['degree']
+        self.batch_filter_combo['values'] = [''] + values['batch']
+        self.committee_filter_combo['values'] = [''] + values['committee']
+    
+    def member_filters(self) -> dict:
+        """Current member filter selections, keyed like DatabaseManager.MEMBER_FILTER_COLUMNS"""
+        return {
+            'status': self.status_filter_combo.get(),
+            'gender': self.gender_filter_combo.get(),
+            'degree': self.degree_filter_combo.get(),
+            'batch': self.batch_filter_combo.get(),
+            'committee': self.committee_filter_combo.get(),
+        }
+    
+    @staticmethod
+    def name_search_text(row: dict) -> str:
+        return row['Name']
+    
+    @staticmethod
+    def org_search_text(row: dict) -> str:
+        return row['Organization Name']
     
     def filter_member_data(self, *args):
-        """Filter the member table based on search text and filter criteria"""
-        search_text = self.member_search_var.get().lower()
-        status_filter = self.status_filter_combo.get()
-        gender_filter = self.gender_filter_combo.get()
-        degree_filter = self.degree_filter_combo.get()
-        batch_filter = self.batch_filter_combo.get()
-        committee_filter = self.committee_filter_combo.get()
-        
-        # Clear the table
-        self.member_table.clear()
-        
-        # Filter and insert matching data
-        if self.original_member_data:
-            filtered_data = []
-            for row in self.original_member_data:
-                # Check search text
-                if search_text and search_text not in f"{row['First Name']} {row['Last Name']}".lower():
-                    continue
-                
-                # Check status filter (extract base status without additional info)
-                if status_filter and not row['Status'].startswith(status_filter):
-                    continue
-                
-                # Check gender filter
-                if gender_filter and row['Gender'] != gender_filter:
-                    continue
-                
-                # Check degree program filter
-                if degree_filter and row['Degree Program'] != degree_filter:
-                    continue
-                
-                # Check batch filter
-                if batch_filter and row['Batch'] != batch_filter:
-                    continue
-                
-                # Check committee filter
-                if committee_filter and row['Committee'] != committee_filter:
-                    continue
-                
-                filtered_data.append(row)
-            
-            self.member_table.insert_data(filtered_data)
-            self.status_bar.config(text=f"Showing {len(filtered_data)} of {len(self.original_member_data)} members")
+        """Reload the member list from its first page with the search text and filter criteria"""
+        self.load_members()
 
     def filter_term_data(self, *args):
         """Filter the term table based on search text"""
@@ -345,103 +374,76 @@ class MainWindow(tk.Frame):
         
         # Filter and insert matching data
         if self.original_term_data:
-            filtered_data = [
-                row for row in self.original_term_data
-                if search_text in row['Name'].lower()
-            ]
-            self.term_table.insert_data(filtered_data)
+            self.term_table.insert_data(self.term_index.search(search_text))
 
     def load_term_data(self):
         """Load data specifically for the terms subtab"""
-        try:
-            org_name = self.org_combo.get()
-            semester = self.term_semester_combo.get()
-            acad_year = self.term_acad_year_combo.get()
-            if not all([org_name, semester, acad_year]):
-                self.status_bar.config(text="Please select organization, semester, and academic year")
-                return
-                
-            orgs = self.db.get_all_organizations()
-            if not orgs:
-                self.status_bar.config(text="No organizations found")
-                return
-            org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-            
-            # Get members for the selected semester with all relevant attributes
-            query = """
-            SELECT s.student_id, s.first_name, s.last_name, 
-                   m.batch, m.committee,
-                   t.mem_status, t.semester, t.acad_year, COALESCE(t.role, 'Member') as role,
-                   t.term_start, t.term_end, t.fee_due,
-                   t.term_id
-            FROM student s
-            JOIN membership m ON s.student_id = m.student_id
-            JOIN organization org ON m.org_id = org.org_id
-            JOIN term t ON m.membership_id = t.membership_id
-            WHERE org.org_id = ? AND t.semester = ? AND t.acad_year = ?
-            GROUP BY s.student_id, t.term_id
-            """
-            results = self.db.execute_query(query, (org_id, semester, acad_year))
-            
-            # Clear existing items
-            self.term_table.clear()
-            
-            # Update table columns
-            columns = [
-                'Student ID', 'Name', 'Batch', 'Committee', 'Status',
-                'Semester', 'Academic Year', 'Role',
-                'Term Start', 'Term End', 'Due Date'
-            ]
-            self.term_table.tree['columns'] = columns
-            for col in columns:
-                self.term_table.tree.heading(col, text=col)
-                self.term_table.tree.column(col, width=100)
+        org_name = self.org_combo.get()
+        semester = self.term_semester_combo.get()
+        acad_year = self.term_acad_year_combo.get()
+        if not all([org_name, semester, acad_year]):
+            self.status_bar.config(text="Please select organization, semester, and academic year")
+            return
             
-            # Insert new data
-            if results:
-                formatted_members = []
-                for row in results:
-                    formatted_member = {
-                        'Student ID': row[0],
-                        'Name': f"{row[1]} {row[2]}",
-                        'Batch': row[3],
-                        'Committee': row[4],
-                        'Status': row[5],
-                        'Semester': row[6],
-                        'Academic Year': row[7],
-                        'Role': row[8] if row[8] else 'Member',  # Default to 'Member' if role is empty
-                        'Term Start': row[9].strftime('%Y-%m-%d') if row[9] else 'N/A',
-                        'Term End': row[10].strftime('%Y-%m-%d') if row[10] else 'N/A',
-                        'Due Date': row[11].strftime('%Y-%m-%d') if row[11] else 'N/A',
-                        'term_id': row[12]  # Store term_id for reference
-                    }
-                    formatted_members.append(formatted_member)
-                
-                # Store the original data for filtering
-                self.original_term_data = formatted_members
-                
-                # Apply any existing search filter
-                search_text = self.search_var.get().lower()
-                if search_text:
-                    formatted_members = [
-                        row for row in formatted_members
-                        if search_text in row['Name'].lower()
-                    ]
-                
-                self.term_table.insert_data(formatted_members)
-                self.status_bar.config(text=f"Loaded {len(results)} members for {semester} {acad_year}")
-            else:
-                self.status_bar.config(text=f"No members found for {semester} {acad_year}")
-                self.original_term_data = []
+        org_id = self.db.get_organization_id(org_name)
+        if org_id is None:
+            self.status_bar.config(text="No organizations found")
+            return
+        
+        self.status_bar.config(text=f"Loading members for {semester} {acad_year}...")
+        self.run_in_background(
+            'term_table', self.db.get_term_roster, org_id, semester, acad_year,
+            on_success=lambda rows: self.display_term_data(rows, semester, acad_year),
+            what="term data"
+        )
+    
+    def display_term_data(self, rows, semester, acad_year):
+        """Show the term roster fetched by load_term_data"""
+        # Clear existing items
+        self.term_table.clear()
+        
+        # Update table columns
+        columns = [
+            'Student ID', 'Name', 'Batch', 'Committee', 'Status',
+            'Semester', 'Academic Year', 'Role',
+            'Term Start', 'Term End', 'Due Date'
+        ]
+        self.term_table.tree['columns'] = columns
+        for col in columns:
+            self.term_table.tree.heading(col, text=col)
+            self.term_table.tree.column(col, width=100)
+        
+        # Insert new data
+        if rows:
+            formatted_members = []
+            for row in rows:
+                formatted_member = {
+                    'Student ID': row['student_id'],
+                    'Name': f"{row['first_name']} {row['last_name']}",
+                    'Batch': row['batch'],
+                    'Committee': row['committee'],
+                    'Status': row['status'],
+                    'Semester': row['semester'],
+                    'Academic Year': row['acad_year'],
+                    'Role': row['role'] if row['role'] else 'Member',  # Default to 'Member' if role is empty
+                    'Term Start': row['term_start'].strftime('%Y-%m-%d') if row['term_start'] else 'N/A',
+                    'Term End': row['term_end'].strftime('%Y-%m-%d') if row['term_end'] else 'N/A',
+                    'Due Date': row['fee_due'].strftime('%Y-%m-%d') if row['fee_due'] else 'N/A',
+                    'term_id': row['term_id']  # Store term_id for reference
+                }
+                formatted_members.append(formatted_member)
             
-            # Force update of the UI
-            self.term_table.update_idletasks()
-            self.root.update_idletasks()
+            # Store the original data for filtering
+            self.original_term_data = formatted_members
+            self.term_index = SearchIndex(formatted_members, self.name_search_text)
             
-        except Exception as e:
-            print(f"Error loading term data: {e}")  # Debug print
-            messagebox.showerror("Error", f"Failed to load term data: {str(e)}")
-            self.status_bar.config(text="Error loading term data")
+            # Apply any existing search filter
+            self.filter_term_data()
+            self.status_bar.config(text=f"Loaded {len(rows)} members for {semester} {acad_year}")
+        else:
+            self.status_bar.config(text=f"No members found for {semester} {acad_year}")
+            self.original_term_data = []
+            self.term_index = SearchIndex([], self.name_search_text)
     
     def create_financial_tab(self):
         financial_frame = ttk.Frame(self.notebook)
@@ -485,14 +487,16 @@ class MainWindow(tk.Frame):
         search_frame.pack(fill=tk.X, pady=5)
         ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
         self.financial_search_var = tk.StringVar()
-        self.financial_search_var.trace('w', self.filter_financial_data)  # Bind to search box changes
+        self.financial_search_var.trace('w', Debouncer(self, self.SEARCH_DEBOUNCE_MS, self.filter_financial_data))  # Bind to search box changes
         financial_search_entry = ttk.Entry(search_frame, textvariable=self.financial_search_var)
         financial_search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
         # Fee list
         columns = ['Student ID', 'Name', 'Status', 'Fee Amount', 'Amount Paid', 'Balance', 'Due Date']
-        self.fee_table = DataTable(left_panel, columns)
+        self.fee_table = DataTable(left_panel, columns, virtual=True, paged=True, stats_name="Fees")
+        self.fee_table.on_page = lambda after: self.load_financial_data(after=after)
         self.fee_table.pack(fill=tk.BOTH, expand=True)
+        self.fee_pages_for = None  # (organization, semester, academic year, search) of the fee pages
         
         # Right panel for actions
         right_panel = ttk.Frame(financial_frame, width=200)  # Set fixed width
@@ -503,12 +507,9 @@ class MainWindow(tk.Frame):
         button_frame = ttk.Frame(right_panel)
         button_frame.pack(fill=tk.X, pady=5)
         
-        ttk.Button(button_frame, text="Record Payment", command=self.record_payment).pack(fill=tk.X, pady=2)
-        ttk.Button(button_frame, text="View Late Payments", command=self.view_late_payments).pack(fill=tk.X, pady=2)
-        ttk.Button(button_frame, text="View Highest Debt", command=self.view_highest_debt).pack(fill=tk.X, pady=2)
-        
-        # Store original financial data for filtering
-        self.original_financial_data = []
+        ttk.Button(button_frame, text="Record Payment", command=self.tracked("Record Payment", self.record_payment)).pack(fill=tk.X, pady=2)
+        ttk.Button(button_frame, text="View Late Payments", command=self.tracked("View Late Payments", self.view_late_payments)).pack(fill=tk.X, pady=2)
+        ttk.Button(button_frame, text="View Highest Debt", command=self.tracked("View Highest Debt", self.view_highest_debt)).pack(fill=tk.X, pady=2)
         
         # Load initial data
         self.load_organizations_financial()
@@ -543,25 +544,180 @@ class MainWindow(tk.Frame):
         self.report_semester_combo.pack(side=tk.LEFT, padx=5)
         
         # Report buttons - keeping only the necessary ones
-        ttk.Button(left_panel, text="Unpaid Fees by Organization", command=self.show_unpaid_fees).pack(fill=tk.X, pady=2)
-        ttk.Button(left_panel, text="Unpaid Fees by Student", command=self.show_student_unpaid).pack(fill=tk.X, pady=2)
-        ttk.Button(left_panel, text="Executive Committee", command=self.show_executive_committee).pack(fill=tk.X, pady=2)
-        ttk.Button(left_panel, text="Member Roles by AY", command=self.show_member_in_role).pack(fill=tk.X, pady=2)
-        ttk.Button(left_panel, text="Financial Summary", command=self.show_financial_summary).pack(fill=tk.X, pady=2)
-        ttk.Button(left_panel, text="Late Payments", command=self.show_late_payments_report).pack(fill=tk.X, pady=2)
-        ttk.Button(left_panel, text="Highest Debt", command=self.show_highest_debt_report).pack(fill=tk.X, pady=2)
+        ttk.Button(left_panel, text="Unpaid Fees by Organization", command=self.tracked("Unpaid Fees by Organization", self.show_unpaid_fees)).pack(fill=tk.X, pady=2)
+        ttk.Button(left_panel, text="Unpaid Fees by Student", command=self.tracked("Unpaid Fees by Student", self.show_student_unpaid)).pack(fill=tk.X, pady=2)
+        ttk.Button(left_panel, text="Executive Committee", command=self.tracked("Executive Committee", self.show_executive_committee)).pack(fill=tk.X, pady=2)
+        ttk.Button(left_panel, text="Member Roles by AY", command=self.tracked("Member Roles by AY", self.show_member_in_role)).pack(fill=tk.X, pady=2)
+        ttk.Button(left_panel, text="Financial Summary", command=self.tracked("Financial Summary", self.show_financial_summary)).pack(fill=tk.X, pady=2)
+        ttk.Button(left_panel, text="Late Payments", command=self.tracked("Late Payments", self.show_late_payments_report)).pack(fill=tk.X, pady=2)
+        ttk.Button(left_panel, text="Highest Debt", command=self.tracked("Highest Debt", self.show_highest_debt_report)).pack(fill=tk.X, pady=2)
         
         # Right panel for report display
         right_panel = ttk.Frame(reports_frame)
         right_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Report display area
-        self.report_table = DataTable(right_panel, ['No Data'])
+        self.report_table = DataTable(right_panel, ['No Data'], stats_name="Reports")
         self.report_table.pack(fill=tk.BOTH, expand=True)
         
         # Load initial data
         self.load_report_filters()
     
+    def create_diagnostics_tab(self):
+        """Query, pool, cache and render statistics. Everything shown comes from in-process
+        counters, and the tab only refreshes while it is selected."""
+        self.diagnostics_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.diagnostics_frame, text="Diagnostics")
+        self.diagnostics_job = None
+        
+        # Buttons and the pool/cache summary
+        top_panel = ttk.Frame(self.diagnostics_frame)
+        top_panel.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(top_panel, text="Refresh", command=self.refresh_diagnostics).pack(side=tk.LEFT, padx=2)
+        ttk.Button(top_panel, text="Reset Counters", command=self.reset_diagnostics).pack(side=tk.LEFT, padx=2)
+        ttk.Button(top_panel, text="Explain Slowest Query", command=self.explain_slowest_query).pack(side=tk.LEFT, padx=2)
+        self.diagnostics_summary = ttk.Label(self.diagnostics_frame, justify=tk.LEFT, font=('Courier', 9))
+        self.diagnostics_summary.pack(fill=tk.X, padx=5)
+        
+        def stats_table(parent, columns, name, height):
+            table = DataTable(parent, columns, stats_name=name, height=height)
+            for col in columns:
+                table.tree.heading(col, text=col)
+            table.pack(fill=tk.BOTH, expand=True)
+            return table
+        
+        # Top SQL fingerprints by total time
+        queries_frame = ttk.LabelFrame(self.diagnostics_frame, text="SQL by Total Time")
+        queries_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        columns = ['Total ms', 'Calls', 'Mean ms', 'p95 ms', 'Max ms', 'Rows', 'Errors', 'SQL']
+        self.diagnostics_query_table = stats_table(queries_frame, columns, "Diagnostics: SQL", 8)
+        self.diagnostics_query_table.tree.column('SQL', width=600)
+        
+        # Round trips per GUI action, and DataTable timings
+        bottom_panel = ttk.Frame(self.diagnostics_frame)
+        bottom_panel.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        actions_frame = ttk.LabelFrame(bottom_panel, text="Round Trips by Action")
+        actions_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+        self.diagnostics_action_table = stats_table(
+            actions_frame, ['Action', 'Calls', 'Round Trips', 'Per Call', 'SQL ms'], "Diagnostics: actions", 6
+        )
+        self.diagnostics_action_table.tree.column('Action', width=260)
+        render_frame = ttk.LabelFrame(bottom_panel, text="Table Render Times")
+        render_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.diagnostics_render_table = stats_table(
+            render_frame, ['Table', 'Loads', 'Mean ms', 'Max ms', 'Rows', 'Scroll Renders', 'Scroll ms'],
+            "Diagnostics: render times", 6
+        )
+        
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed, add='+')
+    
+    def on_tab_changed(self, event=None):
+        # Refresh the Diagnostics tab periodically while it is shown, and not at all otherwise
+        if self.notebook.select() == str(self.diagnostics_frame):
+            self.refresh_diagnostics()
+        elif self.diagnostics_job is not None:
+            self.after_cancel(self.diagnostics_job)
+            self.diagnostics_job = None
+    
+    def refresh_diagnostics(self):
+        if self.diagnostics_job is not None:
+            self.after_cancel(self.diagnostics_job)
+            self.diagnostics_job = None
+        if self.notebook.select() != str(self.diagnostics_frame):
+            return
+        
+        self.diagnostics_summary.config(text="\n".join(self.diagnostics_summary_lines()))
+        
+        def ms(seconds):
+            return f"{seconds * 1000:.1f}" if seconds is not None else "> 5000"
+        
+        self.diagnostics_query_table.insert_data([
+            {
+                'Total ms': ms(row['total_seconds']), 'Calls': row['calls'], 'Mean ms': ms(row['mean_seconds']),
+                'p95 ms': ms(row['p95_seconds']), 'Max ms': ms(row['max_seconds']), 'Rows': row['rows'],
+                'Errors': row['errors'], 'SQL': row['fingerprint']
+            }
+            for row in self.db.get_query_stats()
+        ])
+        self.diagnostics_action_table.insert_data([
+            {
+                'Action': row['action'], 'Calls': row['invocations'], 'Round Trips': row['round_trips'],
+                'Per Call': f"{row['round_trips_per_call']:.1f}", 'SQL ms': ms(row['seconds'])
+            }
+            for row in self.db.get_action_stats()
+        ])
+        self.diagnostics_render_table.insert_data([
+            {
+                'Table': row['table'], 'Loads': row['inserts'], 'Mean ms': ms(row['insert_mean_seconds']),
+                'Max ms': ms(row['insert_max_seconds']), 'Rows': row['insert_rows'],
+                'Scroll Renders': row['renders'], 'Scroll ms': ms(row['render_mean_seconds'])
+            }
+            for row in render_stats.snapshot()
+        ])
+        self.diagnostics_job = self.after(self.DIAGNOSTICS_REFRESH_MS, self.refresh_diagnostics)
+    
+    def diagnostics_summary_lines(self):
+        lines = []
+        if self.db.pool:
+            pool = self.db.pool.stats()
+            lines.append(
+                f"Pool:             {pool['in_use']} in use, {pool['idle']} idle of {pool['size']} "
+                f"(max {pool['max_size']}); {pool['checkouts']} checkouts, {pool['waits']} waits, "
+                f"{pool['timeouts']} timeouts"
+            )
+        result_cache = self.db.get_result_cache_stats()
+        lines.append(
+            f"Result cache:     {result_cache['hit_rate']:.0%} hits ({result_cache['hits']}/"
+            f"{result_cache['hits'] + result_cache['misses']}), {result_cache['entries']} entries, "
+            f"{result_cache['bytes'] / 1024:.0f} KiB, {result_cache['stale']} invalidated"
+        )
+        statements = self.db.statement_stats.totals()
+        lookups = statements['hits'] + statements['misses']
+        lines.append(
+            f"Statement cache:  {statements['hits'] / lookups if lookups else 0:.0%} hits ({statements['hits']}/"
+            f"{lookups}), {statements['evictions']} evictions"
+        )
+        directory = self.db.org_directory.stats()
+        lines.append(f"Organization list: {directory['hits']} hits, {directory['loads']} loads")
+        lines.append(f"Round trips:      {self.db.query_stats.round_trips} since the last reset")
+        return lines
+    
+    def reset_diagnostics(self):
+        self.db.query_stats.clear()
+        render_stats.clear()
+        self.refresh_diagnostics()
+    
+    def explain_slowest_query(self):
+        slowest = self.db.query_stats.slowest_query()
+        if slowest is None:
+            messagebox.showinfo("Explain", "No query to explain yet")
+            return
+        self.run_in_background(
+            'explain', self.db.explain_query, slowest['sql'], slowest['params'],
+            on_success=lambda plan: self.show_explain(slowest, plan),
+            what="query plan"
+        )
+    
+    def show_explain(self, slowest, plan):
+        if plan is None:
+            messagebox.showerror("Explain", "Could not explain the query; see the log")
+            return
+        window = tk.Toplevel(self)
+        window.title(f"Query Plan ({slowest['seconds'] * 1000:.1f} ms)")
+        window.geometry("900x450")
+        
+        sql_text = tk.Text(window, height=10, wrap=tk.WORD)
+        sql_text.insert(tk.END, slowest['sql'].strip())
+        sql_text.config(state=tk.DISABLED)
+        sql_text.pack(fill=tk.X, padx=5, pady=5)
+        
+        columns = list(plan[0]) if plan else ['No Data']
+        plan_table = DataTable(window, columns, stats_name="Query Plan")
+        for col in columns:
+            plan_table.tree.heading(col, text=col)
+        plan_table.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        plan_table.insert_data([{column: '' if value is None else value for column, value in row.items()} for row in plan])
+    
     def create_student_management_tab(self):
         """Create the student management tab"""
         student_frame = ttk.Frame(self.notebook)
@@ -572,7 +728,7 @@ class MainWindow(tk.Frame):
         search_frame.pack(fill=tk.X, pady=5)
         ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
         self.student_search_var = tk.StringVar()
-        self.student_search_var.trace('w', self.filter_student_data)  # Bind to search box changes
+        self.student_search_var.trace('w', Debouncer(self, self.SEARCH_DEBOUNCE_MS, self.filter_student_data))  # Bind to search box changes
         student_search_entry = ttk.Entry(search_frame, textvariable=self.student_search_var)
         student_search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
@@ -580,18 +736,17 @@ class MainWindow(tk.Frame):
         buttons_frame = ttk.Frame(student_frame)
         buttons_frame.pack(pady=10)
         
-        ttk.Button(buttons_frame, text="Add Student", command=self.add_student).pack(side=tk.LEFT, padx=5)
-        ttk.Button(buttons_frame, text="Edit Student", command=self.edit_student).pack(side=tk.LEFT, padx=5)
-        ttk.Button(buttons_frame, text="Delete Student", command=self.delete_student).pack(side=tk.LEFT, padx=5)
-        ttk.Button(buttons_frame, text="Refresh", command=self.refresh_students).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Add Student", command=self.tracked("Add Student", self.add_student)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Edit Student", command=self.tracked("Edit Student", self.edit_student)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Delete Student", command=self.tracked("Delete Student", self.delete_student)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Refresh", command=self.tracked("Refresh Students", self.refresh_students)).pack(side=tk.LEFT, padx=5)
         
         # Students table
         columns = ['Student ID', 'First Name', 'Last Name', 'Gender', 'Degree Program', 'Standing']
-        self.students_table = DataTable(student_frame, columns)
+        self.students_table = DataTable(student_frame, columns, virtual=True, paged=True, stats_name="Students")
+        self.students_table.on_page = lambda after: self.refresh_students(after=after)
         self.students_table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Store original student data for filtering
-        self.original_student_data = []
+        self.student_pages_for = None  # Search text the student pages belong to
         
         # Load initial data
         self.refresh_students()
@@ -606,7 +761,7 @@ class MainWindow(tk.Frame):
         search_frame.pack(fill=tk.X, pady=5)
         ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT)
         self.org_search_var = tk.StringVar()
-        self.org_search_var.trace('w', self.filter_organization_data)  # Bind to search box changes
+        self.org_search_var.trace('w', Debouncer(self, self.SEARCH_DEBOUNCE_MS, self.filter_organization_data))  # Bind to search box changes
         org_search_entry = ttk.Entry(search_frame, textvariable=self.org_search_var)
         org_search_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
@@ -614,18 +769,19 @@ class MainWindow(tk.Frame):
         buttons_frame = ttk.Frame(org_frame)
         buttons_frame.pack(pady=10)
         
-        ttk.Button(buttons_frame, text="Add Organization", command=self.add_organization).pack(side=tk.LEFT, padx=5)
-        ttk.Button(buttons_frame, text="Edit Organization", command=self.edit_organization).pack(side=tk.LEFT, padx=5)
-        ttk.Button(buttons_frame, text="Delete Organization", command=self.delete_organization).pack(side=tk.LEFT, padx=5)
-        ttk.Button(buttons_frame, text="Refresh", command=self.refresh_organizations).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Add Organization", command=self.tracked("Add Organization", self.add_organization)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Edit Organization", command=self.tracked("Edit Organization", self.edit_organization)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Delete Organization", command=self.tracked("Delete Organization", self.delete_organization)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Refresh", command=self.tracked("Refresh Organizations", self.refresh_organizations)).pack(side=tk.LEFT, padx=5)
         
         # Organizations table
         columns = ['Organization ID', 'Organization Name']
-        self.organizations_table = DataTable(org_frame, columns)
+        self.organizations_table = DataTable(org_frame, columns, stats_name="Organizations")
         self.organizations_table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Store original organization data for filtering
         self.original_org_data = []
+        self.org_index = SearchIndex([], self.org_search_text)
         
         # Load initial data
         self.refresh_organizations()
@@ -660,8 +816,7 @@ class MainWindow(tk.Frame):
             term_end = term_start + timedelta(days=150)  # Automatically set end date to 150 days after start
             
             # Get organization ID
-            orgs = self.db.get_all_organizations()
-            org_id = next(org.org_id for org in orgs if org.org_name == org_name)
+            org_id = self.db.get_organization_id(org_name)
             
             # Check if term already exists for this organization
             query = """
@@ -691,11 +846,17 @@ class MainWindow(tk.Frame):
             return
             
         # Get organization ID
-        orgs = self.db.get_all_organizations()
-        org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-        
-        # Get all members for this organization
-        members = self.db.get_members_by_organization(org_id)
+        org_id = self.db.get_organization_id(org_name)
+        
+        # Only IDs and names are needed for the member list
+        self.run_in_background(
+            'term_member_choices', self.db.get_member_choices, org_id,
+            on_success=self.choose_term_member,
+            what="members"
+        )
+    
+    def choose_term_member(self, members):
+        """Ask for the member and term details, then add the term (see add_member_to_term)"""
         if not members:
             messagebox.showwarning("Warning", "No members found in this organization")
             return
@@ -808,158 +969,151 @@ class MainWindow(tk.Frame):
         # Load initial financial data
         self.load_financial_data()
     
-    def load_members(self, event=None):
-        try:
-            org_name = self.org_combo.get()
-            if not org_name:
-                return
-            print(f"Loading members for organization: {org_name}")  # Debug print
-            orgs = self.db.get_all_organizations()
-            if not orgs:
-                messagebox.showwarning("Warning", "No organizations found")
-                return
-            org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-            members = self.db.get_members_by_organization(org_id)
-            print(f"Found members: {members}")  # Debug print
-            # Clear existing items
-            self.member_table.clear()
-            # Update table columns to match the data
-            columns = ['Student ID', 'First Name', 'Last Name', 'Gender', 'Degree Program', 'Standing', 'Status', 'Batch', 'Committee', 'Membership ID']
-            self.member_table.tree['columns'] = columns
-            for col in columns:
-                self.member_table.tree.heading(col, text=col)
-                self.member_table.tree.column(col, width=100)
-            # Hide Membership ID column
-            self.member_table.tree.column('Membership ID', width=0, stretch=False, minwidth=0)
-            self.member_table.tree.heading('Membership ID', text='', anchor='w')
-            # Insert new data
-            if members:
-                formatted_members = []
-                for member in members:
-                    status = member['status']
-                    if member['latest_semester'] and member['latest_acad_year']:
-                        if member['status'] in ['expelled', 'alumni']:
-                            status = f"{status} (Last Term: {member['latest_semester']} {member['latest_acad_year']})"
-                        else:
-                            status = f"{status} (Latest: {member['latest_semester']} {member['latest_acad_year']})"
-                    formatted_member = {
-                        'Student ID': member['student_id'],
-                        'First Name': member['first_name'],
-                        'Last Name': member['last_name'],
-                        'Gender': member['gender'],
-                        'Degree Program': member['degree_program'],
-                        'Standing': member.get('standing', ''),
-                        'Status': status,
-                        'Batch': member['batch'],
-                        'Committee': member.get('committee', ''),
-                        'Membership ID': member.get('membership_id', '')
-                    }
-                    formatted_members.append(formatted_member)
-                print(f"Formatted members for display: {formatted_members}")  # Debug print
-                
-                # Store the original data for filtering
-                self.original_member_data = formatted_members
-                
-                # Populate filter dropdowns
-                self.populate_member_filters()
-                
-                # Apply any existing search filter
-                self.filter_member_data()
-            else:
-                print("No members found to display")  # Debug print
-                self.original_member_data = []
-            self.member_table.update_idletasks()
-            self.root.update_idletasks()
-            self.status_bar.config(text=f"Loaded {len(members) if members else 0} members for {org_name}")
-        except Exception as e:
-            print(f"Error loading members: {e}")  # Debug print
-            messagebox.showerror("Error", f"Failed to load members: {str(e)}")
-            self.status_bar.config(text="Error loading members")
+    def load_members(self, event=None, after=None):
+        """Load one page of members; without `after`, reload the current page"""
+        org_name = self.org_combo.get()
+        if not org_name:
+            return
+        logger.debug("Loading members for organization: %s", org_name)
+        org_id = self.db.get_organization_id(org_name)
+        if org_id is None:
+            messagebox.showwarning("Warning", "No organizations found")
+            return
+        if self.member_pages_for is None or org_name != self.member_pages_for[0]:
+            # Filter choices cover every member of the organization, not just one page
+            self.run_in_background(
+                'member_filters', self.db.get_member_filter_values, org_id,
+                on_success=self.populate_member_filters,
+                what="member filters"
+            )
+        search = self.member_search_var.get().strip()
+        filters = self.member_filters()
+        pages_for = (org_name, search, tuple(sorted(filters.items())))
+        if pages_for != self.member_pages_for:
+            # Another organization, search or filter starts from its first page
+            self.member_pages_for = pages_for
+            self.member_table.reset_pages()
+        if after is None:
+            after = self.member_table.page_start
+        
+        self.status_bar.config(text=f"Loading members for {org_name}...")
+        self.run_in_background(
+            'member_table',
+            lambda: self.db.get_members_page(org_id, after=after, search=search, filters=filters),
+            on_success=lambda page: self.display_members(page, org_name),
+            what="members"
+        )
     
-    def load_financial_data(self):
-        """Load data specifically for the financial tab"""
-        try:
-            org_name = self.fin_org_combo.get()
-            semester = self.semester_combo.get()
-            acad_year = self.acad_year_combo.get()
-            if not all([org_name, semester, acad_year]):
-                messagebox.showwarning("Warning", "Please select organization, semester, and academic year")
-                return
-            orgs = self.db.get_all_organizations()
-            if not orgs:
-                messagebox.showwarning("Warning", "No organizations found")
-                return
-            org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-            
-            # Get members for the selected semester
-            query = """
-            SELECT s.student_id, s.first_name, s.last_name, 
-                   t.payment_status, t.fee_amount, 
-                   COALESCE(SUM(p.amount), 0) as total_paid,
-                   (t.fee_amount - COALESCE(SUM(p.amount), 0)) as balance,
-                   t.fee_due, t.term_id
-            FROM student s
-            JOIN membership m ON s.student_id = m.student_id
-            JOIN organization org ON m.org_id = org.org_id
-            JOIN term t ON m.membership_id = t.membership_id
-            LEFT JOIN payment p ON t.term_id = p.term_id
-            WHERE org.org_id = ? AND t.semester = ? AND t.acad_year = ?
-            GROUP BY s.student_id, t.term_id
-            """
-            results = self.db.execute_query(query, (org_id, semester, acad_year))
-            
-            # Clear existing items
-            self.fee_table.clear()
-            
-            # Update table columns
-            columns = ['Student ID', 'Name', 'Payment Status', 'Fee Amount', 'Amount Paid', 'Balance', 'Due Date']
-            self.fee_table.tree['columns'] = columns
-            for col in columns:
-                self.fee_table.tree.heading(col, text=col)
-                self.fee_table.tree.column(col, width=100)
-            
-            # Insert new data
-            if results:
-                formatted_members = []
-                for row in results:
-                    formatted_member = {
-                        'Student ID': row[0],
-                        'Name': f"{row[1]} {row[2]}",
-                        'Payment Status': row[3],
-                        'Fee Amount': f"₱{row[4]:.2f}",
-                        'Amount Paid': f"₱{row[5]:.2f}",
-                        'Balance': f"₱{row[6]:.2f}",
-                        'Due Date': row[7].strftime('%Y-%m-%d') if row[7] else 'N/A',
-                        'term_id': row[8]  # Store term_id for reference
-                    }
-                    formatted_members.append(formatted_member)
-                
-                # Store original data for filtering
-                self.original_financial_data = formatted_members
-                
-                # Apply any existing search filter
-                search_text = self.financial_search_var.get().lower()
-                if search_text:
-                    formatted_members = [
-                        row for row in formatted_members
-                        if search_text in row['Name'].lower()
-                    ]
-                
-                self.fee_table.insert_data(formatted_members)
-            else:
-                self.original_financial_data = []
-            
-            # Force update of the UI
-            self.fee_table.update_idletasks()
-            self.root.update_idletasks()
-            
-            # Update status bar
-            self.status_bar.config(text=f"Loaded {len(results) if results else 0} members for {semester} {acad_year}")
-            
-        except Exception as e:
-            print(f"Error loading financial data: {e}")  # Debug print
-            messagebox.showerror("Error", f"Failed to load financial data: {str(e)}")
-            self.status_bar.config(text="Error loading financial data")
+    def display_members(self, page, org_name):
+        """Show the page of members fetched by load_members"""
+        members = page.rows
+        self.member_table.set_page_info(page.next_key)
+        logger.debug("Found %d members", len(members))
+        # Clear existing items
+        self.member_table.clear()
+        # Update table columns to match the data
+        columns = ['Student ID', 'First Name', 'Last Name', 'Gender', 'Degree Program', 'Standing', 'Status', 'Batch', 'Committee', 'Membership ID']
+        self.member_table.tree['columns'] = columns
+        for col in columns:
+            self.member_table.tree.heading(col, text=col)
+            self.member_table.tree.column(col, width=100)
+        # Hide Membership ID column
+        self.member_table.tree.column('Membership ID', width=0, stretch=False, minwidth=0)
+        self.member_table.tree.heading('Membership ID', text='', anchor='w')
+        # Insert new data
+        if members:
+            formatted_members = []
+            for member in members:
+                status = member['status']
+                if member['latest_semester'] and member['latest_acad_year']:
+                    if member['status'] in ['expelled', 'alumni']:
+                        status = f"{status} (Last Term: {member['latest_semester']} {member['latest_acad_year']})"
+                    else:
+                        status = f"{status} (Latest: {member['latest_semester']} {member['latest_acad_year']})"
+                formatted_member = {
+                    'Student ID': member['student_id'],
+                    'First Name': member['first_name'],
+                    'Last Name': member['last_name'],
+                    'Gender': member['gender'],
+                    'Degree Program': member['degree_program'],
+                    'Standing': member.get('standing', ''),
+                    'Status': status,
+                    'Batch': member['batch'],
+                    'Committee': member.get('committee', ''),
+                    'Membership ID': member.get('membership_id', '')
+                }
+                formatted_members.append(formatted_member)
+            logger.debug("Formatted %d members for display", len(formatted_members))
+            self.member_table.insert_data(formatted_members)
+        else:
+            logger.debug("No members found to display")
+        self.status_bar.config(
+            text=f"Loaded {len(members)} members for {org_name} (page {self.member_table.page_number})"
+        )
+    
+    def load_financial_data(self, after=None):
+        """Load one page of the fee list; without `after`, reload the current page"""
+        org_name = self.fin_org_combo.get()
+        semester = self.semester_combo.get()
+        acad_year = self.acad_year_combo.get()
+        if not all([org_name, semester, acad_year]):
+            messagebox.showwarning("Warning", "Please select organization, semester, and academic year")
+            return
+        org_id = self.db.get_organization_id(org_name)
+        if org_id is None:
+            messagebox.showwarning("Warning", "No organizations found")
+            return
+        
+        search = self.financial_search_var.get().strip()
+        if (org_name, semester, acad_year, search) != self.fee_pages_for:
+            self.fee_pages_for = (org_name, semester, acad_year, search)
+            self.fee_table.reset_pages()
+        if after is None:
+            after = self.fee_table.page_start
+        
+        self.status_bar.config(text=f"Loading fees for {semester} {acad_year}...")
+        self.run_in_background(
+            'fee_table',
+            lambda: self.db.get_fee_list_page(org_id, semester, acad_year, after, search=search),
+            on_success=lambda page: self.display_financial_data(page, semester, acad_year),
+            what="financial data"
+        )
+    
+    def display_financial_data(self, page, semester, acad_year):
+        """Show the page of fees fetched by load_financial_data"""
+        results = page.rows
+        self.fee_table.set_page_info(page.next_key)
+        # Clear existing items
+        self.fee_table.clear()
+        
+        # Update table columns
+        columns = ['Student ID', 'Name', 'Payment Status', 'Fee Amount', 'Amount Paid', 'Balance', 'Due Date']
+        self.fee_table.tree['columns'] = columns
+        for col in columns:
+            self.fee_table.tree.heading(col, text=col)
+            self.fee_table.tree.column(col, width=100)
+        
+        # Insert new data
+        if results:
+            formatted_members = []
+            for row in results:
+                formatted_member = {
+                    'Student ID': row['student_id'],
+                    'Name': f"{row['first_name']} {row['last_name']}",
+                    'Payment Status': row['payment_status'],
+                    'Fee Amount': f"₱{row['fee_amount']:.2f}",
+                    'Amount Paid': f"₱{row['total_paid']:.2f}",
+                    'Balance': f"₱{row['balance']:.2f}",
+                    'Due Date': row['fee_due'].strftime('%Y-%m-%d') if row['fee_due'] else 'N/A',
+                    'term_id': row['term_id']  # Store term_id for reference
+                }
+                formatted_members.append(formatted_member)
+            self.fee_table.insert_data(formatted_members)
+        
+        # Update status bar
+        self.status_bar.config(
+            text=f"Loaded {len(results)} members for {semester} {acad_year} (page {self.fee_table.page_number})"
+        )
     
     def add_member(self):
         # Get all students
@@ -997,8 +1151,9 @@ class MainWindow(tk.Frame):
                 
                 # Get organization ID
                 org_name = self.org_combo.get()
-                orgs = self.db.get_all_organizations()
-                org_id = next(org.org_id for org in orgs if org.org_name == org_name)
+                org_id = self.db.get_organization_id(org_name)
+                if org_id is None:
+                    raise Exception(f"Organization '{org_name}' not found")
                 
                 # Check if student is already a member
                 query = """
@@ -1071,8 +1226,7 @@ class MainWindow(tk.Frame):
         
         # Get the organization ID
         org_name = self.org_combo.get()
-        orgs = self.db.get_all_organizations()
-        org_id = next(org.org_id for org in orgs if org.org_name == org_name)
+        org_id = self.db.get_organization_id(org_name)
         
         # Get current committee
         query = """
@@ -1190,8 +1344,7 @@ class MainWindow(tk.Frame):
             messagebox.showerror("Error", "Could not determine current balance")
             return
         
-        # Debug print to check selected item
-        print(f"Selected item: {selected}")
+        logger.debug("Recording payment for %s", selected)
         
         fields = [
             {'name': 'amount', 'label': 'Amount', 'type': 'entry', 'default': str(balance)},
@@ -1212,8 +1365,6 @@ class MainWindow(tk.Frame):
                     messagebox.showerror("Error", "Payment amount cannot exceed the current balance")
                     return
                 
-                # Debug print to check term_id
-                print(f"Term ID from selected item: {selected.get('term_id')}")
                 term_id = selected['term_id']
                 
                 # Create payment record
@@ -1224,48 +1375,33 @@ class MainWindow(tk.Frame):
                     term_id=term_id
                 )
                 
-                # Add payment
+                # Add payment; the term's balance and status are updated with it
                 if not self.db.add_payment(payment):
                     raise Exception("Failed to record payment")
                 
-                # Update payment status in term table
-                # First check if this payment completes the balance
                 query = """
-                SELECT t.fee_amount, COALESCE(SUM(p.amount), 0) as total_paid,
-                       t.semester, t.acad_year, t.fee_due, t.payment_status
-                FROM term t
-                LEFT JOIN payment p ON t.term_id = p.term_id
-                WHERE t.term_id = ?
-                GROUP BY t.term_id
+                SELECT fee_amount, semester, acad_year, payment_status
+                FROM term
+                WHERE term_id = ?
                 """
                 result = self.db.execute_query(query, (term_id,))
                 
                 if result:
-                    fee_amount = Decimal(str(result[0][0]))
-                    total_paid = Decimal(str(result[0][1]))
-                    new_total_paid = total_paid + amount
-                    
-                    # Update payment status based on whether the balance is fully paid
-                    payment_status = "paid" if new_total_paid >= fee_amount else "partial"
-                    update_query = "UPDATE term SET payment_status = ? WHERE term_id = ?"
-                    if not self.db.execute_update(update_query, (payment_status, term_id)):
-                        raise Exception("Failed to update payment status")
-                    
                     # Show success message first
                     messagebox.showinfo("Success", "Payment recorded successfully")
                     
                     # Then show receipt with updated information
                     term_info = {
-                        'semester': result[0][2],
-                        'acad_year': result[0][3],
-                        'fee_amount': float(fee_amount)
+                        'semester': result[0][1],
+                        'acad_year': result[0][2],
+                        'fee_amount': float(result[0][0])
                     }
                     
                     # Create updated member info with new payment status
                     updated_member_info = {
                         'Name': selected['Name'],
                         'Student ID': selected['Student ID'],
-                        'Payment Status': payment_status
+                        'Payment Status': result[0][3]
                     }
                     
                     self.show_receipt(payment, updated_member_info, term_info)
@@ -1287,11 +1423,16 @@ class MainWindow(tk.Frame):
             messagebox.showwarning("Warning", "Please select organization, semester, and academic year")
             return
         
-        orgs = self.db.get_all_organizations()
-        org_id = next(org.org_id for org in orgs if org.org_name == org_name)
+        org_id = self.db.get_organization_id(org_name)
         
-        late_payments = self.db.get_late_payments(org_id, semester, acad_year)
-        self.fee_table.insert_data(late_payments)
+        # The fee list pages no longer apply to the table
+        self.fee_pages_for = None
+        self.fee_table.reset_pages()
+        self.run_in_background(
+            'fee_table', self.db.get_late_payments, org_id, semester, acad_year,
+            on_success=self.fee_table.insert_data,
+            what="late payments"
+        )
     
     def view_highest_debt(self):
         org_name = self.fin_org_combo.get()
@@ -1302,11 +1443,16 @@ class MainWindow(tk.Frame):
             messagebox.showwarning("Warning", "Please select organization, semester, and academic year")
             return
         
-        orgs = self.db.get_all_organizations()
-        org_id = next(org.org_id for org in orgs if org.org_name == org_name)
+        org_id = self.db.get_organization_id(org_name)
         
-        highest_debt = self.db.get_highest_debt_members(org_id, semester, acad_year)
-        self.fee_table.insert_data(highest_debt)
+        # The fee list pages no longer apply to the table
+        self.fee_pages_for = None
+        self.fee_table.reset_pages()
+        self.run_in_background(
+            'fee_table', self.db.get_highest_debt_members, org_id, semester, acad_year,
+            on_success=self.fee_table.insert_data,
+            what="highest debt members"
+        )
     
     def load_report_filters(self):
         # Load organizations
@@ -1330,11 +1476,15 @@ class MainWindow(tk.Frame):
             messagebox.showwarning("Warning", "Please select an organization")
             return
         
-        orgs = self.db.get_all_organizations()
-        org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-        
-        status = self.db.get_membership_status_percentage(org_id, 2)  # Last 2 semesters
+        org_id = self.db.get_organization_id(org_name)
         
+        self.run_in_background(
+            'report_table', self.db.get_membership_status_percentage, org_id, 2,  # Last 2 semesters
+            on_success=self.display_membership_status,
+            what="membership status"
+        )
+    
+    def display_membership_status(self, status):
         # Update table columns for membership status
         columns = ['active_percentage', 'inactive_percentage', 'total_members']
         self.report_table.tree['columns'] = columns
@@ -1358,11 +1508,15 @@ class MainWindow(tk.Frame):
             messagebox.showwarning("Warning", "Please select organization and academic year")
             return
         
-        orgs = self.db.get_all_organizations()
-        org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-        
-        committee = self.db.get_executive_committee(org_id, acad_year)
+        org_id = self.db.get_organization_id(org_name)
         
+        self.run_in_background(
+            'report_table', self.db.get_executive_committee, org_id, acad_year,
+            on_success=self.display_executive_committee,
+            what="executive committee"
+        )
+    
+    def display_executive_committee(self, committee):
         # Update table columns for executive committee
         columns = ['student_id', 'first_name', 'last_name', 'role']
         self.report_table.tree['columns'] = columns
@@ -1387,19 +1541,23 @@ class MainWindow(tk.Frame):
         self.wait_window(dialog)
         
         if dialog.result:
-            orgs = self.db.get_all_organizations()
-            org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-            
-            history = self.db.get_role_history(org_id, dialog.result['role'])
+            org_id = self.db.get_organization_id(org_name)
             
-            # Update table columns for role history
-            columns = ['student_id', 'first_name', 'last_name', 'academic_year']
-            self.report_table.tree['columns'] = columns
-            for col in columns:
-                self.report_table.tree.heading(col, text=col.replace('_', ' ').title())
-                self.report_table.tree.column(col, width=100)
-            
-            self.report_table.insert_data(history)
+            self.run_in_background(
+                'report_table', self.db.get_role_history, org_id, dialog.result['role'],
+                on_success=self.display_role_history,
+                what="role history"
+            )
+    
+    def display_role_history(self, history):
+        # Update table columns for role history
+        columns = ['student_id', 'first_name', 'last_name', 'academic_year']
+        self.report_table.tree['columns'] = columns
+        for col in columns:
+            self.report_table.tree.heading(col, text=col.replace('_', ' ').title())
+            self.report_table.tree.column(col, width=100)
+        
+        self.report_table.insert_data(history)
     
     def show_alumni(self):
         org_name = self.report_org_combo.get()
@@ -1416,31 +1574,25 @@ class MainWindow(tk.Frame):
         self.wait_window(dialog)
         
         if dialog.result:
-            orgs = self.db.get_all_organizations()
-            org_id = next(org.org_id for org in orgs if org.org_name == org_name)
+            org_id = self.db.get_organization_id(org_name)
             year = int(dialog.result['as_of_date'].split('-')[0])
             month = int(dialog.result['as_of_date'].split('-')[1])
-
             
-            alumni = self.db.get_alumni_members(org_id, year, month)
-            
-            # Update table columns for alumni
-            columns = ['student_id', 'first_name', 'last_name', 'batch']
-            self.report_table.tree['columns'] = columns
-            for col in columns:
-                self.report_table.tree.heading(col, text=col.replace('_', ' ').title())
-                self.report_table.tree.column(col, width=100)
-
-            formatted_data = []
-            for alum in alumni:
-                formatted_data.append({
-                    'student_id': alum['student_id'],
-                    'first_name': alum['first_name'],
-                    'last_name': alum['last_name'],
-                    'batch': alum['batch']
-                })
-            
-            self.report_table.insert_data(alumni)
+            self.run_in_background(
+                'report_table', self.db.get_alumni_members, org_id, year, month,
+                on_success=self.display_alumni,
+                what="alumni"
+            )
+    
+    def display_alumni(self, alumni):
+        # Update table columns for alumni
+        columns = ['student_id', 'first_name', 'last_name', 'batch']
+        self.report_table.tree['columns'] = columns
+        for col in columns:
+            self.report_table.tree.heading(col, text=col.replace('_', ' ').title())
+            self.report_table.tree.column(col, width=100)
+        
+        self.report_table.insert_data(alumni)
 
     def show_unpaid_fees(self):
         org_name = self.report_org_combo.get()
@@ -1459,78 +1611,57 @@ class MainWindow(tk.Frame):
         if dialog.result:
             try:
                 as_of_date = datetime.strptime(dialog.result['as_of_date'], '%Y-%m-%d').date()
-                orgs = self.db.get_all_organizations()
-                org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-                
-                # Query to get total fees, paid amount, and unpaid amount as of the given date
-                query = """
-                SELECT 
-                    t.semester,
-                    t.acad_year,
-                    SUM(t.fee_amount) as total_fees,
-                    COALESCE(SUM(p.amount), 0) as total_paid,
-                    SUM(t.fee_amount) - COALESCE(SUM(p.amount), 0) as total_unpaid
-                FROM term t
-                JOIN membership m ON t.membership_id = m.membership_id
-                LEFT JOIN payment p ON t.term_id = p.term_id AND p.payment_date <= ?
-                WHERE m.org_id = ? AND t.term_start <= ?
-                GROUP BY t.semester, t.acad_year
-                ORDER BY t.acad_year DESC, 
-                    CASE t.semester
-                        WHEN '1st' THEN 1
-                        WHEN '2nd' THEN 2
-                        WHEN 'Summer' THEN 3
-                        ELSE 4
-                    END
-                """
-                
-                results = self.db.execute_query(query, (as_of_date, org_id, as_of_date))
-                
-                if not results:
-                    messagebox.showinfo("Info", f"No financial data found for {org_name} as of {as_of_date}")
-                    return
-                
-                # Update table columns for financial summary
-                columns = ['Semester', 'Academic Year', 'Total Fees', 'Total Paid', 'Total Unpaid']
-                self.report_table.tree['columns'] = columns
-                for col in columns:
-                    self.report_table.tree.heading(col, text=col)
-                    self.report_table.tree.column(col, width=100)
-                
-                # Format the data
-                formatted_data = []
-                total_fees_sum = 0
-                total_paid_sum = 0
-                total_unpaid_sum = 0
-                
-                for row in results:
-                    semester, acad_year, total_fees, total_paid, total_unpaid = row
-                    formatted_data.append({
-                        'Semester': semester,
-                        'Academic Year': acad_year,
-                        'Total Fees': f"₱{total_fees:.2f}",
-                        'Total Paid': f"₱{total_paid:.2f}",
-                        'Total Unpaid': f"₱{total_unpaid:.2f}"
-                    })
-                    total_fees_sum += total_fees
-                    total_paid_sum += total_paid
-                    total_unpaid_sum += total_unpaid
-                
-                # Add a summary row
-                formatted_data.append({
-                    'Semester': 'TOTAL',
-                    'Academic Year': '',
-                    'Total Fees': f"₱{total_fees_sum:.2f}",
-                    'Total Paid': f"₱{total_paid_sum:.2f}",
-                    'Total Unpaid': f"₱{total_unpaid_sum:.2f}"
-                })
-                
-                self.report_table.insert_data(formatted_data)
-                
             except ValueError:
                 messagebox.showerror("Error", "Invalid date format. Please use YYYY-MM-DD")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
+                return
+            org_id = self.db.get_organization_id(org_name)
+            
+            self.run_in_background(
+                'report_table', self.db.get_unpaid_fees_as_of, org_id, as_of_date,
+                on_success=lambda results: self.display_unpaid_fees(results, org_name, as_of_date),
+                what="unpaid fees report"
+            )
+    
+    def display_unpaid_fees(self, results, org_name, as_of_date):
+        if not results:
+            messagebox.showinfo("Info", f"No financial data found for {org_name} as of {as_of_date}")
+            return
+        
+        # Update table columns for financial summary
+        columns = ['Semester', 'Academic Year', 'Total Fees', 'Total Paid', 'Total Unpaid']
+        self.report_table.tree['columns'] = columns
+        for col in columns:
+            self.report_table.tree.heading(col, text=col)
+            self.report_table.tree.column(col, width=100)
+        
+        # Format the data
+        formatted_data = []
+        total_fees_sum = 0
+        total_paid_sum = 0
+        total_unpaid_sum = 0
+        
+        for row in results:
+            formatted_data.append({
+                'Semester': row['semester'],
+                'Academic Year': row['acad_year'],
+                'Total Fees': f"₱{row['total_fees']:.2f}",
+                'Total Paid': f"₱{row['total_paid']:.2f}",
+                'Total Unpaid': f"₱{row['total_unpaid']:.2f}"
+            })
+            total_fees_sum += row['total_fees']
+            total_paid_sum += row['total_paid']
+            total_unpaid_sum += row['total_unpaid']
+        
+        # Add a summary row
+        formatted_data.append({
+            'Semester': 'TOTAL',
+            'Academic Year': '',
+            'Total Fees': f"₱{total_fees_sum:.2f}",
+            'Total Paid': f"₱{total_paid_sum:.2f}",
+            'Total Unpaid': f"₱{total_unpaid_sum:.2f}"
+        })
+        
+        self.report_table.insert_data(formatted_data)
 
     def show_student_unpaid(self):
         org_name = self.report_org_combo.get()
@@ -1541,34 +1672,16 @@ class MainWindow(tk.Frame):
             messagebox.showwarning("Warning", "Please select organization, semester, and academic year")
             return
         
-        orgs = self.db.get_all_organizations()
-        org_id = next(org.org_id for org in orgs if org.org_name == org_name)
+        org_id = self.db.get_organization_id(org_name)
         
         # Get members with highest debt for the selected semester and academic year
-        query = """
-        SELECT 
-            s.student_id,
-            s.first_name,
-            s.last_name,
-            t.fee_amount,
-            COALESCE(SUM(p.amount), 0) as total_paid,
-            (t.fee_amount - COALESCE(SUM(p.amount), 0)) as balance,
-            t.semester,
-            t.acad_year,
-            t.payment_status
-        FROM student s
-        JOIN membership m ON s.student_id = m.student_id
-        JOIN organization org ON m.org_id = org.org_id
-        JOIN term t ON m.membership_id = t.membership_id
-        LEFT JOIN payment p ON t.term_id = p.term_id
-        WHERE org.org_id = ? AND t.semester = ? AND t.acad_year = ?
-        GROUP BY s.student_id, t.term_id
-        HAVING balance > 0
-        ORDER BY balance DESC
-        """
-        
-        results = self.db.execute_query(query, (org_id, semester, acad_year))
-        
+        self.run_in_background(
+            'report_table', self.db.get_student_balances, org_id, semester, acad_year,
+            on_success=lambda results: self.display_student_unpaid(results, org_name, semester, acad_year),
+            what="unpaid fees"
+        )
+    
+    def display_student_unpaid(self, results, org_name, semester, acad_year):
         if not results:
             messagebox.showinfo("Info", f"No unpaid fees found for {org_name} in {semester} {acad_year}")
             return
@@ -1584,18 +1697,18 @@ class MainWindow(tk.Frame):
         formatted_data = []
         for row in results:
             formatted_data.append({
-                'Student ID': row[0],
-                'Name': f"{row[1]} {row[2]}",
-                'Fee Amount': f"₱{row[3]:.2f}",
-                'Amount Paid': f"₱{row[4]:.2f}",
-                'Balance': f"₱{row[5]:.2f}",
-                'Payment Status': row[8]
+                'Student ID': row['student_id'],
+                'Name': f"{row['first_name']} {row['last_name']}",
+                'Fee Amount': f"₱{row['fee_amount']:.2f}",
+                'Amount Paid': f"₱{row['total_paid']:.2f}",
+                'Balance': f"₱{row['balance']:.2f}",
+                'Payment Status': row['payment_status']
             })
         
         self.report_table.insert_data(formatted_data)
         
         # Update status bar with summary
-        total_debt = sum(float(row[5]) for row in results)
+        total_debt = sum(float(row['balance']) for row in results)
         self.status_bar.config(text=f"Showing {len(results)} members with total unpaid amount of ₱{total_debt:.2f}")
 
     def show_member_in_role(self):
@@ -1605,8 +1718,7 @@ class MainWindow(tk.Frame):
             messagebox.showwarning("Warning", "Please select an organization")
             return
         
-        orgs = self.db.get_all_organizations()
-        org_id = next(org.org_id for org in orgs if org.org_name == org_name)
+        org_id = self.db.get_organization_id(org_name)
         
         fields = [
             {'name': 'role', 'label': 'Role', 'type': 'combobox', 
@@ -1619,8 +1731,13 @@ class MainWindow(tk.Frame):
         if dialog.result:
             role = dialog.result['role'].lower()
         
-            officers = self.db.get_member_in_role(org_id, role, acad_year) 
-
+            self.run_in_background(
+                'report_table', self.db.get_member_in_role, org_id, role, acad_year,
+                on_success=self.display_member_in_role,
+                what="members in role"
+            )
+    
+    def display_member_in_role(self, officers):
         # Update table columns for membership status
         columns = ['membership_id', 'first_name', 'last_name', 'org_id', 'term_id', 'semester', 'term_start', 'term_end', 'acad_year', 'role']
         self.report_table.tree['columns'] = columns
@@ -1662,29 +1779,32 @@ class MainWindow(tk.Frame):
         if dialog.result:
             try:
                 as_of_date = datetime.strptime(dialog.result['as_of_date'], '%Y-%m-%d').date()
-                orgs = self.db.get_all_organizations()
-                org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-                
-                summary = self.db.get_organization_financial_status(org_id, dialog.result['as_of_date'])
-                
-                # Update table columns for financial summary
-                columns = ['total_fees', 'total_paid', 'total_unpaid']
-                self.report_table.tree['columns'] = columns
-                for col in columns:
-                    self.report_table.tree.heading(col, text=col.replace('_', ' ').title())
-                    self.report_table.tree.column(col, width=100)
-                
-                # Format the data
-                formatted_data = [{
-                    'total_fees': f"₱{summary['total_fees']:.2f}",
-                    'total_paid': f"₱{summary['total_paid']:.2f}",
-                    'total_unpaid': f"₱{summary['total_unpaid']:.2f}"
-                }]
-                self.report_table.insert_data(formatted_data)
             except ValueError:
                 messagebox.showerror("Error", "Invalid date format. Please use YYYY-MM-DD")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
+                return
+            org_id = self.db.get_organization_id(org_name)
+            
+            self.run_in_background(
+                'report_table', self.db.get_organization_financial_status, org_id, dialog.result['as_of_date'],
+                on_success=self.display_financial_summary,
+                what="financial summary"
+            )
+    
+    def display_financial_summary(self, summary):
+        # Update table columns for financial summary
+        columns = ['total_fees', 'total_paid', 'total_unpaid']
+        self.report_table.tree['columns'] = columns
+        for col in columns:
+            self.report_table.tree.heading(col, text=col.replace('_', ' ').title())
+            self.report_table.tree.column(col, width=100)
+        
+        # Format the data
+        formatted_data = [{
+            'total_fees': f"₱{summary['total_fees']:.2f}",
+            'total_paid': f"₱{summary['total_paid']:.2f}",
+            'total_unpaid': f"₱{summary['total_unpaid']:.2f}"
+        }]
+        self.report_table.insert_data(formatted_data)
     
     def show_late_payments_report(self):
         org_name = self.report_org_combo.get()
@@ -1695,11 +1815,15 @@ class MainWindow(tk.Frame):
             messagebox.showwarning("Warning", "Please select organization, semester, and academic year")
             return
         
-        orgs = self.db.get_all_organizations()
-        org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-        
-        late_payments = self.db.get_late_payments(org_id, semester, acad_year)
+        org_id = self.db.get_organization_id(org_name)
         
+        self.run_in_background(
+            'report_table', self.db.get_late_payments, org_id, semester, acad_year,
+            on_success=self.display_late_payments_report,
+            what="late payments"
+        )
+    
+    def display_late_payments_report(self, late_payments):
         # Update table columns for late payments
         columns = ['student_id', 'first_name', 'last_name', 'payment_date', 'due_date', 'amount']
         self.report_table.tree['columns'] = columns
@@ -1729,11 +1853,15 @@ class MainWindow(tk.Frame):
             messagebox.showwarning("Warning", "Please select organization, semester, and academic year")
             return
         
-        orgs = self.db.get_all_organizations()
-        org_id = next(org.org_id for org in orgs if org.org_name == org_name)
-        
-        highest_debt = self.db.get_highest_debt_members(org_id, semester, acad_year)
+        org_id = self.db.get_organization_id(org_name)
         
+        self.run_in_background(
+            'report_table', self.db.get_highest_debt_members, org_id, semester, acad_year,
+            on_success=self.display_highest_debt_report,
+            what="highest debt report"
+        )
+    
+    def display_highest_debt_report(self, highest_debt):
         # Update table columns for highest debt
         columns = ['student_id', 'first_name', 'last_name', 'fee_amount', 'total_paid', 'balance']
         self.report_table.tree['columns'] = columns
@@ -1754,6 +1882,189 @@ class MainWindow(tk.Frame):
             })
         self.report_table.insert_data(formatted_data)
     
+    def reconcile_balances(self):
+        """Check stored term balances against payments and offer to repair drift"""
+        self.status_bar.config(text="Checking term balances...")
+        self.run_in_background(
+            'reconcile', self.db.reconcile_term_balances,
+            on_success=self.confirm_reconcile,
+            what="balance check"
+        )
+    
+    def confirm_reconcile(self, drifted):
+        if drifted is None:
+            self.show_load_error("balance check", Exception("see the log for details"))
+            return
+        if not drifted:
+            self.status_bar.config(text="All term balances match their payments")
+            messagebox.showinfo("Reconcile Balances", "All term balances match their payments")
+            return
+        
+        self.status_bar.config(text=f"{len(drifted)} term balances out of sync")
+        if messagebox.askyesno("Reconcile Balances", f"{len(drifted)} term balances do not match their payments. Repair them?"):
+            self.run_in_background(
+                'reconcile', self.db.reconcile_term_balances, True,
+                on_success=self.show_reconcile_repair,
+                what="balance repair"
+            )
+    
+    def show_reconcile_repair(self, repaired):
+        if repaired is None:
+            self.show_load_error("balance repair", Exception("see the log for details"))
+            return
+        self.status_bar.config(text=f"Repaired {len(repaired)} term balances")
+    
+    def rebuild_financial_summary(self):
+        """Recompute the per-term financial summary from terms and payments"""
+        self.status_bar.config(text="Rebuilding financial summary...")
+        self.run_in_background(
+            'rebuild_summary', self.db.rebuild_financial_summary,
+            on_success=lambda ok: self.status_bar.config(
+                text="Financial summary rebuilt" if ok else "Financial summary rebuild failed"
+            ),
+            what="financial summary"
+        )
+    
+    def rollover_semester(self):
+        """Create next-semester terms for every active or inactive member in one step"""
+        all_orgs = "All organizations"
+        this_year = datetime.now().year
+        fields = [
+            {'name': 'organization', 'label': 'Organization', 'type': 'combobox',
+             'values': [all_orgs] + [org.org_name for org in self.db.get_all_organizations()],
+             'default': all_orgs},
+            {'name': 'from_semester', 'label': 'From Semester', 'type': 'combobox',
+             'values': ['1st', '2nd', 'Summer'], 'default': '1st'},
+            {'name': 'from_acad_year', 'label': 'From Academic Year', 'type': 'entry',
+             'default': f"{this_year}-{this_year + 1}"},
+            {'name': 'to_semester', 'label': 'To Semester', 'type': 'combobox',
+             'values': ['1st', '2nd', 'Summer'], 'default': '2nd'},
+            {'name': 'to_acad_year', 'label': 'To Academic Year', 'type': 'entry',
+             'default': f"{this_year}-{this_year + 1}"},
+            {'name': 'term_start', 'label': 'Term Start (YYYY-MM-DD)', 'type': 'entry',
+             'default': datetime.now().strftime('%Y-%m-%d')},
+            {'name': 'term_end', 'label': 'Term End (YYYY-MM-DD)', 'type': 'entry',
+             'default': (datetime.now() + timedelta(days=150)).strftime('%Y-%m-%d')},
+            {'name': 'fee_due', 'label': 'Fee Due (YYYY-MM-DD)', 'type': 'entry',
+             'default': (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d')},
+        ]
+        dialog = FormDialog(self, "Start New Semester", fields)
+        self.wait_window(dialog)
+        if not dialog.result:
+            return
+        
+        result = dialog.result
+        try:
+            term_start = datetime.strptime(result['term_start'], '%Y-%m-%d').date()
+            term_end = datetime.strptime(result['term_end'], '%Y-%m-%d').date()
+            fee_due = datetime.strptime(result['fee_due'], '%Y-%m-%d').date()
+        except ValueError:
+            messagebox.showerror("Error", "Dates must be in YYYY-MM-DD format")
+            return
+        if (result['from_semester'], result['from_acad_year']) == (result['to_semester'], result['to_acad_year']):
+            messagebox.showerror("Error", "The new semester must differ from the current one")
+            return
+        
+        org_id = None
+        if result['organization'] != all_orgs:
+            org_id = self.db.get_organization_id(result['organization'])
+            if org_id is None:
+                messagebox.showerror("Error", f"Organization '{result['organization']}' not found")
+                return
+        
+        target = f"{result['to_semester']} {result['to_acad_year']}"
+        self.status_bar.config(text=f"Creating {target} terms...")
+        self.run_in_background(
+            'rollover', self.db.rollover_semester,
+            result['from_semester'], result['from_acad_year'], result['to_semester'], result['to_acad_year'],
+            term_start, term_end, fee_due, org_id,
+            on_success=lambda counts: self.show_rollover_result(counts, target),
+            what="semester rollover"
+        )
+    
+    def show_rollover_result(self, counts, target):
+        if counts is None:
+            self.show_load_error("semester rollover", Exception("see the log for details"))
+            return
+        self.status_bar.config(text=f"Created {counts['created']} terms for {target}")
+        messagebox.showinfo("Start New Semester", (
+            f"Eligible memberships: {counts['eligible']}\n"
+            f"Terms created: {counts['created']}\n"
+            f"Already enrolled: {counts['already_enrolled']}\n"
+            f"Fees charged: ₱{counts['total_fees']:.2f}"
+        ))
+    
+    def post_payments_from_file(self):
+        """Preview a bank/cashier payment file with a dry run, then post it in one transaction once confirmed"""
+        path = filedialog.askopenfilename(
+            title="Payment File",
+            filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        
+        def preview():
+            posting = PaymentPosting(self.db, path, dry_run=True)
+            posting.run()
+            return posting
+        
+        self.status_bar.config(text="Checking payment file...")
+        self.run_in_background(
+            'post_payments', preview,
+            on_success=lambda posting: self.confirm_payment_posting(posting, path),
+            what="payment preview"
+        )
+    
+    def confirm_payment_posting(self, preview, path):
+        """Show the dry-run summary and reconciliation count; post the file if the user agrees"""
+        result = preview.result
+        if not result.ok:
+            self.status_bar.config(text="Payment file check failed")
+            messagebox.showerror("Post Payments", preview.summary())
+            return
+        if not result.posted:
+            self.status_bar.config(text="No payments to post")
+            messagebox.showinfo("Post Payments", preview.summary())
+            return
+        
+        message = preview.summary()
+        issues = len(preview.reconciliation_rows())
+        if issues:
+            message += f"\n\n{issues} rows are unmatched or overpaid and will be listed in the reconciliation report."
+        if not messagebox.askyesno("Post Payments", message + "\n\nPost these payments?"):
+            self.status_bar.config(text="Payment posting cancelled")
+            return
+        
+        def post():
+            posting = PaymentPosting(self.db, path)
+            posting.run()
+            return posting
+        
+        self.status_bar.config(text="Posting payments...")
+        self.run_in_background('post_payments', post, on_success=self.show_payment_posting, what="payment posting")
+    
+    def show_payment_posting(self, posting):
+        result = posting.result
+        if not result.ok:
+            self.status_bar.config(text="Payment posting failed")
+            messagebox.showerror("Post Payments", posting.summary())
+            return
+        
+        self.status_bar.config(text=f"Posted {result.posted} payments")
+        if not posting.reconciliation_rows():
+            messagebox.showinfo("Post Payments", posting.summary())
+        elif messagebox.askyesno("Post Payments", posting.summary() + "\n\nSave the reconciliation report?"):
+            path = filedialog.asksaveasfilename(
+                title="Reconciliation Report", defaultextension=".csv", filetypes=[("CSV files", "*.csv")]
+            )
+            if path:
+                with open(path, 'w', newline='', encoding='utf-8') as out:
+                    posting.write_reconciliation(out)
+        
+        # Balances changed; refresh the fee list if one is shown
+        if self.fee_pages_for is not None:
+            self.load_financial_data()
+    
     def show_about(self):
         messagebox.showinfo("About", "Organization Management System\nVersion 1.0")
     
@@ -1769,8 +2080,7 @@ class MainWindow(tk.Frame):
                 return
             
             # Get organization ID
-            orgs = self.db.get_all_organizations()
-            org_id = next(org.org_id for org in orgs if org.org_name == org_name)
+            org_id = self.db.get_organization_id(org_name)
             
             # Get current term dates
             query = """
@@ -1826,13 +2136,7 @@ class MainWindow(tk.Frame):
                         return
                     
                     # Update term dates for all members in this term
-                    update_query = """
-                    UPDATE term t
-                    JOIN membership m ON t.membership_id = m.membership_id
-                    SET t.term_start = ?, t.term_end = ?, t.fee_due = ?
-                    WHERE m.org_id = ? AND t.semester = ? AND t.acad_year = ?
-                    """
-                    if self.db.execute_update(update_query, (new_start, new_end, new_end, org_id, semester, acad_year)):
+                    if self.db.update_term_dates(org_id, semester, acad_year, new_start, new_end):
                         messagebox.showinfo("Success", f"Updated term dates for {term_count} members")
                         # Reload term data to show updated dates
                         self.load_term_data()
@@ -1954,9 +2258,27 @@ class MainWindow(tk.Frame):
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete student: {str(e)}")
     
-    def refresh_students(self):
-        """Refresh the students table"""
-        students = self.db.get_all_students()
+    def refresh_students(self, after=None):
+        """Refresh the students table; without `after`, reload the current page"""
+        search = self.student_search_var.get().strip()
+        if search != self.student_pages_for:
+            # Another search starts from its first page
+            self.student_pages_for = search
+            self.students_table.reset_pages()
+        if after is None:
+            after = self.students_table.page_start
+        
+        self.run_in_background(
+            'students_table', lambda: self.db.get_students_page(after, search=search),
+            on_success=self.display_students,
+            what="students"
+        )
+    
+    def display_students(self, page):
+        """Show the page of students fetched by refresh_students"""
+        students = page.rows
+        self.students_table.set_page_info(page.next_key)
+        self.students_table.clear()
         student_data = [
             {
                 'Student ID': s.student_id,
@@ -1968,18 +2290,6 @@ class MainWindow(tk.Frame):
             }
             for s in students
         ]
-        
-        # Store original data for filtering
-        self.original_student_data = student_data
-        
-        # Apply any existing search filter
-        search_text = self.student_search_var.get().lower()
-        if search_text:
-            student_data = [
-                row for row in student_data
-                if search_text in f"{row['First Name']} {row['Last Name']}".lower()
-            ]
-        
         self.students_table.insert_data(student_data)
     
     def edit_organization(self):
@@ -2049,31 +2359,14 @@ class MainWindow(tk.Frame):
         
         # Store original data for filtering
         self.original_org_data = org_data
+        self.org_index = SearchIndex(org_data, self.org_search_text)
         
         # Apply any existing search filter
-        search_text = self.org_search_var.get().lower()
-        if search_text:
-            org_data = [
-                row for row in org_data
-                if search_text in row['Organization Name'].lower()
-            ]
-        
-        self.organizations_table.insert_data(org_data)
+        self.filter_organization_data()
     
     def filter_student_data(self, *args):
-        """Filter the student table based on search text"""
-        search_text = self.student_search_var.get().lower()
-        
-        # Clear the table
-        self.students_table.clear()
-        
-        # Filter and insert matching data
-        if self.original_student_data:
-            filtered_data = [
-                row for row in self.original_student_data
-                if search_text in f"{row['First Name']} {row['Last Name']}".lower()
-            ]
-            self.students_table.insert_data(filtered_data)
+        """Reload the students from their first page with the search text"""
+        self.refresh_students()
 
     def filter_organization_data(self, *args):
         """Filter the organization table based on search text"""
@@ -2084,26 +2377,13 @@ class MainWindow(tk.Frame):
         
         # Filter and insert matching data
         if self.original_org_data:
-            filtered_data = [
-                row for row in self.original_org_data
-                if search_text in row['Organization Name'].lower()
-            ]
-            self.organizations_table.insert_data(filtered_data)
+            self.organizations_table.insert_data(self.org_index.search(search_text))
 
     def filter_financial_data(self, *args):
-        """Filter the financial table based on search text"""
-        search_text = self.financial_search_var.get().lower()
-        
-        # Clear the table
-        self.fee_table.clear()
-        
-        # Filter and insert matching data
-        if self.original_financial_data:
-            filtered_data = [
-                row for row in self.original_financial_data
-                if search_text in row['Name'].lower()
-            ]
-            self.fee_table.insert_data(filtered_data)
+        """Reload the fee list from its first page with the search text"""
+        # Only the fee list is searched (not the late payment / highest debt views)
+        if self.fee_pages_for is not None:
+            self.load_financial_data()
 
     def edit_term_member(self):
         """Edit a member from the terms view"""
@@ -2162,5 +2442,7 @@ class MainWindow(tk.Frame):
                 messagebox.showerror("Error", f"Failed to update member term: {str(e)}")
     
     def __del__(self):
+        if getattr(self, 'async_db', None):
+            self.async_db.shutdown()
         if hasattr(self, 'db'):
             self.db.disconnect()
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""Post many payments at once from a bank or cashier file (CSV or .xlsx).
+
+Examples:
+    python payment_poster.py payments.csv --user root
+    python payment_poster.py payments.csv --user root --org "Computer Society" --term 2nd:2024-2025 \
+        --reconciliation reconciliation.csv --dry-run
+
+Expected columns (header names are case-insensitive; spaces become underscores):
+    amount, payment_date (or date)     required
+    term_id or student_id              at least one
+
+A row with a term_id pays that term. Rows with only a student_id pay the student's
+open terms oldest first, limited to --org/--term when given: each row goes to the
+term the student's running total in the file has reached, so a second payment
+moves on to the next open term once the first covered the oldest. Rows are not
+split across terms. All payments are posted in one transaction (see
+DatabaseManager.post_payments); rows that match no term and rows that pay more
+than the term owes are listed in the reconciliation report.
+"""
+import argparse
+import csv
+import sys
+import time
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cli_common import (MAX_REPORTED_ERRORS, add_connection_arguments, configure_connection,
+                        configure_logging, read_rows)
+from database import DatabaseManager, PaymentPostResult
+from run_reports import parse_term
+
+RECONCILIATION_COLUMNS = ['row', 'issue', 'student_id', 'term_id', 'amount', 'payment_date', 'balance', 'overpaid_by']
+
+
+def _optional_id(values: Dict[str, str], column: str) -> Optional[int]:
+    value = values.get(column, '')
+    if not value:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{column} {value!r} is not a number")
+    if number <= 0:
+        raise ValueError(f"{column} must be positive")
+    return number
+
+
+def parse_payment_row(row: Dict[str, str]) -> Tuple[Optional[int], Optional[int], float, date]:
+    """(student_id, term_id, amount, payment_date) for one row, or raise ValueError"""
+    values = {key: (row.get(key) or '').strip() for key in row}
+    student_id = _optional_id(values, 'student_id')
+    term_id = _optional_id(values, 'term_id')
+    if student_id is None and term_id is None:
+        raise ValueError("needs a student_id or a term_id")
+
+    try:
+        amount = round(float(values.get('amount', '').replace(',', '')), 2)
+    except ValueError:
+        raise ValueError(f"amount {values.get('amount')!r} is not a number")
+    if amount <= 0:
+        raise ValueError("amount must be positive")
+
+    raw_date = values.get('payment_date') or values.get('date', '')
+    try:
+        # .xlsx cells come through as "YYYY-MM-DD HH:MM:SS"
+        payment_date = datetime.strptime(raw_date[:10], '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"payment date {raw_date!r} is not YYYY-MM-DD")
+    return student_id, term_id, amount, payment_date
+
+
+class PaymentPosting:
+    # --- Streams a payment file through validation into DatabaseManager.post_payments ---
+
+    def __init__(self, db: DatabaseManager, path: str, org_id: Optional[int] = None,
+                 semester: Optional[str] = None, acad_year: Optional[str] = None, dry_run: bool = False):
+        self.db = db
+        self.path = path
+        self.org_id = org_id
+        self.semester = semester
+        self.acad_year = acad_year
+        self.dry_run = dry_run
+        self.rows_read = 0
+        self.invalid: List[Tuple[int, str]] = []
+        self.invalid_count = 0
+        self.seconds = 0.0
+        self.result: Optional[PaymentPostResult] = None
+
+    def valid_rows(self) -> Iterator[Tuple[int, Optional[int], Optional[int], float, date]]:
+        for line, row in read_rows(self.path):
+            self.rows_read += 1
+            try:
+                yield (line,) + parse_payment_row(row)
+            except ValueError as e:
+                self.invalid_count += 1
+                if len(self.invalid) < MAX_REPORTED_ERRORS:
+                    self.invalid.append((line, str(e)))
+
+    def run(self) -> bool:
+        start = time.perf_counter()
+        self.result = self.db.post_payments(
+            self.valid_rows(), self.org_id, self.semester, self.acad_year, self.dry_run
+        )
+        self.seconds = time.perf_counter() - start
+        return self.result.ok
+
+    def summary(self) -> str:
+        result = self.result
+        rate = self.rows_read / self.seconds if self.seconds > 0 else 0.0
+        lines = [f"Read {self.rows_read} rows in {self.seconds:.2f}s ({rate:.0f} rows/s)"]
+        if not result.ok:
+            lines.append(f"Nothing posted: {result.error}")
+        else:
+            verb = "Would post" if self.dry_run else "Posted"
+            lines.append(f"{verb} {result.posted} payments totalling ₱{result.total_posted:.2f} "
+                         f"to {result.terms_updated} terms")
+        lines += [
+            f"  invalid:   {self.invalid_count}",
+            f"  rejected:  {len(result.failed)}",
+            f"  unmatched: {len(result.unmatched)}",
+            f"  overpaid:  {len(result.overpaid)}",
+        ]
+        for line, error in self.invalid:
+            lines.append(f"line {line}: {error}")
+        if self.invalid_count > len(self.invalid):
+            lines.append(f"... and {self.invalid_count - len(self.invalid)} more invalid rows")
+        for _, (line, *_), error in result.failed:
+            lines.append(f"line {line}: rejected by the database: {error}")
+        return "\n".join(lines)
+
+    def reconciliation_rows(self) -> List[dict]:
+        """Unmatched and overpaid rows, in file order"""
+        rows = [dict(row, issue='unmatched') for row in self.result.unmatched]
+        rows += [dict(row, issue='overpaid') for row in self.result.overpaid]
+        return sorted(rows, key=lambda row: row['row'])
+
+    def write_reconciliation(self, out):
+        writer = csv.DictWriter(out, fieldnames=RECONCILIATION_COLUMNS, restval='')
+        writer.writeheader()
+        for row in self.reconciliation_rows():
+            writer.writerow(row)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Post payments from a CSV or .xlsx file")
+    parser.add_argument('path')
+    parser.add_argument('--org', help="only match student rows to this organization's terms")
+    parser.add_argument('--term', type=parse_term, help="only match student rows to this SEMESTER:ACAD_YEAR")
+    parser.add_argument('--reconciliation', help="write unmatched and overpaid rows to this CSV file")
+    parser.add_argument('--dry-run', action='store_true', help="match and report, then roll back")
+    add_connection_arguments(parser)
+    args = parser.parse_args(argv)
+    configure_connection(args)
+
+    db = DatabaseManager()
+    if not db.connect():
+        print("Could not connect to the database", file=sys.stderr)
+        return 1
+    try:
+        org_id = None
+        if args.org:
+            org_id = db.get_organization_id(args.org)
+            if org_id is None:
+                print(f"Unknown organization: {args.org}", file=sys.stderr)
+                return 1
+        semester, acad_year = args.term or (None, None)
+
+        posting = PaymentPosting(db, args.path, org_id, semester, acad_year, args.dry_run)
+        try:
+            ok = posting.run()
+        except (OSError, RuntimeError, csv.Error) as e:
+            print(f"Could not read {args.path}: {e}", file=sys.stderr)
+            return 1
+        print(posting.summary())
+
+        if args.reconciliation:
+            with open(args.reconciliation, 'w', newline='', encoding='utf-8') as out:
+                posting.write_reconciliation(out)
+        elif posting.reconciliation_rows():
+            print()
+            posting.write_reconciliation(sys.stdout)
+        return 0 if ok else 1
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
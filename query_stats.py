@@ -0,0 +1,310 @@
+import contextvars
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Optional
+
+slow_logger = logging.getLogger("query_stats.slow")
+
+# Upper bounds (seconds) of the latency histogram buckets; one more bucket counts anything slower
+HISTOGRAM_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+
+# Slow queries kept in memory for the diagnostics view
+RECENT_SLOW_QUERIES = 50
+
+# Statements EXPLAIN accepts
+EXPLAINABLE = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT', 'REPLACE')
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRINGS = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_LISTS = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+_SPACES = re.compile(r"\s+")
+
+# The action (usually a GUI callback) whose statements are being counted on this thread
+_current_action = contextvars.ContextVar("current_action", default=None)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql: str) -> str:
+    """SQL with literals replaced by ? and placeholder lists collapsed, so that
+    'IN (?, ?, ?)' and 'IN (?, ?)' (or multi-row VALUES) share one fingerprint"""
+    text = _COMMENTS.sub(" ", sql)
+    text = _STRINGS.sub("?", text)
+    text = _NUMBERS.sub("?", text)
+    text = _PLACEHOLDER_LISTS.sub("(?+)", text)
+    text = _REPEATED_LISTS.sub("(?+)", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def is_explainable(sql: str) -> bool:
+    words = sql.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in EXPLAINABLE
+
+
+def log_slow_queries_to(path: str):
+    """Also write the slow-query log to a file"""
+    handler = logging.FileHandler(path, encoding='utf-8')
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_logger.addHandler(handler)
+
+
+def histogram_percentile(histogram: List[int], fraction: float) -> Optional[float]:
+    # Upper bound of the bucket holding the given fraction of calls (None if it is the overflow bucket)
+    total = sum(histogram)
+    if not total:
+        return 0.0
+    needed = fraction * total
+    seen = 0
+    for bound, count in zip(HISTOGRAM_BOUNDS, histogram):
+        seen += count
+        if seen >= needed:
+            return bound
+    return None
+
+
+class _FingerprintStats:
+    # --- Aggregated timings of one SQL fingerprint ---
+
+    __slots__ = ('calls', 'errors', 'seconds', 'max_seconds', 'rows', 'histogram', 'sample')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.sample = None  # (sql, params) of the slowest call so far
+
+    def snapshot(self, fingerprint_text: str) -> dict:
+        return {
+            'fingerprint': fingerprint_text,
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_seconds': self.seconds,
+            'mean_seconds': self.seconds / self.calls if self.calls else 0.0,
+            'max_seconds': self.max_seconds,
+            'p95_seconds': histogram_percentile(self.histogram, 0.95),
+            'rows': self.rows,
+            'histogram': list(self.histogram),
+            'sample': self.sample,
+        }
+
+
+class _ActionStats:
+    # --- Statements issued on behalf of one named action, over all its invocations ---
+
+    __slots__ = ('invocations', 'round_trips', 'seconds', 'rows')
+
+    def __init__(self):
+        self.invocations = 0
+        self.round_trips = 0
+        self.seconds = 0.0
+        self.rows = 0
+
+
+class QueryStats:
+    # --- Per-statement timings, shared by every pooled connection ---
+    # Each statement sent to the server is one round trip. Statements are grouped
+    # by fingerprint and, when they run inside action(), by the action's name.
+
+    def __init__(self, slow_seconds: float = 0.0):
+        self.slow_seconds = slow_seconds
+        self._lock = threading.Lock()
+        self._fingerprints = {}
+        self._actions = {}
+        self._recent_slow = deque(maxlen=RECENT_SLOW_QUERIES)
+        self.round_trips = 0
+
+    def instrument(self, connection):
+        """Wrap a raw connection so every statement it runs is recorded here"""
+        if connection is None:
+            return None
+        return InstrumentedConnection(connection, self)
+
+    def record(self, sql: str, seconds: float, rows: int = 0, failed: bool = False, params=None):
+        key = fingerprint(sql)
+        action = _current_action.get()
+        slow = self.slow_seconds > 0 and seconds >= self.slow_seconds
+        with self._lock:
+            self.round_trips += 1
+            stats = self._fingerprints.get(key)
+            if stats is None:
+                stats = self._fingerprints[key] = _FingerprintStats()
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.rows += rows
+            if failed:
+                stats.errors += 1
+            stats.histogram[_bucket(seconds)] += 1
+            if seconds >= stats.max_seconds:
+                stats.max_seconds = seconds
+                stats.sample = (sql, params)
+            if action is not None:
+                name, action_stats = action
+                action_stats.round_trips += 1
+                action_stats.seconds += seconds
+                action_stats.rows += rows
+            if slow:
+                self._recent_slow.append({
+                    'at': time.time(), 'seconds': seconds, 'rows': rows, 'fingerprint': key,
+                    'sql': sql, 'params': params, 'action': action[0] if action else None,
+                })
+        if slow:
+            slow_logger.warning("%.3fs %d rows%s: %s", seconds, rows,
+                                f" [{action[0]}]" if action else "", _SPACES.sub(" ", sql).strip())
+
+    @contextmanager
+    def action(self, name: str):
+        """Count the statements run inside the block, and by work it hands to
+        threads that copy this context (see AsyncDatabase), against name"""
+        with self._lock:
+            stats = self._actions.get(name)
+            if stats is None:
+                stats = self._actions[name] = _ActionStats()
+            stats.invocations += 1
+        token = _current_action.set((name, stats))
+        try:
+            yield
+        finally:
+            _current_action.reset(token)
+
+    def top(self, limit: int = 20, key: str = 'total_seconds') -> List[dict]:
+        """Fingerprints ordered by key (total_seconds, calls, max_seconds, ...), largest first"""
+        with self._lock:
+            rows = [stats.snapshot(text) for text, stats in self._fingerprints.items()]
+        rows.sort(key=lambda row: row[key] or 0, reverse=True)
+        return rows[:limit]
+
+    def actions(self) -> List[dict]:
+        """Actions that issued SQL, most round trips first"""
+        with self._lock:
+            rows = [
+                {
+                    'action': name,
+                    'invocations': stats.invocations,
+                    'round_trips': stats.round_trips,
+                    'round_trips_per_call': stats.round_trips / stats.invocations if stats.invocations else 0.0,
+                    'seconds': stats.seconds,
+                    'rows': stats.rows,
+                }
+                for name, stats in self._actions.items() if stats.round_trips
+            ]
+        rows.sort(key=lambda row: row['round_trips'], reverse=True)
+        return rows
+
+    def recent_slow(self) -> List[dict]:
+        """The latest queries over the slow threshold, oldest first"""
+        with self._lock:
+            return list(self._recent_slow)
+
+    def slowest_query(self) -> Optional[dict]:
+        """The slowest recent slow query that EXPLAIN can take, or else the slowest
+        sampled call of any fingerprint; {sql, params, seconds} or None"""
+        with self._lock:
+            candidates = [
+                {'sql': entry['sql'], 'params': entry['params'], 'seconds': entry['seconds']}
+                for entry in self._recent_slow
+            ]
+            if not any(is_explainable(c['sql']) and c['params'] is not None for c in candidates):
+                candidates = [
+                    {'sql': stats.sample[0], 'params': stats.sample[1], 'seconds': stats.max_seconds}
+                    for stats in self._fingerprints.values() if stats.sample
+                ]
+        candidates = [c for c in candidates if is_explainable(c['sql']) and c['params'] is not None]
+        return max(candidates, key=lambda c: c['seconds']) if candidates else None
+
+    def clear(self):
+        with self._lock:
+            self._fingerprints.clear()
+            self._actions.clear()
+            self._recent_slow.clear()
+            self.round_trips = 0
+
+
+def _bucket(seconds: float) -> int:
+    for index, bound in enumerate(HISTOGRAM_BOUNDS):
+        if seconds <= bound:
+            return index
+    return len(HISTOGRAM_BOUNDS)
+
+
+class InstrumentedCursor:
+    # --- Cursor proxy that times execute/executemany ---
+
+    def __init__(self, cursor, stats: QueryStats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def execute(self, sql, params=(), *args, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = self._cursor.execute(sql, params, *args, **kwargs)
+            failed = False
+            return result
+        finally:
+            # Unbuffered results do not know their row count yet and record 0 rows
+            rowcount = getattr(self._cursor, 'rowcount', -1) if not failed else 0
+            self._stats.record(sql, time.perf_counter() - start, max(rowcount or 0, 0), failed, params)
+
+    def executemany(self, sql, seq_of_params, *args, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = self._cursor.executemany(sql, seq_of_params, *args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self._stats.record(sql, time.perf_counter() - start, 0 if failed else len(seq_of_params), failed)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class InstrumentedConnection:
+    # --- Connection proxy whose cursors and transaction control report to QueryStats ---
+
+    def __init__(self, connection, stats: QueryStats):
+        self.__dict__['_connection'] = connection
+        self.__dict__['_stats'] = stats
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._stats)
+
+    def _timed(self, statement: str, call):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = call()
+            failed = False
+            return result
+        finally:
+            self._stats.record(statement, time.perf_counter() - start, 0, failed)
+
+    def begin(self):
+        return self._timed("BEGIN", self._connection.begin)
+
+    def commit(self):
+        return self._timed("COMMIT", self._connection.commit)
+
+    def rollback(self):
+        return self._timed("ROLLBACK", self._connection.rollback)
+
+    def ping(self):
+        return self._timed("PING", self._connection.ping)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._connection, name, value)
@@ -1,3 +1,4 @@
+import logging
 import tkinter as tk
 from tkinter import messagebox
 import sys
@@ -9,6 +10,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from main_window import MainWindow
     from setup_database import create_database_schema
+    from config import DatabaseConfig
+    from query_stats import log_slow_queries_to
 except ImportError as e:
     print(f"Import error: {e}")
     print("Make sure all required files are in the same directory")
@@ -27,7 +30,21 @@ def setup_database():
         messagebox.showerror("Database Error", f"Error setting up database: {str(e)}")
         return False
 
+def configure_logging():
+    # Log level comes from ORG_APP_LOG_LEVEL (e.g. DEBUG); debug output is off by default
+    level_name = os.environ.get("ORG_APP_LOG_LEVEL", "WARNING").upper()
+    logging.basicConfig(
+        level=getattr(logging, level_name, logging.WARNING),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    # Slow queries also go to ORG_APP_SLOW_QUERY_LOG (or DatabaseConfig.SLOW_QUERY_LOG_FILE) if set
+    slow_log = os.environ.get("ORG_APP_SLOW_QUERY_LOG", DatabaseConfig.SLOW_QUERY_LOG_FILE)
+    if slow_log:
+        log_slow_queries_to(slow_log)
+
 def main():
+    configure_logging()
+    
     # Create root window
     root = tk.Tk()
 
@@ -37,7 +54,7 @@ def main():
         root.mainloop()
     except Exception as e:
         messagebox.showerror("Application Error", f"An error occurred: {e}")
-        print(f"Application error: {e}")
+        logging.getLogger(__name__).exception("Application error: %s", e)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,279 @@
+"""Run reports from the command line, without the GUI.
+
+Examples:
+    python run_reports.py unpaid-fees --user root --term 1st:2024-2025
+    python run_reports.py late-payments --org "Computer Society" --term 1st:2024-2025 --term 2nd:2024-2025
+    python run_reports.py financial-summary --format json --output summary.json
+    python run_reports.py term-balances --term 1st:2024-2025 --format jsonl
+
+The password is read from ORG_APP_DB_PASSWORD when --password is not given.
+Each (organization, term) pair runs as its own job; up to --workers jobs run
+concurrently over the connection pool and their rows are written in the order
+they were requested. Rows are streamed, so memory does not grow with the export.
+"""
+import argparse
+import csv
+import json
+import logging
+import queue
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, List, Optional, Set, Tuple
+
+from cli_common import add_connection_arguments, configure_connection, configure_logging
+from config import DatabaseConfig
+from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Report name -> (what it runs per job, what a job is keyed on)
+# "term" jobs run once per organization and term, "year" jobs once per
+# organization and academic year, "org" jobs once per organization and "all"
+# reports run as a single job over every organization (--org is ignored).
+REPORTS = {
+    'unpaid-fees': (lambda db, org_id, semester, acad_year: db.iter_unpaid_fees(org_id, semester, acad_year), "term"),
+    'late-payments': (lambda db, org_id, semester, acad_year: db.iter_late_payments(org_id, semester, acad_year), "term"),
+    'highest-debt': (lambda db, org_id, semester, acad_year: db.iter_highest_debt_members(org_id, semester, acad_year), "term"),
+    'executive-committee': (lambda db, org_id, semester, acad_year: db.iter_executive_committee(org_id, acad_year), "year"),
+    'financial-summary': (lambda db, org_id, semester, acad_year: db.iter_financial_summary(org_id), "org"),
+    'term-balances': (lambda db, org_id, semester, acad_year: db.iter_term_balances(), "all"),
+    'financial-summary-by-org': (lambda db, org_id, semester, acad_year: db.iter_financial_summary_by_org(), "all"),
+}
+
+# Columns added in front of every report row to say which job produced it
+CONTEXT_COLUMNS = ['organization', 'semester', 'acad_year']
+
+# Rows a job may hand over before it waits for the writer to catch up
+JOB_QUEUE_SIZE = 1000
+
+# Put on a job's queue after its last row
+_JOB_DONE = object()
+
+
+def parse_term(value: str) -> Tuple[str, str]:
+    # "1st:2024-2025" -> ("1st", "2024-2025")
+    semester, sep, acad_year = value.partition(':')
+    if not sep or not semester or not acad_year:
+        raise argparse.ArgumentTypeError(f"expected SEMESTER:ACAD_YEAR, got {value!r}")
+    return semester, acad_year
+
+
+def build_jobs(report: str, orgs: List[Tuple[int, str]],
+               terms: List[Tuple[str, str]]) -> List[Tuple[int, str, Optional[str], Optional[str]]]:
+    """(org_id, org_name, semester, acad_year) for every job a report needs"""
+    _, scope = REPORTS[report]
+    if scope == "all":
+        return [(None, None, None, None)]
+    if scope == "org":
+        return [(org_id, org_name, None, None) for org_id, org_name in orgs]
+    if scope == "year":
+        years = list(dict.fromkeys(acad_year for _, acad_year in terms))
+        return [(org_id, org_name, None, acad_year) for org_id, org_name in orgs for acad_year in years]
+    return [(org_id, org_name, semester, acad_year)
+            for org_id, org_name in orgs for semester, acad_year in terms]
+
+
+def run_job(db: DatabaseManager, report: str, job, terms: Set[Tuple[str, str]],
+            rows: queue.Queue, cancelled: threading.Event) -> bool:
+    """Stream a job's rows into `rows`, then _JOB_DONE. False if its query failed."""
+    org_id, org_name, semester, acad_year = job
+    run, scope = REPORTS[report]
+
+    def produce():
+        for row in run(db, org_id, semester, acad_year):
+            if cancelled.is_set():
+                # The writer stopped; closing the generator releases the connection
+                return
+            if scope == "all":
+                # Rows that carry a period are narrowed to the requested terms, if any
+                if not terms or 'semester' not in row or (row['semester'], row['acad_year']) in terms:
+                    rows.put(row)
+            elif scope == "org":
+                # Rows already carry their period; keep only the requested terms, if any
+                if not terms or (row['semester'], row['acad_year']) in terms:
+                    rows.put(dict(row, organization=org_name))
+            else:
+                rows.put(dict(organization=org_name, semester=semester, acad_year=acad_year, **row))
+
+    try:
+        _, ok = db.call_checked(produce)
+        return ok
+    finally:
+        rows.put(_JOB_DONE)
+
+
+def _drain(rows: queue.Queue) -> Iterator[dict]:
+    while True:
+        row = rows.get()
+        if row is _JOB_DONE:
+            return
+        yield row
+
+
+def stream_results(db: DatabaseManager, report: str, jobs: list, terms: Set[Tuple[str, str]],
+                   workers: int) -> Iterator[Tuple[tuple, Iterator[dict], Future]]:
+    """Yield (job, rows, future) in submission order. At most `workers` jobs are in
+    flight; the next one starts once the head job's rows have been read. The future
+    gives run_job's result after the rows are exhausted."""
+    cancelled = threading.Event()
+    pending = deque()
+    jobs = iter(jobs)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report") as executor:
+        def submit_next():
+            job = next(jobs, None)
+            if job is not None:
+                rows = queue.Queue(maxsize=JOB_QUEUE_SIZE)
+                pending.append((job, rows, executor.submit(run_job, db, report, job, terms, rows, cancelled)))
+
+        try:
+            for _ in range(workers):
+                submit_next()
+            while pending:
+                job, rows, future = pending[0]
+                yield job, _drain(rows), future
+                pending.popleft()
+                submit_next()
+        finally:
+            # Stopped early: unblock jobs waiting on a full queue so the pool can shut down
+            cancelled.set()
+            for _, rows, future in pending:
+                while not future.done():
+                    try:
+                        rows.get(timeout=0.1)
+                    except queue.Empty:
+                        pass
+
+
+class CsvWriter:
+    # CSV with a header taken from the first row; later rows fill missing columns with ''
+
+    def __init__(self, out):
+        self.out = out
+        self.writer = None
+
+    def write(self, row: dict):
+        if self.writer is None:
+            columns = CONTEXT_COLUMNS + [column for column in row if column not in CONTEXT_COLUMNS]
+            self.writer = csv.DictWriter(self.out, fieldnames=columns, restval='', extrasaction='ignore')
+            self.writer.writeheader()
+        self.writer.writerow(row)
+
+    def close(self):
+        pass
+
+
+class JsonWriter:
+    # A JSON array written one element at a time
+
+    def __init__(self, out):
+        self.out = out
+        self.count = 0
+
+    def write(self, row: dict):
+        self.out.write("[\n" if self.count == 0 else ",\n")
+        self.out.write(json.dumps(row, default=str))
+        self.count += 1
+
+    def close(self):
+        self.out.write("[]\n" if self.count == 0 else "\n]\n")
+
+
+class JsonLinesWriter:
+    # One JSON object per line
+
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, row: dict):
+        self.out.write(json.dumps(row, default=str) + "\n")
+
+    def close(self):
+        pass
+
+
+WRITERS = {'csv': CsvWriter, 'json': JsonWriter, 'jsonl': JsonLinesWriter}
+
+
+def resolve_orgs(db: DatabaseManager, names: List[str]) -> Optional[List[Tuple[int, str]]]:
+    # Requested organizations as (org_id, name); every organization when none were named
+    if not names:
+        return [(org.org_id, org.org_name) for org in db.get_all_organizations()]
+    orgs = []
+    for name in names:
+        org_id = db.get_organization_id(name)
+        if org_id is None:
+            logger.error("Unknown organization: %s", name)
+            return None
+        orgs.append((org_id, name))
+    return orgs
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run membership reports without the GUI")
+    parser.add_argument('report', choices=sorted(REPORTS))
+    parser.add_argument('--org', action='append', default=[],
+                        help="organization name (repeatable; default: all organizations)")
+    parser.add_argument('--term', action='append', default=[], type=parse_term,
+                        help="SEMESTER:ACAD_YEAR, e.g. 1st:2024-2025 (repeatable)")
+    parser.add_argument('--format', choices=sorted(WRITERS), default='csv')
+    parser.add_argument('--output', help="file to write (default: stdout)")
+    parser.add_argument('--workers', type=int, default=DatabaseConfig.POOL_MAX_SIZE,
+                        help="reports run at the same time (default: pool size)")
+    add_connection_arguments(parser)
+    args = parser.parse_args(argv)
+
+    _, scope = REPORTS[args.report]
+    if scope in ("term", "year") and not args.term:
+        parser.error(f"{args.report} needs at least one --term")
+    return args
+
+
+def run(args: argparse.Namespace, out) -> bool:
+    """Run the report described by args, writing rows to out. False if any job failed."""
+    configure_connection(args)
+    # Keep enough connections for every worker
+    DatabaseConfig.POOL_MAX_SIZE = max(DatabaseConfig.POOL_MAX_SIZE, args.workers)
+
+    db = DatabaseManager()
+    if not db.connect():
+        logger.error("Could not connect to the database")
+        return False
+
+    try:
+        _, scope = REPORTS[args.report]
+        orgs = [] if scope == "all" else resolve_orgs(db, args.org)
+        if orgs is None:
+            return False
+        jobs = build_jobs(args.report, orgs, args.term)
+
+        writer = WRITERS[args.format](out)
+        ok = True
+        for job, rows, future in stream_results(db, args.report, jobs, set(args.term), max(1, args.workers)):
+            for row in rows:
+                writer.write(row)
+            if not future.result():
+                ok = False
+                logger.error("%s failed for %s %s %s", args.report, job[1], job[2] or '', job[3] or '')
+        writer.close()
+        return ok
+    finally:
+        db.disconnect()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    configure_logging()
+    args = parse_args(argv)
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as out:
+            ok = run(args, out)
+    else:
+        ok = run(args, sys.stdout)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+from typing import Callable, Dict, List, Set
+
+# Length of the substrings kept in the n-gram index
+NGRAM_SIZE = 3
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    # --- Substring search over a list of table rows ---
+    # Built once per data load. Text search uses an n-gram index to find
+    # candidates. The last result is remembered so a query that extends the
+    # previous one only rescans the rows that already matched.
+
+    def __init__(self, rows: List[dict], text: Callable[[dict], str]):
+        self.rows = rows
+        self._texts = [(text(row) or '').lower() for row in rows]
+
+        self._ngrams: Dict[str, Set[int]] = {}
+        for index, value in enumerate(self._texts):
+            for gram in _ngrams(value):
+                self._ngrams.setdefault(gram, set()).add(index)
+
+        # Last search text -> matching row indexes, for incremental narrowing
+        self._last_text = None
+        self._last_matches: List[int] = []
+
+    def search(self, text: str = '') -> List[dict]:
+        """Rows whose text contains `text`"""
+        text = text.lower()
+
+        if self._last_text is not None and self._last_text in text:
+            # The new query only narrows the previous one
+            candidates = self._last_matches
+        else:
+            candidates = self._candidates(text)
+
+        if text:
+            matches = [index for index in candidates if text in self._texts[index]]
+        else:
+            matches = list(candidates)
+
+        self._last_text = text
+        self._last_matches = matches
+        return [self.rows[index] for index in matches]
+
+    def _candidates(self, text: str) -> List[int]:
+        if len(text) < NGRAM_SIZE:
+            return list(range(len(self.rows)))
+        rowsets = [self._ngrams.get(gram, set()) for gram in _ngrams(text)]
+        # Intersect smallest first; the result keeps the original row order
+        rowsets.sort(key=len)
+        candidates = set(rowsets[0])
+        for rowset in rowsets[1:]:
+            candidates &= rowset
+            if not candidates:
+                break
+        return sorted(candidates)
@@ -1,6 +1,140 @@
+import sys
 import mariadb
 from config import DatabaseConfig
 
+# Secondary indexes for the report access paths. Bump INDEX_VERSION whenever
+# this list changes so existing databases pick up the new set on the next run.
+INDEX_VERSION = 2
+INDEXES = [
+    # (table, index name, columns)
+    ("term", "idx_term_membership_year_sem", "membership_id, acad_year, semester"),
+    ("term", "idx_term_year_sem", "acad_year, semester"),
+    ("payment", "idx_payment_term_date", "term_id, payment_date"),
+    ("membership", "idx_membership_org_student", "org_id, student_id"),
+    ("student", "idx_student_name", "last_name, first_name, student_id"),
+]
+# Indexes from earlier versions that should be dropped, as (table, index name)
+RETIRED_INDEXES = []
+
+# Report query shapes and the index each table in them is expected to use
+REPORT_QUERY_PLANS = [
+    (
+        "Term roster / fee list for an organization and semester",
+        """
+        SELECT s.student_id, t.term_id, t.fee_amount
+        FROM student s
+        JOIN membership m ON s.student_id = m.student_id
+        JOIN term t ON m.membership_id = t.membership_id
+        WHERE m.org_id = ? AND t.semester = ? AND t.acad_year = ?
+        """,
+        (1, "1st", "2024-2025"),
+        {"m": "idx_membership_org_student", "t": "idx_term_membership_year_sem"},
+    ),
+    (
+        "Existing term check for a membership",
+        "SELECT term_id FROM term WHERE membership_id = ? AND semester = ? AND acad_year = ?",
+        (1, "1st", "2024-2025"),
+        {"term": "idx_term_membership_year_sem"},
+    ),
+    (
+        "Semester-wide term scan",
+        "SELECT term_id, fee_amount FROM term WHERE acad_year = ? AND semester = ?",
+        ("2024-2025", "1st"),
+        {"term": "idx_term_year_sem"},
+    ),
+    (
+        "Payments per term up to a date",
+        """
+        SELECT t.term_id, COALESCE(SUM(p.amount), 0)
+        FROM term t
+        JOIN membership m ON t.membership_id = m.membership_id
+        LEFT JOIN payment p ON t.term_id = p.term_id AND p.payment_date <= ?
+        WHERE m.org_id = ? AND t.term_start <= ?
+        GROUP BY t.term_id
+        """,
+        ("2025-01-01", 1, "2025-01-01"),
+        {"p": "idx_payment_term_date"},
+    ),
+    (
+        "Student list page after a (last name, first name, id) key",
+        """
+        SELECT student_id, first_name, last_name FROM student
+        WHERE last_name > ? OR (last_name = ? AND (first_name > ? OR (first_name = ? AND student_id > ?)))
+        ORDER BY last_name, first_name, student_id
+        LIMIT 200
+        """,
+        ("M", "M", "A", "A", 0),
+        {"student": "idx_student_name"},
+    ),
+]
+
+# One-time data backfills for databases created before a column or table was kept
+# up to date by the app, as (schema_info component, version, backfill(db) -> bool).
+# Bump a version to run its backfill again on every database.
+DATA_BACKFILLS = [
+    # Terms added before add_term stored the outstanding balance have balance 0.00
+    ("term_balance", 1, lambda db: db.reconcile_term_balances(repair=True) is not None),
+    # financial_summary starts empty on databases that already had terms and payments
+    ("financial_summary", 1, lambda db: db.rebuild_financial_summary()),
+]
+
+def get_schema_version(cursor, component: str) -> int:
+    # Version of a schema component last applied to this database (0 if never)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_info (
+            component VARCHAR(50) PRIMARY KEY,
+            version INT NOT NULL
+        ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """)
+    cursor.execute("SELECT version FROM schema_info WHERE component = ?", (component,))
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+def set_schema_version(cursor, component: str, version: int):
+    cursor.execute(
+        "INSERT INTO schema_info (component, version) VALUES (?, ?) "
+        "ON DUPLICATE KEY UPDATE version = VALUES(version)",
+        (component, version)
+    )
+
+def get_index_version(cursor) -> int:
+    # Version of the index set last applied to this database (0 if never)
+    return get_schema_version(cursor, 'indexes')
+
+def apply_indexes(cursor) -> bool:
+    # Create the current index set if the database has an older version; True if anything changed
+    if get_index_version(cursor) >= INDEX_VERSION:
+        return False
+    
+    for table, name in RETIRED_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name} ON {table}")
+    for table, name, columns in INDEXES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+    
+    set_schema_version(cursor, 'indexes', INDEX_VERSION)
+    print(f"Indexes updated to version {INDEX_VERSION}")
+    return True
+
+def check_query_plans(cursor) -> bool:
+    # EXPLAIN each report query shape and check it uses the expected indexes.
+    # On a near-empty database the optimizer may prefer a full scan, so run this
+    # against realistic data.
+    all_ok = True
+    for description, query, params, expected in REPORT_QUERY_PLANS:
+        cursor.execute("EXPLAIN " + query, params)
+        columns = [col[0] for col in cursor.description]
+        keys = {}
+        for row in cursor.fetchall():
+            plan = dict(zip(columns, row))
+            keys[plan['table']] = plan['key']
+        
+        for table, index_name in expected.items():
+            used = keys.get(table)
+            ok = used is not None and index_name in used.split(',')
+            all_ok = all_ok and ok
+            print(f"[{'OK' if ok else 'MISS'}] {description}: {table} uses {used or 'no index'} (expected {index_name})")
+    return all_ok
+
 def create_database_schema():
     # Create the database schema
     
@@ -89,24 +223,134 @@ def create_database_schema():
                 term_id INT,
                 FOREIGN KEY (term_id) REFERENCES term(term_id) ON DELETE CASCADE
             ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS financial_summary (
+                org_id INT,
+                acad_year VARCHAR(20),
+                semester VARCHAR(20),
+                total_fees DECIMAL(12,2) NOT NULL DEFAULT 0,
+                total_paid DECIMAL(12,2) NOT NULL DEFAULT 0,
+                total_unpaid DECIMAL(12,2) NOT NULL DEFAULT 0,
+                member_count INT NOT NULL DEFAULT 0,
+                late_count INT NOT NULL DEFAULT 0,
+                term_start DATE,
+                PRIMARY KEY (org_id, acad_year, semester),
+                FOREIGN KEY (org_id) REFERENCES organization(org_id) ON DELETE CASCADE
+            ) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
             """
         ]
         
         for table_sql in tables:
             cursor.execute(table_sql)
         
+        apply_indexes(cursor)
+        
         connection.commit()
         cursor.close()
         connection.close()
         
-        print("Database schema created successfully!")
-        return True
-        
     except mariadb.Error as e:
         print(f"Error creating database schema: {e}")
         return False
+    
+    if not apply_backfills():
+        return False
+    print("Database schema created successfully!")
+    return True
+
+def apply_backfills() -> bool:
+    # Run the DATA_BACKFILLS this database has not had yet; False if one failed
+    from database import DatabaseManager
+    db = DatabaseManager()
+    if not db.connect():
+        print("Could not connect to the database to backfill data")
+        return False
+    try:
+        for component, version, backfill in DATA_BACKFILLS:
+            applied = db.execute_query("SELECT version FROM schema_info WHERE component = ?", (component,))
+            if applied is None:
+                return False
+            if applied and applied[0][0] >= version:
+                continue
+            if not backfill(db):
+                print(f"Backfill of {component} failed")
+                return False
+            if not db.execute_update(
+                "INSERT INTO schema_info (component, version) VALUES (?, ?) "
+                "ON DUPLICATE KEY UPDATE version = VALUES(version)",
+                (component, version)
+            ):
+                return False
+            print(f"Backfilled {component} (version {version})")
+        return True
+    finally:
+        db.disconnect()
+
+def check_indexes():
+    # Print whether the report queries use the indexes in INDEXES
+    try:
+        connection = mariadb.connect(
+            user=DatabaseConfig.DB_USER,
+            password=DatabaseConfig.DB_PASSWORD,
+            host=DatabaseConfig.DB_HOST,
+            port=DatabaseConfig.DB_PORT,
+            database=DatabaseConfig.DB_NAME
+        )
+        cursor = connection.cursor()
+        version = get_index_version(cursor)
+        print(f"Index set version {version} (current {INDEX_VERSION})")
+        ok = check_query_plans(cursor)
+        cursor.close()
+        connection.close()
+        return ok
+    except mariadb.Error as e:
+        print(f"Error checking query plans: {e}")
+        return False
+
+def reconcile_balances(repair: bool) -> bool:
+    # Report (and optionally repair) terms whose stored balance disagrees with their payments
+    from database import DatabaseManager
+    db = DatabaseManager()
+    if not db.connect():
+        print("Could not connect to the database")
+        return False
+    try:
+        drifted = db.reconcile_term_balances(repair=repair)
+    finally:
+        db.disconnect()
+    
+    if drifted is None:
+        print("Balance reconciliation failed")
+        return False
+    for row in drifted:
+        print(f"term {row['term_id']}: balance {row['balance']} -> {row['actual_balance']}, "
+              f"status {row['payment_status']} -> {row['actual_status']}")
+    print(f"{len(drifted)} term balances {'repaired' if repair else 'out of sync'}")
+    return repair or not drifted
+
+def rebuild_summary() -> bool:
+    # Recompute the financial_summary table from term and payment (backfills)
+    from database import DatabaseManager
+    db = DatabaseManager()
+    if not db.connect():
+        print("Could not connect to the database")
+        return False
+    try:
+        ok = db.rebuild_financial_summary()
+    finally:
+        db.disconnect()
+    print("Financial summary rebuilt" if ok else "Financial summary rebuild failed")
+    return ok
 
 if __name__ == "__main__":
+    if "--rebuild-summary" in sys.argv:
+        sys.exit(0 if rebuild_summary() else 1)
+    if "--check-indexes" in sys.argv:
+        sys.exit(0 if check_indexes() else 1)
+    if "--reconcile-balances" in sys.argv:
+        sys.exit(0 if reconcile_balances("--repair" in sys.argv) else 1)
+    
     print("Setting up database...")
     if create_database_schema():
         print("Database schema created successfully!")
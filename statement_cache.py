@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+
+# Statements that cannot (or should not) be prepared through the binary protocol
+_UNCACHEABLE_PREFIXES = (
+    'CREATE', 'DROP', 'ALTER', 'TRUNCATE', 'RENAME', 'USE', 'SET',
+    'START', 'BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE',
+    'LOCK', 'UNLOCK', 'LOAD', 'EXPLAIN', 'SHOW', 'ANALYZE'
+)
+
+
+def is_cacheable(sql: str) -> bool:
+    # Only plain DML/queries go through the prepared statement cache
+    words = sql.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() not in _UNCACHEABLE_PREFIXES
+
+
+class StatementStats:
+    # --- Hit/miss counters per SQL text, shared by every connection's cache ---
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def record(self, sql: str, field: str):
+        with self._lock:
+            counters = self._counters.get(sql)
+            if counters is None:
+                counters = self._counters[sql] = {'hits': 0, 'misses': 0, 'evictions': 0}
+            counters[field] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {sql: dict(counters) for sql, counters in self._counters.items()}
+
+    def totals(self) -> dict:
+        totals = {'hits': 0, 'misses': 0, 'evictions': 0}
+        for counters in self.snapshot().values():
+            for field, value in counters.items():
+                totals[field] += value
+        return totals
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+
+
+class StatementCache:
+    # --- LRU cache of prepared cursors for one connection, keyed by SQL text ---
+
+    def __init__(self, connection, capacity: int, stats: StatementStats):
+        self.connection = connection
+        self.capacity = capacity
+        self.stats = stats
+        self._cursors = OrderedDict()
+
+    def cursor(self, sql: str):
+        """Return a prepared cursor for sql, reusing one from an earlier call if cached"""
+        cursor = self._cursors.get(sql)
+        if cursor is not None:
+            self._cursors.move_to_end(sql)
+            self.stats.record(sql, 'hits')
+            return cursor
+
+        self.stats.record(sql, 'misses')
+        cursor = self.connection.cursor(prepared=True)
+        self._cursors[sql] = cursor
+        if len(self._cursors) > self.capacity:
+            old_sql, old_cursor = self._cursors.popitem(last=False)
+            self.stats.record(old_sql, 'evictions')
+            self._close_cursor(old_cursor)
+        return cursor
+
+    def discard(self, sql: str):
+        """Drop the cursor for sql, e.g. after it raised an error"""
+        cursor = self._cursors.pop(sql, None)
+        if cursor is not None:
+            self._close_cursor(cursor)
+
+    def close(self):
+        while self._cursors:
+            _, cursor = self._cursors.popitem()
+            self._close_cursor(cursor)
+
+    def __len__(self):
+        return len(self._cursors)
+
+    @staticmethod
+    def _close_cursor(cursor):
+        try:
+            cursor.close()
+        except Exception:
+            pass